@@ -15,10 +15,40 @@ limitations under the License.
 """
 
 from .nistbeacon import NistBeacon
+from .nistbeaconarchive import NistBeaconArchive
+from .nistbeaconasync import AsyncNistBeacon
+from .nistbeaconbackend import (
+    NistBeaconBackend,
+    NistBeaconHttpBackend,
+    NistBeaconLayeredBackend,
+)
+from .nistbeaconcache import NistBeaconCache
+from .nistbeaconchain import BeaconChain
+from .nistbeaconclient import NistBeaconClient
+from .nistbeaconfollower import ChainFollower
+from .nistbeaconloader import NistBeaconLoader
+from .nistbeaconparser import NistBeaconParser
+from .nistbeaconpulse import NistBeaconPulse
+from .nistbeaconscheduler import NistBeaconScheduler
+from .nistbeaconstore import NistBeaconStore
 from .nistbeaconvalue import NistBeaconValue
 
 __all__ = [
+    'AsyncNistBeacon',
+    'BeaconChain',
+    'ChainFollower',
     'NistBeacon',
+    'NistBeaconArchive',
+    'NistBeaconBackend',
+    'NistBeaconCache',
+    'NistBeaconClient',
+    'NistBeaconHttpBackend',
+    'NistBeaconLayeredBackend',
+    'NistBeaconLoader',
+    'NistBeaconParser',
+    'NistBeaconPulse',
+    'NistBeaconScheduler',
+    'NistBeaconStore',
     'NistBeaconValue',
 ]
 
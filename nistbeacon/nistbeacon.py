@@ -13,11 +13,19 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 """
-from typing import Optional
-
-import requests
-from requests.exceptions import RequestException
-
+from collections import deque
+from typing import (
+    Iterator,
+    Optional,
+)
+
+from nistbeacon.nistbeaconbackend import (
+    NistBeaconBackend,
+    NistBeaconHttpBackend,
+)
+from nistbeacon.nistbeaconcache import NistBeaconCache
+from nistbeacon.nistbeaconclient import NistBeaconClient
+from nistbeacon.nistbeaconstore import NistBeaconStore
 from nistbeacon.nistbeaconvalue import NistBeaconValue
 
 
@@ -57,45 +65,211 @@ class NistBeacon:
         status_code="1",
     )
 
+    _backend = None
+    _cache = None
+    _client = NistBeaconClient(_NIST_API_URL)
+    _store = None
+
     @classmethod
-    def _query_nist(cls, url_data: str) -> Optional[NistBeaconValue]:
-        try:
-            nist_response = requests.get(
-                url=f'{cls._NIST_API_URL}/{url_data}',
-                timeout=30,
-            )
+    def _read_through(
+            cls,
+            lookup: str,
+            timestamp: int,
+    ) -> Optional[NistBeaconValue]:
+        """
+        Answer a lookup from the cache, then the store, then the backend.
+        Records found in a slower layer are written back to the faster ones.
 
-            if (
-                    isinstance(nist_response, requests.Response) and
-                    nist_response.status_code is requests.codes.OK
-            ):
-                return NistBeaconValue.from_xml(nist_response.text)
+        The cache and store only answer with exact or chain-linked records,
+        so anything they return, and any link recorded here, is as good as
+        the backend's answer.
+
+        :param lookup: 'get_record', 'get_next' or 'get_previous'
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The beacon value if available. 'None' otherwise.
+        """
+
+        cache = cls._cache
+        store = cls._store
+
+        if cache is not None:
+            record = getattr(cache, lookup)(timestamp)
+
+            if record is not None:
+                return record
+
+        record = None
+
+        if store is not None:
+            record = getattr(store, lookup)(timestamp)
+
+        if record is None:
+            record = getattr(cls.get_backend(), lookup)(timestamp)
+
+            if record is not None and store is not None:
+                store.put(record)
+
+        if record is not None and cache is not None:
+            cache.put(record)
+
+            if lookup == 'get_next':
+                cache.link(timestamp, record.timestamp)
+            elif lookup == 'get_previous':
+                cache.link(record.timestamp, timestamp)
+
+        return record
+
+    @classmethod
+    def get_backend(cls) -> NistBeaconBackend:
+        """
+        Get the backend records are looked up from.
+
+        :return: The backend set with 'set_backend'. Otherwise, an HTTP
+                 backend over the active 'NistBeaconClient'.
+        """
+
+        if cls._backend is None:
+            return NistBeaconHttpBackend(cls._client)
+
+        return cls._backend
+
+    @classmethod
+    def set_backend(cls, backend: Optional[NistBeaconBackend] = None):
+        """
+        Answer every lookup from another backend instead of the NIST API.
+
+        A 'NistBeaconArchive', 'NistBeaconStore' or 'BeaconChain' can be
+        used directly to work offline, and a 'NistBeaconLayeredBackend'
+        combines several, for example a local archive in front of HTTP.
+        The cache and store set with 'set_cache' and 'set_store' are still
+        consulted first.
+
+        :param backend:
+            Any object with 'get_record', 'get_next', 'get_previous' and
+            'get_last_record'. 'None' restores the HTTP backend.
+        """
+
+        cls._backend = backend
+
+    @classmethod
+    def get_cache(cls) -> Optional[NistBeaconCache]:
+        """
+        Get the record cache currently in use.
+
+        :return: The active 'NistBeaconCache'. 'None' if caching is off.
+        """
+
+        return cls._cache
+
+    @classmethod
+    def set_cache(cls, cache: Optional[NistBeaconCache] = None):
+        """
+        Serve records from an in-process cache before going to the backend.
+        Caching is off by default. 'get_last_record' always goes to the
+        backend, but its result is cached like any other record.
+
+        :param cache: The 'NistBeaconCache' to use. 'None' turns caching off.
+        """
+
+        cls._cache = cache
+
+    @classmethod
+    def get_store(cls) -> Optional[NistBeaconStore]:
+        """
+        Get the persistent record store currently in use.
+
+        :return: The active 'NistBeaconStore'. 'None' if there is no store.
+        """
+
+        return cls._store
+
+    @classmethod
+    def set_store(cls, store: Optional[NistBeaconStore] = None):
+        """
+        Read records through a persistent store before going to the
+        backend. Records found by the backend are saved into the store.
+
+        :param store: The 'NistBeaconStore' to use. 'None' turns it off.
+        """
+
+        cls._store = store
+
+    @classmethod
+    def get_client(cls) -> NistBeaconClient:
+        """
+        Get the client currently used to reach the beacon.
+
+        :return: The active 'NistBeaconClient'
+        """
 
-            return None
-        except RequestException:
-            return None
+        return cls._client
 
     @classmethod
-    def chain_check(cls, timestamp: int) -> bool:
+    def set_client(cls, client: Optional[NistBeaconClient] = None):
+        """
+        Replace the client used to reach the beacon. This allows tuning of
+        the connection pool, or pointing the library at a stand-in server.
+
+        :param client:
+            The 'NistBeaconClient' to use for all further queries.
+            'None' restores a default client for the NIST API.
+        """
+
+        if client is None:
+            client = NistBeaconClient(cls._NIST_API_URL)
+
+        cls._client = client
+
+    @classmethod
+    def chain_check(cls, timestamp: int, concurrent: bool = False) -> bool:
         """
         Given a record timestamp, verify the chain integrity.
 
         :param timestamp: UNIX time / POSIX time / Epoch time
+        :param concurrent: 'True' fetches the previous and next records at
+                           the same time, on the client's thread pool.
+                           'False' fetches them one after another.
         :return: 'True' if the timestamp fits the chain. 'False' otherwise.
         """
 
-        # Creation is messy.
-        # You want genius, you get madness; two sides of the same coin.
-        # ... I'm sure this can be cleaned up. However, let's test it first.
-
         record = cls.get_record(timestamp)
 
         if isinstance(record, NistBeaconValue) is False:
             # Don't you dare try to play me
             return False
 
-        prev_record = cls.get_previous(record.timestamp)
-        next_record = cls.get_next(record.timestamp)
+        if concurrent:
+            executor = cls._client.executor
+            prev_future = executor.submit(cls.get_previous, record.timestamp)
+            next_future = executor.submit(cls.get_next, record.timestamp)
+
+            prev_record = prev_future.result()
+            next_record = next_future.result()
+        else:
+            prev_record = cls.get_previous(record.timestamp)
+            next_record = cls.get_next(record.timestamp)
+
+        return cls._chain_verdict(record, prev_record, next_record)
+
+    @classmethod
+    def _chain_verdict(
+            cls,
+            record: NistBeaconValue,
+            prev_record: Optional[NistBeaconValue],
+            next_record: Optional[NistBeaconValue],
+    ) -> bool:
+        """
+        Decide if a record fits the chain, given its neighbours.
+
+        :param record: The record being checked
+        :param prev_record: The record before it, 'None' if there is none
+        :param next_record: The record after it, 'None' if there is none
+        :return: 'True' if the record fits the chain. 'False' otherwise.
+        """
+
+        # Creation is messy.
+        # You want genius, you get madness; two sides of the same coin.
+        # ... I'm sure this can be cleaned up. However, let's test it first.
 
         if prev_record is None and next_record is None:
             # Uh, how did you manage to do this?
@@ -111,7 +285,8 @@ class NistBeacon:
                 record.valid_signature and
                 next_record.valid_signature and
                 cls._INIT_RECORD == record and
-                next_record.previous_output_value == record.output_value
+                next_record.previous_output_value_bytes ==
+                record.output_value_bytes
             )
 
         if (
@@ -122,7 +297,8 @@ class NistBeacon:
             return (
                 record.valid_signature and
                 prev_record.valid_signature and
-                record.previous_output_value == prev_record.output_value
+                record.previous_output_value_bytes ==
+                prev_record.output_value_bytes
             )
 
         # Majority case, somewhere in the middle of the chain
@@ -134,8 +310,10 @@ class NistBeacon:
                 record.valid_signature and
                 prev_record.valid_signature and
                 next_record.valid_signature and
-                record.previous_output_value == prev_record.output_value and
-                next_record.previous_output_value == record.output_value
+                record.previous_output_value_bytes ==
+                prev_record.output_value_bytes and
+                next_record.previous_output_value_bytes ==
+                record.output_value_bytes
         )
 
     @classmethod
@@ -165,7 +343,16 @@ class NistBeacon:
         :return: The last beacon value. 'None' otherwise.
         """
 
-        return cls._query_nist("last")
+        record = cls.get_backend().get_last_record()
+
+        if record is not None:
+            if cls._store is not None:
+                cls._store.put(record)
+
+            if cls._cache is not None:
+                cls._cache.put(record)
+
+        return record
 
     @classmethod
     def get_next(cls, timestamp: int) -> NistBeaconValue:
@@ -176,7 +363,7 @@ class NistBeacon:
         :return: The next beacon value if available. 'None' otherwise.
         """
 
-        return cls._query_nist(f'next/{timestamp}')
+        return cls._read_through('get_next', timestamp)
 
     @classmethod
     def get_previous(cls, timestamp: int) -> NistBeaconValue:
@@ -187,7 +374,78 @@ class NistBeacon:
         :return: The previous beacon value if available. 'None; otherwise
         """
 
-        return cls._query_nist(f'previous/{timestamp}')
+        return cls._read_through('get_previous', timestamp)
+
+    @classmethod
+    def get_range(
+            cls,
+            start_timestamp: int,
+            end_timestamp: int,
+            prefetch: int = 10,
+    ) -> Iterator[NistBeaconValue]:
+        """
+        Lazily walk every record from 'start_timestamp' to 'end_timestamp'.
+
+        Instead of one blocking 'get_next' per record, the timestamps of
+        upcoming records are predicted from the current record's frequency
+        and up to 'prefetch' of them are fetched ahead on the client's
+        thread pool. A prefetched record is only used when its previous
+        output links to the record before it; any miss (a late record,
+        a gap, or a new chain) falls back to 'get_next' and the prediction
+        restarts from there. At most 'prefetch' records are held at once,
+        and nothing is fetched past the end of the range.
+
+        :param start_timestamp: UNIX time / POSIX time / Epoch time
+        :param end_timestamp: UNIX time / POSIX time / Epoch time, inclusive
+        :param prefetch: The number of records to fetch ahead
+        :return: An iterator of beacon values, in timestamp order
+        """
+
+        executor = cls._client.executor
+        pending = deque()
+        next_slot = None
+
+        record = cls.get_record(start_timestamp)
+
+        try:
+            while (
+                    isinstance(record, NistBeaconValue) and
+                    record.timestamp <= end_timestamp
+            ):
+                yield record
+
+                # The successor cannot fall inside the range
+                if record.timestamp + record.frequency > end_timestamp:
+                    return
+
+                if not pending:
+                    next_slot = record.timestamp + record.frequency
+
+                while len(pending) < prefetch and next_slot <= end_timestamp:
+                    pending.append(executor.submit(cls.get_record, next_slot))
+                    next_slot += record.frequency
+
+                candidate = pending.popleft().result() if pending else None
+
+                if (
+                        isinstance(candidate, NistBeaconValue) and
+                        candidate.previous_output_value_bytes ==
+                        record.output_value_bytes
+                ):
+                    if cls._cache is not None:
+                        cls._cache.link(record.timestamp, candidate.timestamp)
+
+                    record = candidate
+                    continue
+
+                # The prediction missed, drop it and ask for the successor
+                while pending:
+                    pending.popleft().cancel()
+
+                record = cls.get_next(record.timestamp)
+        finally:
+            while pending:
+                pending.popleft().cancel()
 
     @classmethod
     def get_record(cls, timestamp: int) -> NistBeaconValue:
@@ -198,4 +456,4 @@ class NistBeacon:
         :return: The requested beacon value if available. 'None' otherwise.
         """
 
-        return cls._query_nist(str(timestamp))
+        return cls._read_through('get_record', timestamp)
@@ -0,0 +1,298 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import mmap
+import os
+import struct
+from bisect import bisect_right
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconArchive:
+    """
+    A read-only, memory-mapped archive file of beacon records.
+
+    The file holds a header, the records back to back in the fixed binary
+    layout of 'NistBeaconValue.to_bytes', and a small segment table. Each
+    segment is a run of records spaced exactly 'frequency' seconds apart,
+    so a timestamp maps to its record with '(timestamp - base) / frequency'.
+    A new segment only starts where that spacing breaks, such as a gap, a
+    late record (status code 2) or a change of frequency.
+
+    Lookups read straight from the mapped file: no parsing beyond the one
+    record returned, and no network. The mapping is read-only, so every
+    process opening the same archive shares the same pages of the page
+    cache. Archives can be pickled, they reopen by path on the other side.
+    """
+
+    _MAGIC = b'NBARCHV1'
+    _FORMAT_VERSION = 1
+
+    # magic, format version, record size, record count, segment count,
+    # segment table offset
+    _HEADER_STRUCT = struct.Struct('>8sHHQQQ')
+
+    # first position, base timestamp, frequency, length
+    _SEGMENT_STRUCT = struct.Struct('>QqqQ')
+
+    def __init__(self, path: Union[str, os.PathLike]):
+        """
+        :param path: An archive file written by 'NistBeaconArchive.write'
+        """
+
+        self._path = path
+
+        with open(path, 'rb') as handle:
+            self._mmap = mmap.mmap(
+                handle.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            )
+
+        try:
+            (
+                magic,
+                format_version,
+                record_size,
+                self._count,
+                segment_count,
+                segment_offset,
+            ) = self._HEADER_STRUCT.unpack_from(self._mmap, 0)
+        except struct.error:
+            self._mmap.close()
+            raise ValueError(f'{path} is not a beacon archive') from None
+
+        if (
+                magic != self._MAGIC or
+                format_version != self._FORMAT_VERSION or
+                record_size != NistBeaconValue.BINARY_SIZE
+        ):
+            self._mmap.close()
+            raise ValueError(f'{path} is not a beacon archive')
+
+        self._positions = []
+        self._bases = []
+        self._frequencies = []
+        self._lengths = []
+
+        for segment in self._SEGMENT_STRUCT.iter_unpack(
+                self._mmap[
+                    segment_offset:
+                    segment_offset + segment_count * self._SEGMENT_STRUCT.size
+                ]
+        ):
+            self._positions.append(segment[0])
+            self._bases.append(segment[1])
+            self._frequencies.append(segment[2])
+            self._lengths.append(segment[3])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getitem__(self, index: int) -> NistBeaconValue:
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError('NistBeaconArchive index out of range')
+
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[NistBeaconValue]:
+        for position in range(self._count):
+            yield self._materialize(position)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __reduce__(self):
+        return self.__class__, (self._path,)
+
+    @property
+    def path(self) -> Union[str, os.PathLike]:
+        """
+        :return: The archive file in use
+        """
+
+        return self._path
+
+    @property
+    def segment_count(self) -> int:
+        """
+        :return: The number of evenly spaced runs in the archive
+        """
+
+        return len(self._positions)
+
+    def _materialize(self, position: int) -> NistBeaconValue:
+        size = NistBeaconValue.BINARY_SIZE
+        offset = self._HEADER_STRUCT.size + position * size
+
+        return NistBeaconValue.from_bytes(self._mmap[offset:offset + size])
+
+    def _position(self, timestamp: int) -> int:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The position of the first record at or after the timestamp
+        """
+
+        segment = bisect_right(self._bases, timestamp) - 1
+
+        if segment < 0:
+            return 0
+
+        # Round up, to land on the first record not before the timestamp
+        offset = -(
+            (self._bases[segment] - timestamp) // self._frequencies[segment]
+        )
+
+        return self._positions[segment] + min(offset, self._lengths[segment])
+
+    def close(self):
+        """
+        Unmap the archive file.
+        """
+
+        self._mmap.close()
+
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        """
+        :return: The newest archived record. 'None' if the archive is empty.
+        """
+
+        if self._count:
+            return self._materialize(self._count - 1)
+
+        return None
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The first record after the timestamp. 'None' otherwise.
+        """
+
+        position = self._position(timestamp + 1)
+
+        if position < self._count:
+            return self._materialize(position)
+
+        return None
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The last record before the timestamp. 'None' otherwise.
+        """
+
+        position = self._position(timestamp) - 1
+
+        if position >= 0:
+            return self._materialize(position)
+
+        return None
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The record at the timestamp (or next closest).
+                 'None' otherwise.
+        """
+
+        position = self._position(timestamp)
+
+        if position < self._count:
+            return self._materialize(position)
+
+        return None
+
+    @classmethod
+    def write(
+            cls,
+            path: Union[str, os.PathLike],
+            records: Iterable[NistBeaconValue],
+    ) -> int:
+        """
+        Write records into a new archive file, replacing any file already
+        at that path. Records are streamed to disk as they come.
+
+        :param path: The archive file to create
+        :param records: The records to archive, in ascending timestamp order
+        :return: The number of records written
+        """
+
+        # Each segment is [first position, base timestamp, frequency, length]
+        segments: List[list] = []
+        count = 0
+        last_timestamp = None
+
+        with open(path, 'wb') as handle:
+            handle.write(bytes(cls._HEADER_STRUCT.size))
+
+            for record in records:
+                timestamp = record.timestamp
+
+                if last_timestamp is not None and timestamp <= last_timestamp:
+                    raise ValueError(
+                        'Records must be archived in ascending timestamp order'
+                    )
+
+                extends_segment = False
+
+                if segments:
+                    _, base, frequency, length = segments[-1]
+                    extends_segment = (
+                        record.frequency == frequency and
+                        timestamp == base + length * frequency
+                    )
+
+                if extends_segment:
+                    segments[-1][3] += 1
+                else:
+                    segments.append(
+                        [count, timestamp, max(record.frequency, 1), 1]
+                    )
+
+                handle.write(record.to_bytes())
+                count += 1
+                last_timestamp = timestamp
+
+            segment_offset = handle.tell()
+
+            for segment in segments:
+                handle.write(cls._SEGMENT_STRUCT.pack(*segment))
+
+            handle.seek(0)
+            handle.write(cls._HEADER_STRUCT.pack(
+                cls._MAGIC,
+                cls._FORMAT_VERSION,
+                NistBeaconValue.BINARY_SIZE,
+                count,
+                len(segments),
+                segment_offset,
+            ))
+
+        return count
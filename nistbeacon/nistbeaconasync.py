@@ -0,0 +1,178 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+)
+
+from nistbeacon.nistbeacon import NistBeacon
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
+
+
+class AsyncNistBeacon:
+    """
+    The asyncio counterpart of `NistBeacon`. Every method is a coroutine
+    returning the same result as its `NistBeacon` namesake.
+
+    This is a thread-backed adapter, not an async HTTP client: each lookup
+    is the blocking `NistBeacon` call, run on an executor so the event
+    loop is never blocked. Lookups share the pooled keep-alive connections
+    of the client configured with `NistBeacon.set_client`.
+
+    By default the executor is that client's thread pool, which
+    `NistBeacon.get_range` and `NistBeacon.chain_check` also use, so at
+    most 'pool_maxsize' lookups run at once. Use `set_executor` to give
+    async lookups their own executor, sized to the concurrency wanted,
+    and size the client's connection pool to match.
+    """
+
+    _executor = None
+
+    @classmethod
+    async def _run(cls, func, *args) -> Optional[NistBeaconValue]:
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            cls.get_executor(),
+            partial(func, *args),
+        )
+
+    @classmethod
+    async def chain_check(cls, timestamp: int) -> bool:
+        """
+        Given a record timestamp, verify the chain integrity.
+
+        The previous and next records are fetched concurrently once the
+        requested record is known.
+
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: 'True' if the timestamp fits the chain. 'False' otherwise.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        record = await cls.get_record(timestamp)
+
+        if isinstance(record, NistBeaconValue) is False:
+            return False
+
+        prev_record, next_record = await asyncio.gather(
+            cls.get_previous(record.timestamp),
+            cls.get_next(record.timestamp),
+        )
+
+        # noinspection PyProtectedMember
+        # pylint: disable=protected-access
+        return NistBeacon._chain_verdict(record, prev_record, next_record)
+
+    @classmethod
+    def get_executor(cls) -> 'Executor':
+        """
+        Get the executor lookups currently run on.
+
+        :return: The executor given to 'set_executor', or the thread pool
+                 of the active 'NistBeaconClient'
+        """
+
+        if cls._executor is not None:
+            return cls._executor
+
+        return NistBeacon.get_client().executor
+
+    @classmethod
+    async def get_first_record(
+            cls,
+            download: bool = True
+    ) -> NistBeaconValue:
+        """
+        Get the first (oldest) record available. Since the first record
+        IS a known value in the system we can load it from constants.
+
+        :param download: 'True' will always reach out to NIST to get the
+                         first record. 'False' returns a local copy.
+        :return: The first beacon value. 'None' otherwise.
+        """
+
+        if download:
+            return await cls._run(NistBeacon.get_first_record, True)
+
+        return NistBeacon.get_first_record(download=False)
+
+    @classmethod
+    async def get_last_record(cls) -> NistBeaconValue:
+        """
+        Get the last (newest) record available.
+
+        :return: The last beacon value. 'None' otherwise.
+        """
+
+        return await cls._run(NistBeacon.get_last_record)
+
+    @classmethod
+    async def get_next(cls, timestamp: int) -> NistBeaconValue:
+        """
+        Given a record timestamp, get the next record available.
+
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The next beacon value if available. 'None' otherwise.
+        """
+
+        return await cls._run(NistBeacon.get_next, timestamp)
+
+    @classmethod
+    async def get_previous(cls, timestamp: int) -> NistBeaconValue:
+        """
+        Given a record timestamp, get the previous record available.
+
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The previous beacon value if available. 'None' otherwise.
+        """
+
+        return await cls._run(NistBeacon.get_previous, timestamp)
+
+    @classmethod
+    async def get_record(cls, timestamp: int) -> NistBeaconValue:
+        """
+        Get a specific record (or next closest)
+
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The requested beacon value if available. 'None' otherwise.
+        """
+
+        return await cls._run(NistBeacon.get_record, timestamp)
+
+    @classmethod
+    def set_executor(cls, executor: Optional['Executor'] = None):
+        """
+        Replace the executor lookups run on. The caller owns it, and shuts
+        it down when done.
+
+        :param executor:
+            Any 'concurrent.futures.Executor', such as a
+            'ThreadPoolExecutor' sized to the lookups wanted at once.
+            'None' restores the thread pool of the active client.
+        """
+
+        cls._executor = executor
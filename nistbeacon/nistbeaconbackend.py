@@ -0,0 +1,246 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from abc import (
+    ABC,
+    abstractmethod,
+)
+from typing import (
+    Iterable,
+    Optional,
+)
+
+from nistbeacon.nistbeaconclient import NistBeaconClient
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconBackend(ABC):
+    """
+    The interface 'NistBeacon' uses to find records, see
+    'NistBeacon.set_backend'.
+
+    Any object with these four lookups can serve as a backend, so a
+    'NistBeaconArchive', 'NistBeaconStore' or 'BeaconChain' can be used
+    as is. Subclasses must implement all four, or they cannot be created.
+    Every lookup returns 'None' when it has no answer.
+    """
+
+    @abstractmethod
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        """
+        :return: The last (newest) record available. 'None' otherwise.
+        """
+
+    @abstractmethod
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The next beacon value if available. 'None' otherwise.
+        """
+
+    @abstractmethod
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The previous beacon value if available. 'None' otherwise.
+        """
+
+    @abstractmethod
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The requested beacon value (or next closest) if available.
+                 'None' otherwise.
+        """
+
+
+class NistBeaconHttpBackend(NistBeaconBackend):
+    """
+    Answers lookups from the NIST beacon REST API, through a
+    'NistBeaconClient'.
+    """
+
+    def __init__(self, client: NistBeaconClient):
+        """
+        :param client: The client used to reach the beacon
+        """
+
+        self._client = client
+
+    @property
+    def client(self) -> NistBeaconClient:
+        """
+        :return: The client used to reach the beacon
+        """
+
+        return self._client
+
+    def _query(self, url_data: str) -> Optional[NistBeaconValue]:
+        response_text = self._client.query(url_data)
+
+        if response_text is None:
+            return None
+
+        return NistBeaconValue.from_xml(response_text)
+
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        return self._query('last')
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._query(f'next/{timestamp}')
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._query(f'previous/{timestamp}')
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._query(str(timestamp))
+
+
+class NistBeaconLayeredBackend(NistBeaconBackend):
+    """
+    Chains backends together, fastest first. Each lookup is tried against
+    every layer in order until one answers, and the record found is
+    written back (with 'put') into the faster layers that can hold it.
+
+    For example, '(archive, store, http)' serves what it can from a local
+    archive, then a SQLite store, and only then goes to NIST, saving
+    downloaded records in the store. Layers lacking a lookup are skipped.
+
+    Local layers only know their own records, so a record with a gap in
+    front of it is not necessarily the true next record. Every layer but
+    the last (the authority) only answers when it can prove the answer:
+    'get_record' needs the exact timestamp, and 'get_next' and
+    'get_previous' need the answer to chain to the record at the
+    timestamp. Other answers fall through to the next layer.
+    """
+
+    def __init__(self, *layers):
+        """
+        :param layers: The backends to consult, fastest first
+        """
+
+        if not layers:
+            raise ValueError('At least one layer is required')
+
+        self._layers = layers
+        self._fastest_first = range(len(layers))
+
+    @property
+    def layers(self) -> tuple:
+        """
+        :return: The backends consulted, fastest first
+        """
+
+        return self._layers
+
+    @staticmethod
+    def _proven(
+            layer,
+            lookup: str,
+            timestamp: int,
+            record: NistBeaconValue,
+    ) -> bool:
+        """
+        :param layer: The local layer that answered
+        :param lookup: 'get_record', 'get_next' or 'get_previous'
+        :param timestamp: The timestamp the lookup was given
+        :param record: The answer of the layer
+        :return: 'True' if the layer's own records prove the answer
+        """
+
+        if lookup == 'get_record':
+            return record.timestamp == timestamp
+
+        get_record = getattr(layer, 'get_record', None)
+        anchor = get_record(timestamp) if get_record is not None else None
+
+        if anchor is None or anchor.timestamp != timestamp:
+            return False
+
+        if lookup == 'get_next':
+            return (
+                record.timestamp > timestamp and
+                record.previous_output_value_bytes ==
+                anchor.output_value_bytes
+            )
+
+        return (
+            record.timestamp < timestamp and
+            record.output_value_bytes == anchor.previous_output_value_bytes
+        )
+
+    def _lookup(
+            self,
+            order: Iterable[int],
+            lookup: str,
+            *args,
+    ) -> Optional[NistBeaconValue]:
+        """
+        :param order: The positions of the layers to try, in order
+        :param lookup: The name of the lookup method to call
+        :param args: The arguments of the lookup
+        :return: The first record found. 'None' otherwise.
+        """
+
+        authority = len(self._layers) - 1
+
+        for position in order:
+            layer = self._layers[position]
+            method = getattr(layer, lookup, None)
+            record = method(*args) if method is not None else None
+
+            if record is None:
+                continue
+
+            if (
+                    args and
+                    position != authority and
+                    not self._proven(layer, lookup, args[0], record)
+            ):
+                continue
+
+            for faster_layer in self._layers[:position]:
+                put = getattr(faster_layer, 'put', None)
+
+                if put is not None:
+                    put(record)
+
+            return record
+
+        return None
+
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        """
+        Local layers may not hold the newest record yet, so the slowest,
+        most authoritative layer is asked first here, falling back towards
+        the fastest when it cannot answer.
+
+        :return: The last (newest) record available. 'None' otherwise.
+        """
+
+        return self._lookup(
+            reversed(self._fastest_first),
+            'get_last_record',
+        )
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._lookup(self._fastest_first, 'get_next', timestamp)
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._lookup(self._fastest_first, 'get_previous', timestamp)
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        return self._lookup(self._fastest_first, 'get_record', timestamp)
@@ -0,0 +1,193 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconCache:
+    """
+    A bounded, in-process LRU cache of beacon records keyed by timestamp.
+
+    Published records never change, so once seen they can be served
+    locally. The cache also remembers which records are direct neighbours,
+    which lets 'next' and 'previous' lookups be answered without the
+    network once that adjacency is known.
+
+    Cached 'NistBeaconValue' objects are shared between callers.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        """
+        :param maxsize: The maximum number of records to hold
+        """
+
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+
+        self._maxsize = maxsize
+
+        self._records = OrderedDict()
+        self._next = {}
+        self._previous = {}
+        self._lock = Lock()
+
+        self._evictions = 0
+        self._hits = 0
+        self._misses = 0
+
+    def __contains__(self, timestamp: int) -> bool:
+        return timestamp in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def evictions(self) -> int:
+        """
+        :return: The number of records dropped to respect 'maxsize'
+        """
+
+        return self._evictions
+
+    @property
+    def hits(self) -> int:
+        """
+        :return: The number of lookups answered from the cache
+        """
+
+        return self._hits
+
+    @property
+    def maxsize(self) -> int:
+        """
+        :return: The maximum number of records held
+        """
+
+        return self._maxsize
+
+    @property
+    def misses(self) -> int:
+        """
+        :return: The number of lookups the cache could not answer
+        """
+
+        return self._misses
+
+    def clear(self):
+        """
+        Drop every cached record and reset the counters.
+        """
+
+        with self._lock:
+            self._records.clear()
+            self._next.clear()
+            self._previous.clear()
+
+            self._evictions = 0
+            self._hits = 0
+            self._misses = 0
+
+    def _lookup(self, timestamp: Optional[int]) -> Optional[NistBeaconValue]:
+        # Callers must hold the lock
+        record = self._records.get(timestamp)
+
+        if record is None:
+            self._misses += 1
+            return None
+
+        self._records.move_to_end(timestamp)
+        self._hits += 1
+
+        return record
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The timestamp of a cached record
+        :return:
+            The record directly after it, if that adjacency is known and
+            the record is cached. 'None' otherwise.
+        """
+
+        with self._lock:
+            return self._lookup(self._next.get(timestamp))
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The timestamp of a cached record
+        :return:
+            The record directly before it, if that adjacency is known and
+            the record is cached. 'None' otherwise.
+        """
+
+        with self._lock:
+            return self._lookup(self._previous.get(timestamp))
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The exact timestamp of a record
+        :return: The cached record if present. 'None' otherwise.
+        """
+
+        with self._lock:
+            return self._lookup(timestamp)
+
+    def link(self, earlier_timestamp: int, later_timestamp: int):
+        """
+        Record that two cached records are direct neighbours in the chain.
+        Nothing is remembered unless both records are cached.
+
+        :param earlier_timestamp: The timestamp of the earlier record
+        :param later_timestamp: The timestamp of the record right after it
+        """
+
+        with self._lock:
+            if (
+                    earlier_timestamp in self._records and
+                    later_timestamp in self._records
+            ):
+                self._next[earlier_timestamp] = later_timestamp
+                self._previous[later_timestamp] = earlier_timestamp
+
+    def put(self, record: NistBeaconValue):
+        """
+        Add a record to the cache, evicting the least recently used record
+        if the cache is full.
+
+        :param record: The record to cache
+        """
+
+        with self._lock:
+            self._records[record.timestamp] = record
+            self._records.move_to_end(record.timestamp)
+
+            while len(self._records) > self._maxsize:
+                evicted, _ = self._records.popitem(last=False)
+                self._unlink(evicted)
+                self._evictions += 1
+
+    def _unlink(self, timestamp: int):
+        # Callers must hold the lock
+        next_timestamp = self._next.pop(timestamp, None)
+        if next_timestamp is not None:
+            self._previous.pop(next_timestamp, None)
+
+        previous_timestamp = self._previous.pop(timestamp, None)
+        if previous_timestamp is not None:
+            self._next.pop(previous_timestamp, None)
@@ -0,0 +1,440 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from array import array
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from typing import (
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from nistbeacon.nistbeacon import NistBeacon
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class BeaconChain:
+    """
+    A compact, columnar container for a run of beacon records, ordered by
+    timestamp.
+
+    Instead of one 'NistBeaconValue' per record, each field is kept in a
+    contiguous column: timestamps, frequencies and status codes in arrays,
+    and the seed, previous output, signature and output values packed
+    back to back in bytearrays. That is under 500 bytes per record, so a
+    year of minute records fits in roughly 250 MB.
+
+    Signatures take a fixed 256 byte slot. Shorter signatures, such as the
+    128 byte ones NIST published during mid 2017, are padded with zeros
+    and their real length is kept in 'signature_lengths'.
+
+    'NistBeaconValue' objects are only built when a record is read.
+    Slicing returns a read-only view sharing the same columns, no data is
+    copied.
+    """
+
+    _HASH_SIZE = 64
+    _LINK_CHUNK_SIZE = 4096
+    _SIGNATURE_SIZE = 256
+
+    def __init__(self, records: Iterable[NistBeaconValue] = ()):
+        """
+        :param records: Records to load, in ascending timestamp order
+        """
+
+        self._timestamps = array('q')
+        self._frequencies = array('q')
+        self._signature_lengths = array('H')
+        self._status_codes = array('b')
+        self._version_ids = array('B')
+        self._versions = []
+
+        self._seed_values = bytearray()
+        self._previous_output_values = bytearray()
+        self._signature_values = bytearray()
+        self._output_values = bytearray()
+
+        self._start = 0
+        self._stop = 0
+        self._is_view = False
+
+        self.extend(records)
+
+    def __getitem__(
+            self,
+            item: Union[int, slice],
+    ) -> Union[NistBeaconValue, 'BeaconChain']:
+        if isinstance(item, slice):
+            start, stop, step = item.indices(len(self))
+
+            if step != 1:
+                raise ValueError('BeaconChain slices must be contiguous')
+
+            return self._view(
+                self._start + start,
+                self._start + max(start, stop),
+            )
+
+        if item < 0:
+            item += len(self)
+
+        if not 0 <= item < len(self):
+            raise IndexError('BeaconChain index out of range')
+
+        return self._materialize(self._start + item)
+
+    def __iter__(self) -> Iterator[NistBeaconValue]:
+        for position in range(self._start, self._stop):
+            yield self._materialize(position)
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def _column(self, column: bytearray, size: int) -> memoryview:
+        return memoryview(column)[self._start * size:self._stop * size]
+
+    def _mismatched_links(self) -> List[int]:
+        """
+        Find every index whose previous output differs from the output of
+        the record before it, comparing whole chunks of the columns at a
+        time and only going row by row inside chunks that differ.
+        """
+
+        size = self._HASH_SIZE
+        outputs = self.output_values
+        previous = self.previous_output_values
+        mismatched = []
+
+        for chunk_start in range(1, len(self), self._LINK_CHUNK_SIZE):
+            chunk_stop = min(chunk_start + self._LINK_CHUNK_SIZE, len(self))
+
+            if (
+                    previous[chunk_start * size:chunk_stop * size].tobytes() ==
+                    outputs[(chunk_start - 1) * size:
+                            (chunk_stop - 1) * size].tobytes()
+            ):
+                continue
+
+            for index in range(chunk_start, chunk_stop):
+                if (
+                        previous[index * size:(index + 1) * size] !=
+                        outputs[(index - 1) * size:index * size]
+                ):
+                    mismatched.append(index)
+
+        return mismatched
+
+    def _mismatched_links_numpy(self, numpy) -> List[int]:
+        """
+        Find every index whose previous output differs from the output of
+        the record before it, in a single vectorized pass.
+        """
+
+        outputs = numpy.frombuffer(
+            self.output_values,
+            dtype=numpy.uint8,
+        ).reshape(len(self), self._HASH_SIZE)
+        previous = numpy.frombuffer(
+            self.previous_output_values,
+            dtype=numpy.uint8,
+        ).reshape(len(self), self._HASH_SIZE)
+
+        differs = (previous[1:] != outputs[:-1]).any(axis=1)
+
+        return (numpy.flatnonzero(differs) + 1).tolist()
+
+    def _materialize(self, position: int) -> NistBeaconValue:
+        hash_slice = slice(
+            position * self._HASH_SIZE,
+            (position + 1) * self._HASH_SIZE,
+        )
+        signature_start = position * self._SIGNATURE_SIZE
+        signature_slice = slice(
+            signature_start,
+            signature_start + self._signature_lengths[position],
+        )
+
+        return NistBeaconValue(
+            version=self._versions[self._version_ids[position]],
+            frequency=self._frequencies[position],
+            timestamp=self._timestamps[position],
+            seed_value=self._seed_values[hash_slice],
+            previous_output_value=self._previous_output_values[hash_slice],
+            signature_value=self._signature_values[signature_slice],
+            output_value=self._output_values[hash_slice],
+            status_code=str(self._status_codes[position]),
+        )
+
+    def _view(self, start: int, stop: int) -> 'BeaconChain':
+        # Share every column with this chain, only the window differs
+        view = BeaconChain.__new__(BeaconChain)
+        view.__dict__.update(
+            self.__dict__,
+            _start=start,
+            _stop=stop,
+            _is_view=True,
+        )
+
+        return view
+
+    @property
+    def frequencies(self) -> memoryview:
+        """
+        :return: The frequency of every record, as signed 64-bit integers
+        """
+
+        return memoryview(self._frequencies)[self._start:self._stop]
+
+    @property
+    def output_values(self) -> memoryview:
+        """
+        :return: Every record's 64 byte output value, back to back
+        """
+
+        return self._column(self._output_values, self._HASH_SIZE)
+
+    @property
+    def previous_output_values(self) -> memoryview:
+        """
+        :return: Every record's 64 byte previous output value, back to back
+        """
+
+        return self._column(self._previous_output_values, self._HASH_SIZE)
+
+    @property
+    def seed_values(self) -> memoryview:
+        """
+        :return: Every record's 64 byte seed value, back to back
+        """
+
+        return self._column(self._seed_values, self._HASH_SIZE)
+
+    @property
+    def signature_values(self) -> memoryview:
+        """
+        :return:
+            Every record's signature value, back to back, each padded with
+            zeros to 256 bytes
+        """
+
+        return self._column(self._signature_values, self._SIGNATURE_SIZE)
+
+    @property
+    def signature_lengths(self) -> memoryview:
+        """
+        :return: The real length of every record's signature value
+        """
+
+        return memoryview(self._signature_lengths)[self._start:self._stop]
+
+    @property
+    def status_codes(self) -> memoryview:
+        """
+        :return: The status code of every record, as signed 8-bit integers
+        """
+
+        return memoryview(self._status_codes)[self._start:self._stop]
+
+    @property
+    def timestamps(self) -> memoryview:
+        """
+        :return: The timestamp of every record, as signed 64-bit integers
+        """
+
+        return memoryview(self._timestamps)[self._start:self._stop]
+
+    def append(self, record: NistBeaconValue):
+        """
+        Add a record to the end of the chain.
+
+        Note that the columns cannot grow while a memoryview from one of
+        the column properties is still held.
+
+        :param record: A record newer than every record already held
+        """
+
+        if self._is_view:
+            raise ValueError('Cannot append to a slice of a BeaconChain')
+
+        if self._stop and record.timestamp <= self._timestamps[-1]:
+            raise ValueError(
+                'Records must be appended in ascending timestamp order'
+            )
+
+        signature = record.signature_value_bytes
+
+        if len(signature) > self._SIGNATURE_SIZE:
+            raise ValueError(
+                f'Signatures longer than {self._SIGNATURE_SIZE} bytes '
+                f'are not supported'
+            )
+
+        if record.version not in self._versions:
+            self._versions.append(record.version)
+
+        self._timestamps.append(record.timestamp)
+        self._frequencies.append(record.frequency)
+        self._signature_lengths.append(len(signature))
+        self._status_codes.append(int(record.status_code))
+        self._version_ids.append(self._versions.index(record.version))
+
+        self._seed_values += record.seed_value_bytes
+        self._previous_output_values += record.previous_output_value_bytes
+        self._signature_values += signature.ljust(self._SIGNATURE_SIZE, b'\0')
+        self._output_values += record.output_value_bytes
+
+        self._stop += 1
+
+    def broken_links(self) -> List[int]:
+        """
+        Check every link of the chain at once: each record's previous
+        output must equal the output of the record before it.
+
+        The columns are compared with NumPy when it is installed, and with
+        chunked buffer comparisons otherwise. A record with status code 1
+        starts a new chain, and the very first beacon record has nothing
+        before it, so neither is reported as broken.
+
+        :return: The indices of records that do not link to the record
+                 before them, in ascending order
+        """
+
+        if len(self) < 2:
+            return []
+
+        try:
+            # pylint: disable=import-outside-toplevel
+            import numpy
+        except ImportError:
+            numpy = None
+
+        if numpy is None:
+            mismatched = self._mismatched_links()
+        else:
+            mismatched = self._mismatched_links_numpy(numpy)
+
+        # noinspection PyProtectedMember
+        # pylint: disable=protected-access
+        genesis_timestamp = NistBeacon._INIT_RECORD.timestamp
+        status_codes = self.status_codes
+        timestamps = self.timestamps
+
+        return [
+            index
+            for index in mismatched
+            if status_codes[index] != 1 and
+            timestamps[index] != genesis_timestamp
+        ]
+
+    def extend(self, records: Iterable[NistBeaconValue]):
+        """
+        Add records to the end of the chain.
+
+        :param records: Records newer than every record already held,
+                        in ascending timestamp order
+        """
+
+        for record in records:
+            self.append(record)
+
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        """
+        :return: The newest record held. 'None' if the chain is empty.
+        """
+
+        if self._stop > self._start:
+            return self._materialize(self._stop - 1)
+
+        return None
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The first record after the timestamp. 'None' otherwise.
+        """
+
+        position = bisect_right(
+            self._timestamps,
+            timestamp,
+            self._start,
+            self._stop,
+        )
+
+        if position < self._stop:
+            return self._materialize(position)
+
+        return None
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The last record before the timestamp. 'None' otherwise.
+        """
+
+        position = bisect_left(
+            self._timestamps,
+            timestamp,
+            self._start,
+            self._stop,
+        ) - 1
+
+        if position >= self._start:
+            return self._materialize(position)
+
+        return None
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The record at the timestamp (or next closest).
+                 'None' otherwise.
+        """
+
+        position = bisect_left(
+            self._timestamps,
+            timestamp,
+            self._start,
+            self._stop,
+        )
+
+        if position < self._stop:
+            return self._materialize(position)
+
+        return None
+
+    def index(self, timestamp: int) -> Optional[int]:
+        """
+        :param timestamp: UNIX time / POSIX time / Epoch time
+        :return: The index of the record with exactly this timestamp.
+                 'None' otherwise.
+        """
+
+        position = bisect_left(
+            self._timestamps,
+            timestamp,
+            self._start,
+            self._stop,
+        )
+
+        if position < self._stop and self._timestamps[position] == timestamp:
+            return position - self._start
+
+        return None
@@ -0,0 +1,187 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import ThreadPoolExecutor
+
+    import requests
+
+
+class NistBeaconClient:
+    """
+    HTTP transport used by `NistBeacon` to talk to the beacon REST API.
+
+    A client holds a single pooled `requests.Session`, so consecutive
+    lookups reuse keep-alive connections instead of performing a fresh
+    TCP and TLS handshake every time. It also owns a thread pool, sized to
+    the connection pool, for callers that want to run queries concurrently.
+
+    The HTTP stack ('requests') and the thread pool are only imported
+    once they are first needed.
+    """
+
+    def __init__(
+            self,
+            base_url: str,
+            timeout: float = 30,
+            pool_connections: int = 1,
+            pool_maxsize: int = 10,
+            max_retries: int = 0,
+    ):
+        """
+        :param base_url:
+            The URL all queries are relative to, without a trailing slash
+
+        :param timeout:
+            Seconds to wait on the server before giving up on a query
+
+        :param pool_connections:
+            The number of distinct hosts to keep connection pools for
+
+        :param pool_maxsize:
+            The maximum number of connections kept alive per host
+
+        :param max_retries:
+            The number of retries for failed connection attempts
+        """
+
+        self._base_url = base_url
+        self._timeout = timeout
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._max_retries = max_retries
+
+        self._executor = None
+        self._session = None
+        self._session_lock = Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def base_url(self) -> str:
+        """
+        :return: The URL all queries are relative to
+        """
+
+        return self._base_url
+
+    @property
+    def executor(self) -> 'ThreadPoolExecutor':
+        """
+        :return:
+            A thread pool with one worker per pooled connection, used to
+            run queries concurrently. It is created on first use.
+        """
+
+        if self._executor is None:
+            with self._session_lock:
+                if self._executor is None:
+                    # pylint: disable=import-outside-toplevel
+                    from concurrent.futures import ThreadPoolExecutor
+
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self._pool_maxsize,
+                        thread_name_prefix='nistbeacon',
+                    )
+
+        return self._executor
+
+    @property
+    def session(self) -> 'requests.Session':
+        """
+        :return:
+            The pooled `requests.Session` used by this client. It is
+            created on first use.
+        """
+
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._build_session()
+
+        return self._session
+
+    def _build_session(self) -> 'requests.Session':
+        # pylint: disable=import-outside-toplevel
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        adapter = HTTPAdapter(
+            pool_connections=self._pool_connections,
+            pool_maxsize=self._pool_maxsize,
+            max_retries=self._max_retries,
+        )
+
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        return session
+
+    def close(self):
+        """
+        Close the pooled session, dropping any kept-alive connections, and
+        shut down the thread pool. The client can still be used afterwards,
+        both are created again on next use.
+        """
+
+        with self._session_lock:
+            executor, self._executor = self._executor, None
+            session, self._session = self._session, None
+
+        # Outside of the lock, so in-flight queries can still finish
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        if session is not None:
+            session.close()
+
+    def query(self, url_data: str) -> Optional[str]:
+        """
+        Perform a GET against the API for the given relative path.
+
+        :param url_data: The path to query, relative to `base_url`
+        :return: The response body on HTTP 200. 'None' otherwise.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import requests
+
+        try:
+            response = self.session.get(
+                url=f'{self._base_url}/{url_data}',
+                timeout=self._timeout,
+            )
+
+            if (
+                    isinstance(response, requests.Response) and
+                    response.status_code is requests.codes.OK
+            ):
+                return response.text
+
+            return None
+        except requests.exceptions.RequestException:
+            return None
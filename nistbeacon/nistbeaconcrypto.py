@@ -15,20 +15,118 @@ limitations under the License.
 """
 
 import binascii
+import hashlib
+import os
 import struct
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import (
+    chain,
+    islice,
+)
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
-from Crypto import Hash
-from Crypto.Hash import SHA512
-from Crypto.Hash.SHA512 import SHA512Hash
-from Crypto.PublicKey import RSA
-from Crypto.Signature import PKCS1_v1_5
+if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import Executor
+
+    from Crypto import Hash
+    from Crypto.Hash.SHA512 import SHA512Hash
+    from Crypto.Signature import PKCS1_v1_5
+
+from nistbeacon.nistbeaconkey import (
+    KeyData,
+    KeyEpoch,
+    VerifyKey,
+)
+
+
+class VerifyCacheInfo(NamedTuple):
+    """
+    Counters for the verification result cache of 'NistBeaconCrypto'.
+    """
+
+    hits: int
+    store_hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+def _init_verify_worker(epochs: Tuple[KeyEpoch, ...]):
+    """
+    Process pool initializer for 'NistBeaconCrypto.verify_many'.
+
+    Each worker takes the parent's key epoch table, so keys registered at
+    runtime are known, and loads the RSA keys once, up front. A forked
+    worker must not share the parent's verification store connection, so
+    workers only use their own in-memory cache.
+    """
+
+    # noinspection PyProtectedMember
+    # pylint: disable=protected-access
+    NistBeaconCrypto._set_key_epochs(epochs)
+    NistBeaconCrypto.load_keys()
+    NistBeaconCrypto.set_verify_store(None)
+
+
+@lru_cache(maxsize=None)
+def _sha512():
+    """
+    PyCryptodome's SHA-512 module, imported once, on first use.
+    """
+
+    # pylint: disable=import-outside-toplevel
+    from Crypto.Hash import SHA512
+
+    return SHA512
+
+
+def _verify_run(run: List[tuple]) -> List[Tuple[bytes, bool, bool]]:
+    """
+    Process pool entry point for 'NistBeaconCrypto.verify_many'.
+
+    This has to live at module level so workers can unpickle it.
+    """
+
+    # noinspection PyProtectedMember
+    # pylint: disable=protected-access
+    return NistBeaconCrypto._verify_run_parts(run)
 
 
 class NistBeaconCrypto:
     """
     Helper class to handle beacon value signature and crypto checks.
+
+    The key to check a record against is found in a table of key epochs,
+    sorted by the timestamp each key took over, with a binary search. New
+    keys or certificates can be added to the table with 'register_key'.
+
+    RSA results are remembered in a bounded, in-process LRU cache keyed by
+    (key name, message digest, signature), so records seen before are
+    never RSA checked twice. A verification store, such as a
+    'NistBeaconStore', can back the cache to keep results across restarts.
     """
 
+    _verify_cache = OrderedDict()
+    _verify_cache_lock = Lock()
+    _verify_cache_size = 4096
+    _verify_hits = 0
+    _verify_misses = 0
+    _verify_store = None
+    _verify_store_hits = 0
+
     # https://beacon.nist.gov/certificate/beacon.cer
     # noinspection SpellCheckingInspection
     _NIST_CER_FILE_20130905 = (
@@ -105,11 +203,384 @@ class NistBeaconCrypto:
         '-----END PUBLIC KEY-----\n'
     )
 
-    _RSA_KEY_20130905 = RSA.importKey(_NIST_RSA_KEY_20130905)
-    _RSA_KEY_20170808 = RSA.importKey(_NIST_RSA_KEY_20170808)
+    # Everything after the version in a signed message, see 'get_hash'
+    _MESSAGE_STRUCT = struct.Struct('>1I1Q64s64s1I')
+
+    # Length prefix of byte strings in version 2.0 pulse messages
+    _LENGTH_STRUCT = struct.Struct('>I')
+
+    # The key epoch table, as (start timestamps, epochs) sorted by start.
+    # It is replaced as a whole on change, so readers need no lock.
+    _key_lock = Lock()
+    _key_epochs = (
+        [0, 1496176860, 1502202360],
+        [
+            KeyEpoch(0, _NIST_RSA_KEY_20130905, '20130905'),
+            # Records from this period were signed with a bugged key
+            # and cannot be verified, see
+            # https://github.com/urda/nistbeacon/issues/26
+            KeyEpoch(1496176860, None),
+            KeyEpoch(1502202360, _NIST_RSA_KEY_20170808, '20170808'),
+        ],
+    )
+
+    # Keys of version 2.0 pulses, by certificate id, see 'register_certificate'
+    _certificates = {}
+
+    @classmethod
+    def _cached_verify(
+            cls,
+            verify_key: Optional[VerifyKey],
+            message_hash: 'SHA512Hash',
+            signature: bytes,
+            reversed_signature: bool = True,
+    ) -> bool:
+        """
+        Run the RSA check through the verification result cache and store.
+
+        :param verify_key: The key (or key epoch) the message was signed with
+        :param message_hash: The hash of the signed message
+        :param signature: The signature, as published
+        :param reversed_signature:
+            'True' for version 1.0 records, which publish their signature
+            byte reversed
+        :return: True if verification is correct. False otherwise.
+        """
+
+        store = cls._verify_store
+
+        if reversed_signature:
+            checked_signature = signature[::-1]
+        else:
+            checked_signature = signature
+
+        # Without a key there is no RSA check to save
+        if (
+                verify_key is None or
+                not verify_key.has_key or
+                (not cls._verify_cache_size and store is None)
+        ):
+            return cls._verify_with(
+                verify_key,
+                message_hash,
+                checked_signature,
+            )
+
+        key = (verify_key.name, message_hash.digest(), bytes(signature))
+
+        with cls._verify_cache_lock:
+            result = cls._verify_cache.get(key)
+
+            if result is not None:
+                cls._verify_cache.move_to_end(key)
+                cls._verify_hits += 1
+                return result
+
+        if store is not None:
+            result = store.get_verification(*key)
+
+        from_store = result is not None
+
+        if not from_store:
+            result = cls._verify_with(
+                verify_key,
+                message_hash,
+                checked_signature,
+            )
+
+        cls._remember(((key, result),), from_store)
+
+        return result
+
+    @classmethod
+    def _check_parts(
+            cls,
+            epoch: Optional[KeyEpoch],
+            version: str,
+            frequency: int,
+            timestamp: int,
+            seed_value: bytes,
+            prev_output: bytes,
+            signature: bytes,
+            output_value: bytes,
+            status_code: str,
+            message_hash: Optional['SHA512Hash'] = None,
+    ) -> Tuple['SHA512Hash', bool, bool]:
+        """
+        'verify_record', for a record whose key epoch is already known.
+
+        :return: The message hash, the RSA signature check result, and the
+                 output value check result
+        """
+
+        if message_hash is None:
+            message_hash = cls.get_hash(
+                version,
+                frequency,
+                timestamp,
+                seed_value,
+                prev_output,
+                status_code,
+            )
+
+        sig_check_result = cls._cached_verify(
+            epoch,
+            message_hash,
+            signature,
+        )
+
+        # The signature sha512'd again should equal the output value
+        expected_signature = hashlib.sha512(signature).digest()
+
+        sig_hash_check = expected_signature == output_value
+
+        return message_hash, sig_check_result, sig_hash_check
+
+    @classmethod
+    def _check_record(cls, epoch: Optional[KeyEpoch], *fields, **kwargs):
+        """
+        :return: 'True' if both checks of '_check_parts' pass
+        """
+
+        _, sig_check_result, sig_hash_check = cls._check_parts(
+            epoch,
+            *fields,
+            **kwargs
+        )
+
+        return sig_check_result and sig_hash_check
 
-    _VERIFIER_20130905 = PKCS1_v1_5.new(_RSA_KEY_20130905)
-    _VERIFIER_20170808 = PKCS1_v1_5.new(_RSA_KEY_20170808)
+    @staticmethod
+    @lru_cache(maxsize=16)
+    def _encode_version(version: str) -> bytes:
+        return version.encode()
+
+    @classmethod
+    def _epoch_runs(
+            cls,
+            fields: Iterator[tuple],
+            run_size: int,
+    ) -> Iterator[List[tuple]]:
+        """
+        Group consecutive field tuples signed under the same key epoch.
+
+        The table is only searched when a timestamp leaves the bounds of
+        the current epoch, so a run costs one lookup however long it is.
+
+        :param fields: Field tuples, as taken by 'verify_record'
+        :param run_size: The most field tuples in a single run
+        :return: Runs of field tuples, in input order
+        """
+
+        starts, _ = cls._key_epochs
+        run = []
+        lower = upper = 0
+
+        for record_fields in fields:
+            timestamp = record_fields[2]
+
+            if not lower <= timestamp < upper:
+                if run:
+                    yield run
+                    run = []
+
+                position = bisect_right(starts, timestamp)
+                lower = starts[position - 1] if position else float('-inf')
+                upper = (
+                    starts[position] if position < len(starts)
+                    else float('inf')
+                )
+            elif len(run) >= run_size:
+                yield run
+                run = []
+
+            run.append(record_fields)
+
+        if run:
+            yield run
+
+    @classmethod
+    def _map_runs(
+            cls,
+            executor: 'Executor',
+            runs: Iterator[List[tuple]],
+            workers: int,
+    ) -> List[bool]:
+        """
+        Verify runs of field tuples on a process pool, a bounded batch of
+        runs at a time.
+        """
+
+        results = []
+        batch_size = workers * 4
+        batch = list(islice(runs, batch_size))
+
+        while batch:
+            for run, parts in zip(batch, executor.map(_verify_run, batch)):
+                epoch = cls.get_key_epoch(run[0][2])
+                remember = (
+                    epoch is not None and
+                    epoch.has_key and
+                    (cls._verify_cache_size or cls._verify_store is not None)
+                )
+
+                results.extend(
+                    sig_ok and hash_ok for _, sig_ok, hash_ok in parts
+                )
+
+                # Keep what the workers learned, as checks made here would
+                # have been kept, in one store transaction per run
+                if remember:
+                    cls._remember([
+                        ((epoch.name, digest, bytes(fields[5])), sig_ok)
+                        for fields, (digest, sig_ok, _) in zip(run, parts)
+                    ])
+
+            batch = list(islice(runs, batch_size))
+
+        return results
+
+    @classmethod
+    def _remember(
+            cls,
+            checks: Sequence[Tuple[Tuple[str, bytes, bytes], bool]],
+            from_store: bool = False,
+    ):
+        """
+        Keep RSA check results in the verification cache, and in the
+        verification store (in one transaction) unless they came from
+        there.
+
+        :param checks: ((key name, message digest, signature), result) pairs
+        :param from_store: 'True' if the results were read from the store
+        """
+
+        store = cls._verify_store
+
+        if not from_store and store is not None:
+            store.put_verifications(
+                (*key, result) for key, result in checks
+            )
+
+        with cls._verify_cache_lock:
+            if from_store:
+                cls._verify_store_hits += len(checks)
+            else:
+                cls._verify_misses += len(checks)
+
+            if cls._verify_cache_size:
+                for key, result in checks:
+                    cls._verify_cache[key] = result
+                    cls._verify_cache.move_to_end(key)
+
+                while len(cls._verify_cache) > cls._verify_cache_size:
+                    cls._verify_cache.popitem(last=False)
+
+    @classmethod
+    def _set_key_epochs(cls, epochs: Iterable[KeyEpoch]):
+        """
+        Replace the key epoch table.
+
+        :param epochs: Every key epoch, in any order
+        """
+
+        epochs = sorted(epochs, key=lambda epoch: epoch.start)
+
+        cls._key_epochs = ([epoch.start for epoch in epochs], epochs)
+
+    @classmethod
+    def _verify_run(cls, run: List[tuple]) -> List[bool]:
+        """
+        :param run: Field tuples from '_epoch_runs', all of one key epoch
+        :return: The result of every record's verification, in order
+        """
+
+        epoch = cls.get_key_epoch(run[0][2])
+
+        return [cls._check_record(epoch, *fields) for fields in run]
+
+    @classmethod
+    def _verify_run_parts(
+            cls,
+            run: List[tuple],
+    ) -> List[Tuple[bytes, bool, bool]]:
+        """
+        '_verify_run' for pool workers, keeping the parts of each result
+        so the calling process can remember the RSA checks.
+
+        :param run: Field tuples from '_epoch_runs', all of one key epoch
+        :return: The message digest, RSA check result and output value
+                 check result of every record, in order
+        """
+
+        epoch = cls.get_key_epoch(run[0][2])
+        results = []
+
+        for fields in run:
+            message_hash, sig_ok, hash_ok = cls._check_parts(epoch, *fields)
+            results.append((message_hash.digest(), sig_ok, hash_ok))
+
+        return results
+
+    @classmethod
+    def _verify_with(
+            cls,
+            verify_key: Optional[VerifyKey],
+            message_hash: 'Hash',
+            signature: bytes,
+    ) -> bool:
+        """
+        :param verify_key: The key (or key epoch) the message was signed with
+        :param message_hash: The hash that was carried out over the message
+        :param signature: The signature that needs to be validated
+        :return: True if verification is correct. False otherwise.
+        """
+
+        verifier = verify_key.verifier if verify_key is not None else None
+
+        # If a verifier exists to handle this problem, use it directly.
+        # Else, we cannot verify the record and must mark it invalid.
+        if verifier:
+            verifier: 'PKCS1_v1_5'
+            # PyCharm is wrong, see:
+            #   site-packages/Crypto/Signature/PKCS1_v1_5.py
+            #     Crypto.Signature.PKCS1_v1_5._pycrypto_verify
+            #
+            # noinspection PyNoneFunctionAssignment
+            result = verifier.verify(
+                message_hash,
+                signature,
+            )
+        else:
+            result = False
+
+        # Convert 1 to 'True', 'False' otherwise
+        if isinstance(result, int):
+            result = bool(result == 1)
+
+        return result
+
+    @classmethod
+    def clear_verify_cache(cls):
+        """
+        Drop every cached verification result and reset the counters.
+        The verification store, if any, is left untouched.
+        """
+
+        with cls._verify_cache_lock:
+            cls._verify_cache.clear()
+            cls._verify_hits = 0
+            cls._verify_misses = 0
+            cls._verify_store_hits = 0
+
+    @classmethod
+    def get_certificate(cls, certificate_id: str) -> Optional[VerifyKey]:
+        """
+        :param certificate_id: The 'certificateId' of a version 2.0 pulse
+        :return: The registered key for the certificate. 'None' otherwise.
+        """
+
+        return cls._certificates.get(certificate_id.lower())
 
     @classmethod
     def get_hash(
@@ -117,14 +588,17 @@ class NistBeaconCrypto:
             version: str,
             frequency: int,
             timestamp: int,
-            seed_value: str,
-            prev_output: str,
+            seed_value: Union[str, bytes],
+            prev_output: Union[str, bytes],
             status_code: str,
-    ) -> SHA512Hash:
+    ) -> 'SHA512Hash':
         """
         Given required properties from a NistBeaconValue,
         compute the SHA512Hash object.
 
+        The seed and previous output may be given as hex strings, or as
+        the raw bytes they represent to skip decoding them again.
+
         :param version: NistBeaconValue.version
         :param frequency: NistBeaconValue.frequency
         :param timestamp: NistBeaconValue.timestamp
@@ -134,23 +608,199 @@ class NistBeaconCrypto:
 
         :return: SHA512 Hash for NistBeaconValue signature verification
         """
-        return SHA512.new(
-            version.encode() +
-            struct.pack(
-                '>1I1Q64s64s1I',
+        if isinstance(seed_value, str):
+            seed_value = binascii.a2b_hex(seed_value)
+
+        if isinstance(prev_output, str):
+            prev_output = binascii.a2b_hex(prev_output)
+
+        # Only a handful of versions exist, their encodings are kept
+        sha512_hash = _sha512().new(cls._encode_version(version))
+        sha512_hash.update(
+            cls._MESSAGE_STRUCT.pack(
                 frequency,
                 timestamp,
-                binascii.a2b_hex(seed_value),
-                binascii.a2b_hex(prev_output),
+                seed_value,
+                prev_output,
                 int(status_code),
             )
         )
 
+        return sha512_hash
+
+    @classmethod
+    def get_key_epoch(cls, timestamp: int) -> Optional[KeyEpoch]:
+        """
+        :param timestamp: The timestamp of a record
+        :return: The key epoch the record falls in. 'None' if it comes
+                 before every known epoch.
+        """
+
+        starts, epochs = cls._key_epochs
+        position = bisect_right(starts, timestamp)
+
+        return epochs[position - 1] if position else None
+
+    @classmethod
+    def get_verify_store(cls):
+        """
+        :return: The verification store backing the cache. 'None' otherwise.
+        """
+
+        return cls._verify_store
+
+    @classmethod
+    def key_epochs(cls) -> List[KeyEpoch]:
+        """
+        :return: Every key epoch, oldest first
+        """
+
+        return list(cls._key_epochs[1])
+
+    @classmethod
+    def load_keys(cls):
+        """
+        Parse every known key now, instead of on first use. Handy before
+        forking workers, or to keep the cost out of a timed section.
+        """
+
+        for epoch in cls._key_epochs[1]:
+            _ = epoch.verifier
+
+    @classmethod
+    def new_verify_pool(cls, workers: Optional[int] = None) -> 'Executor':
+        """
+        Start a process pool set up for 'verify_many'.
+
+        The workers copy the key epoch table as it is now. Keys
+        registered later are not seen by this pool.
+
+        :param workers:
+            Number of worker processes, defaulting to the number of CPUs
+        :return: The pool. Shut it down (or use it in a 'with' block)
+                 when done.
+        """
+
+        # pylint: disable=import-outside-toplevel
+        from concurrent.futures import ProcessPoolExecutor
+
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_verify_worker,
+            initargs=(tuple(cls._key_epochs[1]),),
+        )
+
+    @classmethod
+    def register_certificate(
+            cls,
+            certificate_id: str,
+            key_data: KeyData,
+    ) -> VerifyKey:
+        """
+        Make a certificate known, so version 2.0 pulses naming it in their
+        'certificateId' can be verified. A certificate already registered
+        under that id is replaced.
+
+        :param certificate_id: The hex id pulses refer to the certificate by
+        :param key_data:
+            The X.509 certificate (PEM or DER), or its RSA public key, or
+            the path of a file holding either
+        :return: The parsed key
+        """
+
+        certificate_id = certificate_id.lower()
+        verify_key = VerifyKey(key_data, certificate_id)
+        _ = verify_key.verifier
+
+        with cls._key_lock:
+            cls._certificates = {
+                **cls._certificates,
+                certificate_id: verify_key,
+            }
+
+        return verify_key
+
+    @classmethod
+    def register_key(
+            cls,
+            start_timestamp: int,
+            key_data: Optional[KeyData],
+            name: Optional[str] = None,
+    ) -> KeyEpoch:
+        """
+        Add a key epoch, so records from 'start_timestamp' on (until the
+        next epoch) are checked against the given key. An epoch already
+        starting at that timestamp is replaced.
+
+        The key is parsed right away, so bad key data fails here rather
+        than during verification.
+
+        :param start_timestamp:
+            The timestamp of the first record signed by the key
+        :param key_data:
+            A PEM or DER encoded RSA public key or X.509 certificate (such
+            as NIST's 'beacon.cer'), or the path of a file holding one.
+            'None' marks records from then on as unverifiable.
+        :param name:
+            Identifies the key in cached and stored verification results,
+            so it must be unique to the key. Defaults to a fingerprint of
+            the key.
+        :return: The new key epoch
+        """
+
+        epoch = KeyEpoch(start_timestamp, key_data, name)
+
+        if epoch.has_key:
+            _ = epoch.verifier
+
+        with cls._key_lock:
+            cls._set_key_epochs(
+                [
+                    existing for existing in cls._key_epochs[1]
+                    if existing.start != start_timestamp
+                ] + [epoch]
+            )
+
+        return epoch
+
+    @classmethod
+    def set_verify_cache_size(cls, maxsize: int):
+        """
+        Bound the in-memory verification result cache.
+
+        :param maxsize:
+            The maximum number of results to hold. '0' disables the
+            in-memory cache.
+        """
+
+        if maxsize < 0:
+            raise ValueError('maxsize must not be negative')
+
+        with cls._verify_cache_lock:
+            cls._verify_cache_size = maxsize
+
+            while len(cls._verify_cache) > maxsize:
+                cls._verify_cache.popitem(last=False)
+
+    @classmethod
+    def set_verify_store(cls, store):
+        """
+        Back the verification result cache with a persistent store, so
+        results survive restarts.
+
+        :param store:
+            An object with 'get_verification(epoch, digest, signature)'
+            and 'put_verification(epoch, digest, signature, result)'
+            methods, such as a 'NistBeaconStore'. 'None' removes it.
+        """
+
+        cls._verify_store = store
+
     @classmethod
     def verify(
             cls,
             timestamp: int,
-            message_hash: Hash,
+            message_hash: 'Hash',
             signature: bytes,
     ) -> bool:
         """
@@ -164,32 +814,178 @@ class NistBeaconCrypto:
         :return: True if verification is correct. False otherwise.
         """
 
-        # Determine verifier type to use based on timestamp.
-        if timestamp < 1496176860:
-            verifier = cls._VERIFIER_20130905
-        elif timestamp < 1502202360:
-            verifier = None
-        else:
-            verifier = cls._VERIFIER_20170808
+        return cls._verify_with(
+            cls.get_key_epoch(timestamp),
+            message_hash,
+            signature,
+        )
 
-        # If a verifier exists to handle this problem, use it directly.
-        # Else, we cannot verify the record and must mark it invalid.
-        if verifier:
-            verifier: PKCS1_v1_5
-            # PyCharm is wrong, see:
-            #   site-packages/Crypto/Signature/PKCS1_v1_5.py
-            #     Crypto.Signature.PKCS1_v1_5._pycrypto_verify
-            #
-            # noinspection PyNoneFunctionAssignment
-            result = verifier.verify(
-                message_hash,
-                signature,
+    @classmethod
+    def verify_cache_info(cls) -> VerifyCacheInfo:
+        """
+        :return:
+            How many RSA checks were answered by the in-memory cache
+            (hits) or the verification store (store_hits), how many had to
+            be run (misses), and the cache's bound and current size.
+        """
+
+        with cls._verify_cache_lock:
+            return VerifyCacheInfo(
+                hits=cls._verify_hits,
+                store_hits=cls._verify_store_hits,
+                misses=cls._verify_misses,
+                maxsize=cls._verify_cache_size,
+                currsize=len(cls._verify_cache),
             )
-        else:
-            result = False
 
-        # Convert 1 to 'True', 'False' otherwise
-        if isinstance(result, int):
-            result = bool(result == 1)
+    @classmethod
+    def verify_many(
+            cls,
+            records: Iterable,
+            workers: Optional[int] = None,
+            chunk_size: int = 256,
+            executor: Optional['Executor'] = None,
+    ) -> List[bool]:
+        """
+        Verify many beacon values, spreading the work over a pool of
+        processes so RSA checks run on every core instead of one.
 
-        return result
+        Records are grouped into runs signed under the same key epoch, so
+        the key is looked up once per run. Runs are sent to the workers as
+        plain field tuples, in chunks of at most 'chunk_size', and pulled
+        from 'records' a batch at a time so the input is never held in
+        full. The RSA keys are loaded once per worker, when it starts.
+        Workers use their own in-memory result cache, but not the
+        verification store. Their RSA results are kept in this process's
+        cache and store, so later checks of the same records are free.
+
+        :param records: The NistBeaconValue objects to verify
+        :param workers:
+            Number of worker processes, defaulting to the number of CPUs.
+            With a single worker, everything runs in this process.
+        :param chunk_size: Number of records handed to a worker at a time
+        :param executor:
+            A pool from 'new_verify_pool' to use instead of starting one,
+            for callers verifying many batches. 'workers' only sizes the
+            batches then, and the pool is left running.
+        :return: The result of every record's verification, in order
+        """
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers < 1 or chunk_size < 1:
+            raise ValueError('workers and chunk_size must be at least 1')
+
+        fields = (
+            (
+                record.version,
+                record.frequency,
+                record.timestamp,
+                record.seed_value_bytes,
+                record.previous_output_value_bytes,
+                record.signature_value_bytes,
+                record.output_value_bytes,
+                record.status_code,
+            )
+            for record in records
+        )
+
+        runs = cls._epoch_runs(fields, chunk_size)
+
+        if executor is not None:
+            return cls._map_runs(executor, runs, workers)
+
+        if workers == 1:
+            return list(chain.from_iterable(map(cls._verify_run, runs)))
+
+        with cls.new_verify_pool(workers) as pool:
+            return cls._map_runs(pool, runs, workers)
+
+    @classmethod
+    def verify_message(
+            cls,
+            certificate_id: str,
+            message: bytes,
+            signature: bytes,
+            output_value: bytes,
+    ) -> bool:
+        """
+        Verify a version 2.0 pulse from its serialized message, in a
+        single pass over the message.
+
+        The RSA PKCS#1 v1.5 signature covers the SHA-512 of the message,
+        and the output value must be the SHA-512 of the message followed
+        by the length prefixed signature. Both hashes share the work done
+        over the message.
+
+        :param certificate_id: The certificate the pulse was signed with
+        :param message: The pulse serialized up to its signature
+        :param signature: The signature value, as published
+        :param output_value: The output value, as published
+        :return: 'True' if both checks pass. 'False' otherwise
+        """
+
+        message_hash = _sha512().new(message)
+
+        # Carry on from the message hash, instead of hashing it again
+        output_hash = message_hash.copy()
+        output_hash.update(cls._LENGTH_STRUCT.pack(len(signature)))
+        output_hash.update(signature)
+
+        if output_hash.digest() != output_value:
+            return False
+
+        return cls._cached_verify(
+            cls.get_certificate(certificate_id),
+            message_hash,
+            signature,
+            reversed_signature=False,
+        )
+
+    @classmethod
+    def verify_record(
+            cls,
+            version: str,
+            frequency: int,
+            timestamp: int,
+            seed_value: bytes,
+            prev_output: bytes,
+            signature: bytes,
+            output_value: bytes,
+            status_code: str,
+            message_hash: Optional['SHA512Hash'] = None,
+    ) -> bool:
+        """
+        Run the RSA signature check and the output value hash check for
+        the fields of a single beacon value.
+
+        Each field is used as given, no decoding or copying happens beyond
+        reversing the signature for the RSA check.
+
+        :param version: NistBeaconValue.version
+        :param frequency: NistBeaconValue.frequency
+        :param timestamp: NistBeaconValue.timestamp
+        :param seed_value: NistBeaconValue.seed_value_bytes
+        :param prev_output: NistBeaconValue.previous_output_value_bytes
+        :param signature: NistBeaconValue.signature_value_bytes
+        :param output_value: NistBeaconValue.output_value_bytes
+        :param status_code: NistBeaconValue.status_code
+        :param message_hash:
+            The hash from 'get_hash' over these fields, if the caller
+            already computed it
+        :return: 'True' if both checks pass. 'False' otherwise
+        """
+
+        return cls._check_record(
+            cls.get_key_epoch(timestamp),
+            version,
+            frequency,
+            timestamp,
+            seed_value,
+            prev_output,
+            signature,
+            output_value,
+            status_code,
+            message_hash,
+        )
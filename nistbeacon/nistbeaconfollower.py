@@ -0,0 +1,269 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+from typing import (
+    List,
+    NamedTuple,
+    Optional,
+    Union,
+)
+
+from nistbeacon.nistbeacon import NistBeacon
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class ChainEvent(NamedTuple):
+    """
+    What a 'ChainFollower' found out about one new record.
+    """
+
+    record: NistBeaconValue
+
+    # The record's signature and output value check out
+    valid_signature: bool
+
+    # The record's previous output value is the head's output value. The
+    # first record a follower sees has nothing to link to, and counts as
+    # linked.
+    linked: bool
+
+    # Status bit 2, more time than the frequency passed since the last
+    # record, but the chain is intact
+    gap: bool
+
+    # Status bit 1, a new chain starts and is not linked to the old one
+    restart: bool
+
+    @property
+    def ok(self) -> bool:
+        """
+        :return: 'True' if the record verifies and fits the chain
+        """
+
+        return self.valid_signature and (self.linked or self.restart)
+
+
+class ChainFollower:
+    """
+    Follow the head of the beacon chain, verifying each record once.
+
+    'chain_check' on the newest record costs three fetches and three
+    signature checks every time. A follower instead remembers the last
+    record it accepted (the head), so each new record costs one fetch, one
+    signature check and one comparison of its previous output value with
+    the head's output value.
+
+    When records were missed between polls, the follower walks forward
+    from its head with 'get_next', checking every missed record the same
+    way, so no link goes unchecked.
+
+    Only records with a valid signature become the head. An invalid
+    record is reported once and looked at again on the next walk, so a
+    forged or corrupt record cannot break the chain for the records after
+    it.
+
+    The head can be kept in a JSON checkpoint file, so a restarted
+    follower resumes where it stopped instead of trusting a new head.
+    """
+
+    _KEY_OUTPUT_VALUE = 'outputValue'
+    _KEY_TIMESTAMP = 'timeStamp'
+
+    # Version 1.0 status codes are 0, 1 or 2. Version 2.0 status codes are
+    # a bit field, using the same values as bits.
+    _STATUS_RESTART = 1
+    _STATUS_GAP = 2
+
+    def __init__(
+            self,
+            source=NistBeacon,
+            checkpoint_path: Optional[Union[str, os.PathLike]] = None,
+    ):
+        """
+        :param source:
+            Where records come from: anything with 'get_last_record' and
+            'get_next', such as 'NistBeacon' (the default), a backend, or
+            a 'BeaconChain'
+        :param checkpoint_path:
+            A JSON file keeping the head between runs. It is read now if
+            it exists, and written after every poll finding new records.
+        """
+
+        self._source = source
+        self._checkpoint_path = checkpoint_path
+        self._head_timestamp = None
+        self._head_output_value = None
+
+        # The newest record looked at, valid or not
+        self._seen_timestamp = None
+
+        if checkpoint_path is not None and os.path.exists(checkpoint_path):
+            self._load_checkpoint()
+
+    @property
+    def checkpoint_path(self) -> Optional[Union[str, os.PathLike]]:
+        """
+        :return: The checkpoint file in use. 'None' otherwise.
+        """
+
+        return self._checkpoint_path
+
+    @property
+    def head_output_value(self) -> Optional[str]:
+        """
+        :return: The output value of the head, as a hex string.
+                 'None' before the first record.
+        """
+
+        if self._head_output_value is None:
+            return None
+
+        return self._head_output_value.hex().upper()
+
+    @property
+    def head_timestamp(self) -> Optional[int]:
+        """
+        :return: The timestamp of the head. 'None' before the first record.
+        """
+
+        return self._head_timestamp
+
+    def _advance(self, record: NistBeaconValue) -> ChainEvent:
+        """
+        Check a record against the head, then make it the new head if its
+        signature is valid.
+        """
+
+        status_code = int(record.status_code)
+
+        event = ChainEvent(
+            record=record,
+            valid_signature=record.valid_signature,
+            linked=(
+                self._head_output_value is None or
+                record.previous_output_value_bytes == self._head_output_value
+            ),
+            gap=bool(status_code & self._STATUS_GAP),
+            restart=bool(status_code & self._STATUS_RESTART),
+        )
+
+        if self._seen_timestamp is None or (
+                record.timestamp > self._seen_timestamp
+        ):
+            self._seen_timestamp = record.timestamp
+
+        if event.valid_signature:
+            self._head_timestamp = record.timestamp
+            self._head_output_value = record.output_value_bytes
+
+        return event
+
+    def _load_checkpoint(self):
+        try:
+            with open(self._checkpoint_path, encoding='utf-8') as handle:
+                checkpoint = json.load(handle)
+
+            timestamp = int(checkpoint[self._KEY_TIMESTAMP])
+            output_value = bytes.fromhex(checkpoint[self._KEY_OUTPUT_VALUE])
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                f'{self._checkpoint_path} is not a chain checkpoint'
+            ) from None
+
+        self._head_timestamp = timestamp
+        self._head_output_value = output_value
+        self._seen_timestamp = timestamp
+
+    def _save_checkpoint(self):
+        # Write aside and swap in, so a crash never leaves half a file
+        partial_path = f'{os.fspath(self._checkpoint_path)}.partial'
+
+        with open(partial_path, 'w', encoding='utf-8') as handle:
+            json.dump(
+                {
+                    self._KEY_TIMESTAMP: self._head_timestamp,
+                    self._KEY_OUTPUT_VALUE: self.head_output_value,
+                },
+                handle,
+            )
+
+        os.replace(partial_path, self._checkpoint_path)
+
+    def poll(self) -> List[ChainEvent]:
+        """
+        Fetch the newest record and check every record since the head.
+
+        :return: One event per new record, oldest first. Empty when there
+                 is nothing new, or the source cannot be reached, even
+                 partway through the records since the head.
+        """
+
+        last_record = self._source.get_last_record()
+
+        if last_record is None:
+            return []
+
+        newest = self._seen_timestamp
+
+        if newest is not None and last_record.timestamp <= newest:
+            return []
+
+        events = []
+
+        # Not the next record, or a restart hiding what came before it:
+        # walk the records missed since the head
+        if (
+                self._head_output_value is not None and
+                last_record.previous_output_value_bytes !=
+                self._head_output_value
+        ):
+            head = (
+                self._head_timestamp,
+                self._head_output_value,
+                self._seen_timestamp,
+            )
+            record = self._source.get_next(self._head_timestamp)
+
+            while (
+                    record is not None and
+                    record.timestamp < last_record.timestamp
+            ):
+                # Records already reported as invalid are only reported
+                # again once they verify
+                if record.timestamp > newest or record.valid_signature:
+                    events.append(self._advance(record))
+
+                record = self._source.get_next(record.timestamp)
+
+            # The walk broke off before the newest record: keep the old
+            # head, so the next poll walks the same records again
+            if record is None:
+                (
+                    self._head_timestamp,
+                    self._head_output_value,
+                    self._seen_timestamp,
+                ) = head
+
+                return []
+
+        events.append(self._advance(last_record))
+
+        if self._checkpoint_path is not None:
+            self._save_checkpoint()
+
+        return events
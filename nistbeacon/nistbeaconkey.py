@@ -0,0 +1,165 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import os
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Union,
+)
+
+if TYPE_CHECKING:  # pragma: no cover
+    from Crypto.Signature import PKCS1_v1_5
+
+KeyData = Union[str, bytes, os.PathLike]
+
+
+class VerifyKey:
+    """
+    An RSA public key, parsed and wrapped in a PKCS#1 v1.5 verifier on
+    first use. A key without data cannot verify anything.
+    """
+
+    def __init__(
+            self,
+            key_data: Optional[KeyData],
+            name: Optional[str] = None,
+    ):
+        """
+        :param key_data:
+            A PEM or DER encoded RSA public key or X.509 certificate, or
+            the path of a file holding one. 'None' for no key.
+        :param name:
+            Identifies the key in verification results. Defaults to a
+            fingerprint of the key.
+        """
+
+        # PEM text never names a file, so a string naming one is a path
+        if (
+                isinstance(key_data, os.PathLike) or
+                (isinstance(key_data, str) and os.path.isfile(key_data))
+        ):
+            with open(key_data, 'rb') as handle:
+                key_data = handle.read()
+
+        self._key = None
+        self._key_data = key_data
+        self._lock = Lock()
+        self._name = name
+        self._verifier = None
+
+    def __reduce__(self):
+        # Parsed keys stay behind, the other side parses its own
+        return self.__class__, (self._key_data, self._name)
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}(name={self.name!r})'
+
+    @property
+    def has_key(self) -> bool:
+        """
+        :return: 'True' if there is a key to verify with
+        """
+
+        return self._key_data is not None
+
+    @property
+    def key(self):
+        """
+        :return: The parsed RSA key. 'None' without key data.
+        """
+
+        self._load()
+        return self._key
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        :return: The name of the key. 'None' without key data.
+        """
+
+        if self._name is None and self.has_key:
+            # noinspection PyUnresolvedReferences
+            self._name = hashlib.sha256(
+                self.key.export_key(format='DER')
+            ).hexdigest()[:16]
+
+        return self._name
+
+    @property
+    def verifier(self) -> Optional['PKCS1_v1_5.PKCS115_SigScheme']:
+        """
+        :return: The PKCS#1 v1.5 verifier for the key.
+                 'None' without key data.
+        """
+
+        self._load()
+        return self._verifier
+
+    def _load(self):
+        if self._verifier is not None or not self.has_key:
+            return
+
+        # pylint: disable=import-outside-toplevel
+        from Crypto.PublicKey import RSA
+        from Crypto.Signature import PKCS1_v1_5
+
+        with self._lock:
+            if self._verifier is None:
+                # Certificates are accepted too, their public key is used
+                self._key = RSA.import_key(self._key_data)
+                self._verifier = PKCS1_v1_5.new(self._key)
+
+
+class KeyEpoch(VerifyKey):
+    """
+    One entry of the key epoch table of 'NistBeaconCrypto': the key that
+    signed every record from 'start' until the next epoch begins.
+
+    An epoch without a key marks a period whose records cannot be
+    verified.
+    """
+
+    def __init__(
+            self,
+            start: int,
+            key_data: Optional[KeyData],
+            name: Optional[str] = None,
+    ):
+        """
+        :param start: The timestamp of the first record signed by the key
+        :param key_data: See 'VerifyKey'
+        :param name: See 'VerifyKey'
+        """
+
+        super().__init__(key_data, name)
+        self._start = start
+
+    def __reduce__(self):
+        return self.__class__, (self._start, self._key_data, self._name)
+
+    def __repr__(self) -> str:
+        return f'KeyEpoch(start={self._start!r}, name={self.name!r})'
+
+    @property
+    def start(self) -> int:
+        """
+        :return: The timestamp of the first record signed by the key
+        """
+
+        return self._start
@@ -0,0 +1,232 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+from itertools import islice
+from typing import (
+    IO,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
+from xml.etree import ElementTree
+
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+Source = Union[str, os.PathLike, IO]
+
+
+class NistBeaconLoader:
+    """
+    Streaming readers for large archives of beacon records.
+
+    Records are parsed one at a time and handed out as soon as they are
+    read, so memory use does not grow with the size of the archive.
+    Records that cannot be understood are skipped.
+    """
+
+    _XML_RECORD_TAG = 'record'
+
+    @classmethod
+    def _maybe_verify(
+            cls,
+            records: Iterator[NistBeaconValue],
+            verify: bool,
+            workers: Optional[int],
+            batch_size: int,
+    ) -> Iterator[NistBeaconValue]:
+        if not verify:
+            yield from records
+            return
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        executor = None
+
+        if workers > 1:
+            executor = NistBeaconCrypto.new_verify_pool(workers)
+
+        try:
+            batch = list(islice(records, batch_size))
+
+            while batch:
+                results = NistBeaconCrypto.verify_many(
+                    batch,
+                    workers=workers,
+                    executor=executor,
+                )
+
+                for record, result in zip(batch, results):
+                    # noinspection PyProtectedMember
+                    # pylint: disable=protected-access
+                    record._valid_signature = result
+
+                    yield record
+
+                batch = list(islice(records, batch_size))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    @classmethod
+    def _parse_json_lines(cls, source: Source) -> Iterator[NistBeaconValue]:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, encoding='utf-8') as handle:
+                yield from cls._parse_json_lines(handle)
+            return
+
+        for line in source:
+            if not line.strip():
+                continue
+
+            try:
+                record = NistBeaconValue.from_json(line)
+            except (TypeError, ValueError):
+                record = None
+
+            if record is not None:
+                yield record
+
+    @classmethod
+    def _parse_xml(cls, source: Source) -> Iterator[NistBeaconValue]:
+        # Keep the chain of open elements, so each finished record can be
+        # detached from its parent and the tree never grows
+        open_elements = []
+
+        for event, element in ElementTree.iterparse(
+                source,
+                events=('start', 'end'),
+        ):
+            if event == 'start':
+                open_elements.append(element)
+                continue
+
+            open_elements.pop()
+            tag = element.tag
+
+            if tag[tag.rfind('}') + 1:] != cls._XML_RECORD_TAG:
+                continue
+
+            try:
+                record = NistBeaconValue.from_xml_element(element)
+            except (TypeError, ValueError):
+                record = None
+
+            if open_elements:
+                open_elements[-1].remove(element)
+
+            if record is not None:
+                yield record
+
+    @classmethod
+    def ingest(
+            cls,
+            records: Iterable[NistBeaconValue],
+            store,
+            batch_size: int = 1000,
+            valid_only: bool = False,
+    ) -> int:
+        """
+        Write records into a local store, one transaction per batch.
+
+        :param records: The records to store, for example from 'iter_xml'
+        :param store: A 'NistBeaconStore', or anything with 'put_many'
+        :param batch_size: Number of records written per transaction
+        :param valid_only: 'True' skips records failing verification
+        :return: The number of records handed to the store
+        """
+
+        if valid_only:
+            records = (record for record in records if record.valid_signature)
+
+        records = iter(records)
+        count = 0
+        batch = list(islice(records, batch_size))
+
+        while batch:
+            store.put_many(batch)
+            count += len(batch)
+            batch = list(islice(records, batch_size))
+
+        return count
+
+    @classmethod
+    def iter_json_lines(
+            cls,
+            source: Source,
+            verify: bool = False,
+            workers: Optional[int] = None,
+            batch_size: int = 1024,
+    ) -> Iterator[NistBeaconValue]:
+        """
+        Read records from a JSON lines archive, one record per line.
+
+        :param source: A file path, or a file object opened for reading
+        :param verify:
+            'True' checks every signature as records are read, in batches
+            of 'batch_size' spread over a process pool. The results are
+            available from 'valid_signature' without further work.
+        :param workers:
+            Number of verification processes, defaulting to the number of
+            CPUs. '1' verifies in this process.
+        :param batch_size: Number of records verified at a time
+        :return: The records, in archive order
+        """
+
+        return cls._maybe_verify(
+            cls._parse_json_lines(source),
+            verify,
+            workers,
+            batch_size,
+        )
+
+    @classmethod
+    def iter_xml(
+            cls,
+            source: Source,
+            verify: bool = False,
+            workers: Optional[int] = None,
+            batch_size: int = 1024,
+    ) -> Iterator[NistBeaconValue]:
+        """
+        Read records from an XML archive holding any number of 'record'
+        elements, at any depth and in any namespace.
+
+        Malformed XML cannot be read past, so the first XML error raises
+        'xml.etree.ElementTree.ParseError', once the records before it
+        have been handed out.
+
+        :param source: A file path, or a file object opened for reading
+        :param verify:
+            'True' checks every signature as records are read, in batches
+            of 'batch_size' spread over a process pool. The results are
+            available from 'valid_signature' without further work.
+        :param workers:
+            Number of verification processes, defaulting to the number of
+            CPUs. '1' verifies in this process.
+        :param batch_size: Number of records verified at a time
+        :return: The records, in archive order
+        """
+
+        return cls._maybe_verify(
+            cls._parse_xml(source),
+            verify,
+            workers,
+            batch_size,
+        )
@@ -0,0 +1,203 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from typing import (
+    Iterable,
+    Optional,
+)
+from xml.etree import ElementTree
+
+from nistbeacon.nistbeaconpulse import NistBeaconPulse
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconParser:
+    """
+    Parse beacon records of any known format, picking the record class
+    from the record itself.
+
+    JSON records are matched on their 'version'. XML records are matched on
+    the namespace of their root element, falling back to their 'version'
+    element. Version 1.0 records become 'NistBeaconValue' objects, and
+    version 2.0 pulses 'NistBeaconPulse' objects. Other formats can be
+    added with 'register'.
+
+    Record classes need 'from_dict' and 'from_xml_element' class methods,
+    each returning 'None' for input they cannot understand.
+    """
+
+    _KEY_PULSE = 'pulse'
+    _KEY_VERSION = 'version'
+
+    _namespaces = {
+        'http://beacon.nist.gov/record/0.1/': NistBeaconValue,
+        'http://beacon.nist.gov/beacon/2.0/': NistBeaconPulse,
+    }
+
+    _versions = {
+        'Version 1.0': NistBeaconValue,
+        'Version 2.0': NistBeaconPulse,
+    }
+
+    @classmethod
+    def _version_of_element(
+            cls,
+            element: ElementTree.Element,
+    ) -> Optional[str]:
+        for child in element:
+            tag = child.tag
+
+            if tag[tag.rfind('}') + 1:] == cls._KEY_VERSION:
+                return child.text
+
+        return None
+
+    @classmethod
+    def from_dict(cls, data: dict, eager_verify: bool = False):
+        """
+        :param data: A decoded JSON record
+        :param eager_verify: 'True' checks the signature right away
+        :return: A record object of the class registered for its version.
+                 'None' otherwise.
+        """
+
+        if not isinstance(data, dict):
+            return None
+
+        # Version 2.0 pulses come wrapped in a 'pulse' object
+        record = data.get(cls._KEY_PULSE, data)
+
+        if not isinstance(record, dict):
+            return None
+
+        record_class = cls.get_record_class(
+            version=record.get(cls._KEY_VERSION),
+        )
+
+        if record_class is None:
+            return None
+
+        return record_class.from_dict(data, eager_verify=eager_verify)
+
+    @classmethod
+    def from_json(cls, input_json: str, eager_verify: bool = False):
+        """
+        :param input_json: A JSON record of any registered version
+        :param eager_verify: 'True' checks the signature right away
+        :return: A record object of the class registered for its version.
+                 'None' otherwise.
+        """
+
+        try:
+            data = json.loads(input_json)
+        except ValueError:
+            data = None
+
+        # Anything but an object is turned down by 'from_dict'
+        return cls.from_dict(data, eager_verify=eager_verify)
+
+    @classmethod
+    def from_xml(cls, input_xml: str, eager_verify: bool = False):
+        """
+        :param input_xml: An XML record of any registered format
+        :param eager_verify: 'True' checks the signature right away
+        :return: A record object of the class registered for its format.
+                 'None' otherwise.
+        """
+
+        try:
+            return cls.from_xml_element(
+                ElementTree.fromstring(input_xml),
+                eager_verify=eager_verify,
+            )
+        except ElementTree.ParseError:
+            return None
+
+    @classmethod
+    def from_xml_element(
+            cls,
+            element: ElementTree.Element,
+            eager_verify: bool = False,
+    ):
+        """
+        :param element: An already parsed XML record
+        :param eager_verify: 'True' checks the signature right away
+        :return: A record object of the class registered for its format.
+                 'None' otherwise.
+        """
+
+        tag = element.tag
+        namespace = tag[1:tag.find('}')] if tag.startswith('{') else None
+
+        record_class = cls.get_record_class(namespace=namespace)
+
+        if record_class is None:
+            record_class = cls.get_record_class(
+                version=cls._version_of_element(element),
+            )
+
+        if record_class is None:
+            return None
+
+        return record_class.from_xml_element(
+            element,
+            eager_verify=eager_verify,
+        )
+
+    @classmethod
+    def get_record_class(
+            cls,
+            version: Optional[str] = None,
+            namespace: Optional[str] = None,
+    ) -> Optional[type]:
+        """
+        :param version: A record version, such as 'Version 2.0'
+        :param namespace: An XML namespace
+        :return: The record class registered for the namespace if given,
+                 else for the version. 'None' otherwise.
+        """
+
+        if namespace is not None:
+            return cls._namespaces.get(namespace)
+
+        return cls._versions.get(version)
+
+    @classmethod
+    def register(
+            cls,
+            record_class: type,
+            versions: Iterable[str] = (),
+            namespaces: Iterable[str] = (),
+    ):
+        """
+        Parse records of the given versions and XML namespaces with
+        'record_class', replacing any class registered for them before.
+
+        :param record_class:
+            A class with 'from_dict' and 'from_xml_element' class methods
+        :param versions: The record versions the class handles
+        :param namespaces: The XML namespaces the class handles
+        """
+
+        cls._versions = {
+            **cls._versions,
+            **{version: record_class for version in versions},
+        }
+        cls._namespaces = {
+            **cls._namespaces,
+            **{namespace: record_class for namespace in namespaces},
+        }
@@ -0,0 +1,705 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import struct
+from datetime import (
+    datetime,
+    timezone,
+)
+from typing import (
+    Iterable,
+    Optional,
+    Tuple,
+    Union,
+)
+from xml.etree import ElementTree
+
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+
+
+class NistBeaconPulse:
+    # The fields are those of the published pulse schema
+    # pylint: disable=too-many-instance-attributes,too-many-public-methods
+    """
+    A single pulse of the version 2.0 NIST Randomness Beacon.
+
+    Like 'NistBeaconValue', values are kept as raw bytes in `__slots__`,
+    with upper case hex strings produced on demand, and the signature is
+    only checked once 'valid_signature' is read.
+
+    Pulses are verified against the certificate named by their
+    'certificate_id', which has to be registered first with
+    'NistBeaconCrypto.register_certificate'. Pulses from an unknown
+    certificate never verify.
+    """
+
+    __slots__ = (
+        '_certificate_id',
+        '_chain_index',
+        '_cipher_suite',
+        '_external_source_id',
+        '_external_status_code',
+        '_external_value',
+        '_json',
+        '_list_values',
+        '_local_random_value',
+        '_message',
+        '_message_digest',
+        '_output_value',
+        '_period',
+        '_precommitment_value',
+        '_pulse_index',
+        '_signature_value',
+        '_status_code',
+        '_time_stamp',
+        '_timestamp',
+        '_uri',
+        '_valid_signature',
+        '_version',
+    )
+
+    _UINT32_STRUCT = struct.Struct('>I')
+    _UINT64_PAIR_STRUCT = struct.Struct('>QQ')
+    _UINT32_PAIR_STRUCT = struct.Struct('>II')
+
+    _TIME_STAMP_FORMATS = (
+        '%Y-%m-%dT%H:%M:%S.%fZ',
+        '%Y-%m-%dT%H:%M:%SZ',
+    )
+
+    _KEY_CERTIFICATE_ID = 'certificateId'
+    _KEY_CHAIN_INDEX = 'chainIndex'
+    _KEY_CIPHER_SUITE = 'cipherSuite'
+    _KEY_EXTERNAL = 'external'
+    _KEY_LIST_VALUES = 'listValues'
+    _KEY_LOCAL_RANDOM_VALUE = 'localRandomValue'
+    _KEY_OUTPUT_VALUE = 'outputValue'
+    _KEY_PERIOD = 'period'
+    _KEY_PRECOMMITMENT_VALUE = 'precommitmentValue'
+    _KEY_PULSE = 'pulse'
+    _KEY_PULSE_INDEX = 'pulseIndex'
+    _KEY_SIGNATURE_VALUE = 'signatureValue'
+    _KEY_SOURCE_ID = 'sourceId'
+    _KEY_STATUS_CODE = 'statusCode'
+    _KEY_TIMESTAMP = 'timeStamp'
+    _KEY_TYPE = 'type'
+    _KEY_URI = 'uri'
+    _KEY_VALUE = 'value'
+    _KEY_VERSION = 'version'
+
+    _LIST_VALUE_PREVIOUS = 'previous'
+
+    def __init__(
+            self,
+            uri: str,
+            version: str,
+            cipher_suite: int,
+            period: int,
+            certificate_id: Union[str, bytes],
+            chain_index: int,
+            pulse_index: int,
+            time_stamp: str,
+            local_random_value: Union[str, bytes],
+            external_source_id: Union[str, bytes],
+            external_status_code: int,
+            external_value: Union[str, bytes],
+            list_values: Iterable[Tuple[str, str, Union[str, bytes]]],
+            precommitment_value: Union[str, bytes],
+            status_code: int,
+            signature_value: Union[str, bytes],
+            output_value: Union[str, bytes],
+            eager_verify: bool = False,
+    ):
+        # pylint: disable=too-many-arguments,too-many-locals
+        """
+        :param uri: The address of the pulse
+        :param version: Reported NIST randomness beacon version
+        :param cipher_suite: The hash and signature algorithms in use
+        :param period: The time interval, in milliseconds, between pulses
+        :param certificate_id: The hash of the signing certificate
+        :param chain_index: The chain the pulse belongs to
+        :param pulse_index: The position of the pulse in its chain
+        :param time_stamp:
+            The time of the pulse, as published (ISO 8601, in UTC)
+        :param local_random_value: The beacon's own 512 random bits
+        :param external_source_id: The hash of the external source
+        :param external_status_code: The status of the external value
+        :param external_value: The external random value
+        :param list_values:
+            The output values of earlier pulses this pulse links to, as
+            (type, uri, value) in published order. Types are 'previous',
+            'hour', 'day', 'month' and 'year'.
+        :param precommitment_value:
+            The SHA-512 hash of the next pulse's local random value
+        :param status_code:
+            A bit field, 0 when the chain is intact and the values good
+        :param signature_value:
+            The RSA signature over every field above, serialized in order
+        :param output_value:
+            The SHA-512 hash of every field above and the signature value
+
+        Hash and random values are accepted as hex strings or as the raw
+        bytes they represent.
+
+        :param eager_verify:
+            'True' checks the signature right away. 'False' (the default)
+            defers the check until 'valid_signature' is first read.
+        """
+
+        self._uri = uri
+        self._version = version
+        self._cipher_suite = cipher_suite
+        self._period = period
+        self._certificate_id = self._to_bytes(certificate_id)
+        self._chain_index = chain_index
+        self._pulse_index = pulse_index
+        self._time_stamp = time_stamp
+        self._local_random_value = self._to_bytes(local_random_value)
+        self._external_source_id = self._to_bytes(external_source_id)
+        self._external_status_code = external_status_code
+        self._external_value = self._to_bytes(external_value)
+        self._list_values = tuple(
+            (value_type, value_uri, self._to_bytes(value))
+            for value_type, value_uri, value in list_values
+        )
+        self._precommitment_value = self._to_bytes(precommitment_value)
+        self._status_code = status_code
+        self._signature_value = self._to_bytes(signature_value)
+        self._output_value = self._to_bytes(output_value)
+
+        # Built on first use, see 'json', 'message', 'message_digest' and
+        # 'timestamp'
+        self._json = None
+        self._message = None
+        self._message_digest = None
+        self._timestamp = None
+
+        # Signature checking is deferred, see 'valid_signature'
+        self._valid_signature = None
+
+        if eager_verify:
+            self._valid_signature = self._verify_signature()
+
+    def __eq__(self, other):
+        try:
+            # The message covers every signed field
+            return self.message == other.message \
+                   and self.signature_value == other.signature_value \
+                   and self.output_value == other.output_value \
+                   and self.list_values == other.list_values
+        except (AttributeError, TypeError):
+            return False
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    @staticmethod
+    def _to_bytes(value: Union[str, bytes]) -> bytes:
+        return bytes.fromhex(value) if isinstance(value, str) else bytes(value)
+
+    def _verify_signature(self) -> bool:
+        """
+        Run the RSA signature check and the output value hash check.
+
+        :return: 'True' if both checks pass. 'False' otherwise
+        """
+
+        return NistBeaconCrypto.verify_message(
+            self._certificate_id.hex(),
+            self.message,
+            self._signature_value,
+            self._output_value,
+        )
+
+    @property
+    def certificate_id(self) -> str:
+        """
+        :return: The hash of the signing certificate, as a hex string
+        """
+
+        return self._certificate_id.hex().upper()
+
+    @property
+    def chain_index(self) -> int:
+        """
+        :return: The chain the pulse belongs to
+        """
+
+        return self._chain_index
+
+    @property
+    def cipher_suite(self) -> int:
+        """
+        :return: The hash and signature algorithms in use
+        """
+
+        return self._cipher_suite
+
+    @property
+    def external_source_id(self) -> str:
+        """
+        :return: The hash of the external source, as a hex string
+        """
+
+        return self._external_source_id.hex().upper()
+
+    @property
+    def external_status_code(self) -> int:
+        """
+        :return: The status of the external value
+        """
+
+        return self._external_status_code
+
+    @property
+    def external_value(self) -> str:
+        """
+        :return: The external random value, as a hex string
+        """
+
+        return self._external_value.hex().upper()
+
+    @property
+    def json(self) -> str:
+        """
+        :return: The JSON representation of the pulse, as a string
+        """
+
+        if self._json is None:
+            self._json = json.dumps(
+                {
+                    self._KEY_PULSE: {
+                        self._KEY_URI: self.uri,
+                        self._KEY_VERSION: self.version,
+                        self._KEY_CIPHER_SUITE: self.cipher_suite,
+                        self._KEY_PERIOD: self.period,
+                        self._KEY_CERTIFICATE_ID: self.certificate_id,
+                        self._KEY_CHAIN_INDEX: self.chain_index,
+                        self._KEY_PULSE_INDEX: self.pulse_index,
+                        self._KEY_TIMESTAMP: self.time_stamp,
+                        self._KEY_LOCAL_RANDOM_VALUE:
+                            self.local_random_value,
+                        self._KEY_EXTERNAL: {
+                            self._KEY_SOURCE_ID: self.external_source_id,
+                            self._KEY_STATUS_CODE: self.external_status_code,
+                            self._KEY_VALUE: self.external_value,
+                        },
+                        self._KEY_LIST_VALUES: [
+                            {
+                                self._KEY_URI: value_uri,
+                                self._KEY_TYPE: value_type,
+                                self._KEY_VALUE: value,
+                            }
+                            for value_type, value_uri, value
+                            in self.list_values
+                        ],
+                        self._KEY_PRECOMMITMENT_VALUE:
+                            self.precommitment_value,
+                        self._KEY_STATUS_CODE: self.status_code,
+                        self._KEY_SIGNATURE_VALUE: self.signature_value,
+                        self._KEY_OUTPUT_VALUE: self.output_value,
+                    },
+                },
+            )
+
+        return self._json
+
+    @property
+    def list_values(self) -> Tuple[Tuple[str, str, str], ...]:
+        """
+        :return: The linked output values as (type, uri, hex value)
+        """
+
+        return tuple(
+            (value_type, value_uri, value.hex().upper())
+            for value_type, value_uri, value in self._list_values
+        )
+
+    @property
+    def local_random_value(self) -> str:
+        """
+        :return: The beacon's own 512 random bits, as a hex string
+        """
+
+        return self._local_random_value.hex().upper()
+
+    @property
+    def local_random_value_bytes(self) -> bytes:
+        """
+        :return: The beacon's own 512 random bits, as raw bytes
+        """
+
+        return self._local_random_value
+
+    @property
+    def message(self) -> bytes:
+        """
+        :return:
+            The signed message: every field up to the signature, in order,
+            with integers in big endian and byte strings (text as UTF-8)
+            prefixed by their 4 byte length. Built once, on first use.
+        """
+
+        if self._message is None:
+            uint32 = self._UINT32_STRUCT.pack
+
+            parts = [
+                uint32(len(self._uri.encode())),
+                self._uri.encode(),
+                uint32(len(self._version.encode())),
+                self._version.encode(),
+                self._UINT32_PAIR_STRUCT.pack(
+                    self._cipher_suite,
+                    self._period,
+                ),
+                uint32(len(self._certificate_id)),
+                self._certificate_id,
+                self._UINT64_PAIR_STRUCT.pack(
+                    self._chain_index,
+                    self._pulse_index,
+                ),
+                uint32(len(self._time_stamp.encode())),
+                self._time_stamp.encode(),
+                uint32(len(self._local_random_value)),
+                self._local_random_value,
+                uint32(len(self._external_source_id)),
+                self._external_source_id,
+                uint32(self._external_status_code),
+                uint32(len(self._external_value)),
+                self._external_value,
+            ]
+
+            for _, _, value in self._list_values:
+                parts.append(uint32(len(value)))
+                parts.append(value)
+
+            parts.append(uint32(len(self._precommitment_value)))
+            parts.append(self._precommitment_value)
+            parts.append(uint32(self._status_code))
+
+            self._message = b''.join(parts)
+
+        return self._message
+
+    @property
+    def message_digest(self) -> bytes:
+        """
+        :return: The SHA-512 digest of 'message', as 64 raw bytes.
+                 Computed once, on first use.
+        """
+
+        if self._message_digest is None:
+            self._message_digest = hashlib.sha512(self.message).digest()
+
+        return self._message_digest
+
+    @property
+    def output_value(self) -> str:
+        """
+        :return: The output value of the pulse, as a hex string
+        """
+
+        return self._output_value.hex().upper()
+
+    @property
+    def output_value_bytes(self) -> bytes:
+        """
+        :return: The output value of the pulse, as raw bytes
+        """
+
+        return self._output_value
+
+    @property
+    def period(self) -> int:
+        """
+        :return: The time interval, in milliseconds, between pulses
+        """
+
+        return self._period
+
+    @property
+    def precommitment_value(self) -> str:
+        """
+        :return: The hash of the next pulse's local random value, as hex
+        """
+
+        return self._precommitment_value.hex().upper()
+
+    @property
+    def previous_output_value(self) -> Optional[str]:
+        """
+        :return: The previous pulse's output value, as a hex string.
+                 'None' if the pulse does not link to it.
+        """
+
+        value = self.previous_output_value_bytes
+
+        return value.hex().upper() if value is not None else None
+
+    @property
+    def previous_output_value_bytes(self) -> Optional[bytes]:
+        """
+        :return: The previous pulse's output value, as raw bytes.
+                 'None' if the pulse does not link to it.
+        """
+
+        for value_type, _, value in self._list_values:
+            if value_type == self._LIST_VALUE_PREVIOUS:
+                return value
+
+        return None
+
+    @property
+    def pulse_index(self) -> int:
+        """
+        :return: The position of the pulse in its chain
+        """
+
+        return self._pulse_index
+
+    @property
+    def signature_value(self) -> str:
+        """
+        :return: The RSA signature of the pulse, as a hex string
+        """
+
+        return self._signature_value.hex().upper()
+
+    @property
+    def signature_value_bytes(self) -> bytes:
+        """
+        :return: The RSA signature of the pulse, as raw bytes
+        """
+
+        return self._signature_value
+
+    @property
+    def status_code(self) -> int:
+        """
+        :return: The status bit field of the pulse
+        """
+
+        return self._status_code
+
+    @property
+    def time_stamp(self) -> str:
+        """
+        :return: The time of the pulse, as published
+        """
+
+        return self._time_stamp
+
+    @property
+    def timestamp(self) -> Optional[int]:
+        """
+        :return: The time of the pulse, in seconds since January 1, 1970.
+                 'None' if the published time cannot be read.
+        """
+
+        if self._timestamp is None:
+            for time_format in self._TIME_STAMP_FORMATS:
+                try:
+                    moment = datetime.strptime(self._time_stamp, time_format)
+                except ValueError:
+                    continue
+
+                self._timestamp = int(
+                    moment.replace(tzinfo=timezone.utc).timestamp()
+                )
+                break
+
+        return self._timestamp
+
+    @property
+    def uri(self) -> str:
+        """
+        :return: The address of the pulse
+        """
+
+        return self._uri
+
+    @property
+    def valid_signature(self) -> bool:
+        """
+        Signature validity is checked on first access and the result is
+        kept, so later reads are free.
+
+        :return:
+            'True' if the RSA signature checks out against the registered
+            certificate, and the output value matches. 'False' otherwise.
+        """
+
+        if self._valid_signature is None:
+            self._valid_signature = self._verify_signature()
+
+        return self._valid_signature
+
+    @property
+    def version(self) -> str:
+        """
+        :return: Reported NIST randomness beacon version
+        """
+
+        return self._version
+
+    @classmethod
+    def from_dict(
+            cls,
+            data: dict,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconPulse']:
+        """
+        Convert decoded JSON, either a pulse or an object wrapping one
+        under 'pulse', into a 'NistBeaconPulse' object.
+
+        :param data: The decoded JSON
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconPulse' object, 'None' otherwise
+        """
+
+        try:
+            data = data.get(cls._KEY_PULSE, data)
+            external = data[cls._KEY_EXTERNAL]
+
+            return cls(
+                uri=data[cls._KEY_URI],
+                version=data[cls._KEY_VERSION],
+                cipher_suite=int(data[cls._KEY_CIPHER_SUITE]),
+                period=int(data[cls._KEY_PERIOD]),
+                certificate_id=data[cls._KEY_CERTIFICATE_ID],
+                chain_index=int(data[cls._KEY_CHAIN_INDEX]),
+                pulse_index=int(data[cls._KEY_PULSE_INDEX]),
+                time_stamp=data[cls._KEY_TIMESTAMP],
+                local_random_value=data[cls._KEY_LOCAL_RANDOM_VALUE],
+                external_source_id=external[cls._KEY_SOURCE_ID],
+                external_status_code=int(external[cls._KEY_STATUS_CODE]),
+                external_value=external[cls._KEY_VALUE],
+                list_values=[
+                    (
+                        list_value[cls._KEY_TYPE],
+                        list_value[cls._KEY_URI],
+                        list_value[cls._KEY_VALUE],
+                    )
+                    for list_value in data[cls._KEY_LIST_VALUES]
+                ],
+                precommitment_value=data[cls._KEY_PRECOMMITMENT_VALUE],
+                status_code=int(data[cls._KEY_STATUS_CODE]),
+                signature_value=data[cls._KEY_SIGNATURE_VALUE],
+                output_value=data[cls._KEY_OUTPUT_VALUE],
+                eager_verify=eager_verify,
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            # Missing keys, wrong shapes, and bad numbers or hex
+            return None
+
+    @classmethod
+    def from_json(
+            cls,
+            input_json: str,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconPulse']:
+        """
+        Convert a string of JSON which represents a version 2.0 pulse into
+        a 'NistBeaconPulse' object.
+
+        :param input_json: JSON to build a 'NistBeaconPulse' from
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconPulse' object, 'None' otherwise
+        """
+
+        try:
+            data = json.loads(input_json)
+        except ValueError:
+            return None
+
+        return cls.from_dict(data, eager_verify=eager_verify)
+
+    @classmethod
+    def from_xml(
+            cls,
+            input_xml: str,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconPulse']:
+        """
+        Convert a string of XML which represents a version 2.0 pulse into
+        a 'NistBeaconPulse' object.
+
+        :param input_xml: XML to build a 'NistBeaconPulse' from
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconPulse' object, 'None' otherwise
+        """
+
+        try:
+            element = ElementTree.fromstring(input_xml)
+        except ElementTree.ParseError:
+            return None
+
+        return cls.from_xml_element(element, eager_verify=eager_verify)
+
+    @classmethod
+    def from_xml_element(
+            cls,
+            element: ElementTree.Element,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconPulse']:
+        """
+        Convert an already parsed XML 'pulse' element into a
+        'NistBeaconPulse' object.
+
+        Elements are named like the JSON keys. List values may carry their
+        type and uri as attributes, with the value as text, or as child
+        elements.
+
+        :param element: The 'pulse' element to build a 'NistBeaconPulse' from
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconPulse' object, 'None' otherwise
+        """
+
+        def local_name(child: ElementTree.Element) -> str:
+            tag = child.tag
+            return tag[tag.rfind('}') + 1:]
+
+        def as_dict(parent: ElementTree.Element) -> dict:
+            values = dict(parent.attrib)
+
+            for child in parent:
+                values.setdefault(local_name(child), child.text)
+
+            if parent.text and parent.text.strip():
+                values.setdefault(cls._KEY_VALUE, parent.text.strip())
+
+            return values
+
+        # A single pass over the pulse's children, in whatever order they
+        # come, matching local names. The first of a repeated tag wins.
+        data = {}
+
+        for child in element:
+            key = local_name(child)
+
+            if key in data:
+                continue
+
+            if key == cls._KEY_EXTERNAL:
+                data[key] = as_dict(child)
+            elif key == cls._KEY_LIST_VALUES:
+                data[key] = [as_dict(list_value) for list_value in child]
+            else:
+                data[key] = child.text
+
+        return cls.from_dict(data, eager_verify=eager_verify)
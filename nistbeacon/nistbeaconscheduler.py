@@ -0,0 +1,338 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import random
+import time
+from queue import (
+    Empty,
+    Full,
+    Queue,
+)
+from threading import (
+    Event,
+    Lock,
+    Thread,
+)
+from typing import (
+    Callable,
+    Optional,
+)
+
+from nistbeacon.nistbeacon import NistBeacon
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconScheduler:
+    """
+    Poll for the newest record only when a new one is due, and hand each
+    new record to every subscriber in the process.
+
+    The newest record's timestamp plus its frequency (or period, for
+    version 2.0 pulses) tells when the next record should be published.
+    The scheduler sleeps until then, asks once, and retries with capped
+    exponential backoff and random jitter until the new record shows up.
+
+    One scheduler serves any number of consumers, through callbacks
+    ('subscribe'), queues ('subscribe_queue') and async iterators
+    ('records'), so a process makes one request per record however many
+    consumers it has.
+    """
+
+    # Seconds between records when a record does not say
+    _DEFAULT_INTERVAL = 60
+
+    def __init__(
+            self,
+            source=NistBeacon,
+            clock: Callable[[], float] = time.time,
+            sleep: Optional[Callable[[float], object]] = None,
+            initial_backoff: float = 0.5,
+            max_backoff: float = 10.0,
+            jitter: float = 0.1,
+            on_error: Optional[Callable[[Exception], object]] = None,
+    ):
+        """
+        :param source:
+            Where records come from: anything with 'get_last_record', such
+            as 'NistBeacon' (the default), a backend, or a 'BeaconChain'
+        :param clock: Current UNIX time, in seconds
+        :param sleep:
+            Sleep for the given seconds. Defaults to a sleep that 'stop'
+            cuts short.
+        :param initial_backoff: Seconds before the first retry
+        :param max_backoff: The longest wait between retries, in seconds
+        :param jitter:
+            Up to this fraction of each wait is added at random, so many
+            processes do not ask at the same instant
+        :param on_error:
+            Called with any exception raised by the source or by a
+            subscriber callback. Such exceptions are dropped otherwise:
+            polling backs off and carries on after a failed request, and
+            one failing subscriber never keeps the record from the others.
+        """
+
+        self._source = source
+        self._clock = clock
+        self._stopped = Event()
+        self._sleep = sleep if sleep is not None else self._stopped.wait
+        self._initial_backoff = initial_backoff
+        self._max_backoff = max_backoff
+        self._jitter = jitter
+        self._on_error = on_error
+
+        self._last_record = None
+        self._thread = None
+
+        # Subscribers are replaced as a whole, so publishing never holds
+        # the lock
+        self._lock = Lock()
+        self._callbacks = ()
+        self._queues = ()
+        self._async_queues = ()
+
+    @property
+    def last_record(self) -> Optional[NistBeaconValue]:
+        """
+        :return: The newest record delivered so far. 'None' otherwise.
+        """
+
+        return self._last_record
+
+    @property
+    def running(self) -> bool:
+        """
+        :return: 'True' while the background thread polls
+        """
+
+        return self._thread is not None and self._thread.is_alive()
+
+    @classmethod
+    def _interval(cls, record) -> float:
+        frequency = getattr(record, 'frequency', None)
+
+        if frequency:
+            return frequency
+
+        # Version 2.0 pulses give their period in milliseconds
+        period = getattr(record, 'period', None)
+
+        if period:
+            return period / 1000
+
+        return cls._DEFAULT_INTERVAL
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(
+            self._max_backoff,
+            self._initial_backoff * (2 ** attempt),
+        )
+
+        return delay + random.uniform(0, delay * self._jitter)
+
+    def _fetch_newer(self) -> Optional[NistBeaconValue]:
+        record = self._source.get_last_record()
+
+        if record is None:
+            return None
+
+        if self._last_record is not None:
+            if record.timestamp <= self._last_record.timestamp:
+                return None
+
+        return record
+
+    def _publish(self, record: NistBeaconValue):
+        self._last_record = record
+
+        for callback in self._callbacks:
+            # pylint: disable=broad-except
+            try:
+                callback(record)
+            except Exception as error:
+                self._report(error)
+
+        for record_queue in self._queues:
+            # A slow consumer misses old records, never the newest one
+            while True:
+                try:
+                    record_queue.put_nowait(record)
+                    break
+                except Full:
+                    try:
+                        record_queue.get_nowait()
+                    except Empty:
+                        pass
+
+        for loop, record_queue in self._async_queues:
+            try:
+                loop.call_soon_threadsafe(record_queue.put_nowait, record)
+            except RuntimeError:
+                # The loop is closed, its iterator will never read again
+                self._remove('_async_queues', (loop, record_queue))
+
+    def _remove(self, attribute: str, subscriber):
+        with self._lock:
+            setattr(
+                self,
+                attribute,
+                tuple(
+                    item for item in getattr(self, attribute)
+                    if item != subscriber
+                ),
+            )
+
+    def _report(self, error: Exception):
+        if self._on_error is not None:
+            self._on_error(error)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            self.wait_for_next()
+
+    def next_due(self) -> Optional[float]:
+        """
+        :return: The UNIX time the next record is expected at.
+                 'None' before the first record.
+        """
+
+        if self._last_record is None:
+            return None
+
+        return self._last_record.timestamp + self._interval(self._last_record)
+
+    async def records(self):
+        """
+        Iterate over new records as they are published, for use with
+        'async for' while the scheduler runs in the background.
+
+        :return: An async iterator of records, newest last
+        """
+
+        # pylint: disable=import-outside-toplevel
+        import asyncio
+
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+
+        with self._lock:
+            self._async_queues = self._async_queues + (subscriber,)
+
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            self._remove('_async_queues', subscriber)
+
+    def start(self):
+        """
+        Poll on a background daemon thread until 'stop' is called.
+        """
+
+        if self.running:
+            return
+
+        self._stopped.clear()
+        self._thread = Thread(
+            target=self._run,
+            name='NistBeaconScheduler',
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stop the background thread, waking it if it sleeps.
+
+        :param timeout: The longest wait for the thread, in seconds
+        """
+
+        self._stopped.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def subscribe(self, callback: Callable[[NistBeaconValue], object]):
+        """
+        :param callback:
+            Called with each new record, on the polling thread. It should
+            return quickly, or hand the record off.
+        """
+
+        with self._lock:
+            self._callbacks = self._callbacks + (callback,)
+
+    def subscribe_queue(self, maxsize: int = 0) -> Queue:
+        """
+        :param maxsize:
+            The most records kept for the consumer. When full, the oldest
+            record makes room for the newest. '0' keeps them all.
+        :return: A queue receiving each new record
+        """
+
+        record_queue = Queue(maxsize)
+
+        with self._lock:
+            self._queues = self._queues + (record_queue,)
+
+        return record_queue
+
+    def unsubscribe(self, subscriber):
+        """
+        :param subscriber: A callback or queue given by 'subscribe' or
+                           'subscribe_queue'
+        """
+
+        self._remove('_callbacks', subscriber)
+        self._remove('_queues', subscriber)
+
+    def wait_for_next(self) -> Optional[NistBeaconValue]:
+        """
+        Sleep until the next record is due, then ask until it appears, and
+        deliver it to all subscribers.
+
+        The first call asks right away, and delivers the newest record.
+
+        :return: The new record. 'None' if 'stop' was called first.
+        """
+
+        due = self.next_due()
+
+        if due is not None:
+            delay = due - self._clock()
+
+            if delay > 0:
+                self._sleep(delay)
+
+        attempt = 0
+
+        while not self._stopped.is_set():
+            # Network, parse or store trouble must not end the polling
+            # thread, it is retried like a record that is not out yet
+            # pylint: disable=broad-except
+            try:
+                record = self._fetch_newer()
+            except Exception as error:
+                self._report(error)
+                record = None
+
+            if record is not None:
+                self._publish(record)
+                return record
+
+            self._sleep(self._backoff(attempt))
+            attempt += 1
+
+        return None
@@ -0,0 +1,322 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sqlite3
+from threading import Lock
+from typing import (
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+)
+
+from nistbeacon.nistbeaconvalue import NistBeaconValue
+
+
+class NistBeaconStore:
+    """
+    A persistent, local store of beacon records backed by SQLite.
+
+    Records are keyed by timestamp. The output and previous output values
+    are indexed as well, so the neighbours of a stored record can be found
+    by following the hash chain rather than by trusting the timestamps.
+
+    The store can also keep signature verification results, see
+    'NistBeaconCrypto.set_verify_store'.
+    """
+
+    _COLUMNS = (
+        'timestamp, version, frequency, seed_value, previous_output_value, '
+        'signature_value, output_value, status_code'
+    )
+
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS records ('
+        'timestamp INTEGER PRIMARY KEY, '
+        'version TEXT NOT NULL, '
+        'frequency INTEGER NOT NULL, '
+        'seed_value TEXT NOT NULL, '
+        'previous_output_value TEXT NOT NULL, '
+        'signature_value TEXT NOT NULL, '
+        'output_value TEXT NOT NULL, '
+        'status_code TEXT NOT NULL'
+        ')',
+        'CREATE INDEX IF NOT EXISTS records_output_value '
+        'ON records (output_value)',
+        'CREATE INDEX IF NOT EXISTS records_previous_output_value '
+        'ON records (previous_output_value)',
+        'CREATE TABLE IF NOT EXISTS verifications ('
+        'epoch TEXT NOT NULL, '
+        'digest BLOB NOT NULL, '
+        'signature BLOB NOT NULL, '
+        'result INTEGER NOT NULL, '
+        'PRIMARY KEY (epoch, digest, signature)'
+        ')',
+    )
+
+    def __init__(self, path: str = ':memory:'):
+        """
+        :param path:
+            The SQLite database file to use. It is created if missing.
+            The default keeps the store in memory.
+        """
+
+        self._path = path
+        self._lock = Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            for statement in self._SCHEMA:
+                self._connection.execute(statement)
+
+    def __contains__(self, timestamp: int) -> bool:
+        return self._fetch_one(
+            'SELECT 1 FROM records WHERE timestamp = ?',
+            (timestamp,),
+        ) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._fetch_one('SELECT COUNT(*) FROM records', ())[0]
+
+    @property
+    def path(self) -> str:
+        """
+        :return: The SQLite database file in use
+        """
+
+        return self._path
+
+    @staticmethod
+    def _to_row(record: NistBeaconValue) -> tuple:
+        return (
+            record.timestamp,
+            record.version,
+            record.frequency,
+            record.seed_value,
+            record.previous_output_value,
+            record.signature_value,
+            record.output_value,
+            record.status_code,
+        )
+
+    @staticmethod
+    def _to_record(row: Optional[tuple]) -> Optional[NistBeaconValue]:
+        if row is None:
+            return None
+
+        return NistBeaconValue(
+            version=row[1],
+            frequency=row[2],
+            timestamp=row[0],
+            seed_value=row[3],
+            previous_output_value=row[4],
+            signature_value=row[5],
+            output_value=row[6],
+            status_code=row[7],
+        )
+
+    def _fetch_one(self, query: str, parameters: tuple) -> Optional[tuple]:
+        with self._lock:
+            return self._connection.execute(query, parameters).fetchone()
+
+    def close(self):
+        """
+        Close the underlying database connection.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def get_last_record(self) -> Optional[NistBeaconValue]:
+        """
+        :return: The newest stored record. 'None' if the store is empty.
+        """
+
+        return self._to_record(self._fetch_one(
+            f'SELECT {self._COLUMNS} FROM records '
+            'ORDER BY timestamp DESC LIMIT 1',
+            (),
+        ))
+
+    def get_next(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The exact timestamp of a stored record
+        :return:
+            The stored record that chains directly after it.
+            'None' if either record is not stored.
+        """
+
+        return self._to_record(self._fetch_one(
+            f'SELECT {self._COLUMNS} FROM records WHERE '
+            'previous_output_value = ('
+            'SELECT output_value FROM records WHERE timestamp = ?'
+            ') AND timestamp > ? ORDER BY timestamp LIMIT 1',
+            (timestamp, timestamp),
+        ))
+
+    def get_previous(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The exact timestamp of a stored record
+        :return:
+            The stored record that chains directly before it.
+            'None' if either record is not stored.
+        """
+
+        return self._to_record(self._fetch_one(
+            f'SELECT {self._COLUMNS} FROM records WHERE '
+            'output_value = ('
+            'SELECT previous_output_value FROM records WHERE timestamp = ?'
+            ') AND timestamp < ? ORDER BY timestamp DESC LIMIT 1',
+            (timestamp, timestamp),
+        ))
+
+    def get_range(
+            self,
+            start_timestamp: int,
+            end_timestamp: int,
+            batch_size: int = 1000,
+    ) -> Iterator[NistBeaconValue]:
+        """
+        Scan the stored records between two timestamps, in order. Rows are
+        read 'batch_size' at a time, so long ranges stream from disk.
+
+        :param start_timestamp: UNIX time / POSIX time / Epoch time
+        :param end_timestamp: UNIX time / POSIX time / Epoch time, inclusive
+        :param batch_size: The number of rows to read per query
+        :return: An iterator of the stored beacon values
+        """
+
+        while True:
+            with self._lock:
+                rows = self._connection.execute(
+                    f'SELECT {self._COLUMNS} FROM records '
+                    'WHERE timestamp BETWEEN ? AND ? '
+                    'ORDER BY timestamp LIMIT ?',
+                    (start_timestamp, end_timestamp, batch_size),
+                ).fetchall()
+
+            for row in rows:
+                yield self._to_record(row)
+
+            if len(rows) < batch_size:
+                return
+
+            start_timestamp = rows[-1][0] + 1
+
+    def get_record(self, timestamp: int) -> Optional[NistBeaconValue]:
+        """
+        :param timestamp: The exact timestamp of a record
+        :return: The stored record if present. 'None' otherwise.
+        """
+
+        return self._to_record(self._fetch_one(
+            f'SELECT {self._COLUMNS} FROM records WHERE timestamp = ?',
+            (timestamp,),
+        ))
+
+    def get_verification(
+            self,
+            epoch: str,
+            digest: bytes,
+            signature: bytes,
+    ) -> Optional[bool]:
+        """
+        :param epoch: The epoch of the key that signed the message
+        :param digest: The SHA-512 digest of the signed message
+        :param signature: The signature value, as published
+        :return: The stored verification result. 'None' otherwise.
+        """
+
+        row = self._fetch_one(
+            'SELECT result FROM verifications '
+            'WHERE epoch = ? AND digest = ? AND signature = ?',
+            (epoch, digest, signature),
+        )
+
+        if row is None:
+            return None
+
+        return bool(row[0])
+
+    def put(self, record: NistBeaconValue):
+        """
+        Store a single record. Records already stored are left untouched.
+
+        :param record: The record to store
+        """
+
+        self.put_many((record,))
+
+    def put_many(self, records: Iterable[NistBeaconValue]):
+        """
+        Store many records in a single transaction. Records already stored
+        are left untouched.
+
+        :param records: The records to store
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                f'INSERT OR IGNORE INTO records ({self._COLUMNS}) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (self._to_row(record) for record in records),
+            )
+
+    def put_verification(
+            self,
+            epoch: str,
+            digest: bytes,
+            signature: bytes,
+            result: bool,
+    ):
+        """
+        Store a signature verification result.
+
+        :param epoch: The epoch of the key that signed the message
+        :param digest: The SHA-512 digest of the signed message
+        :param signature: The signature value, as published
+        :param result: The outcome of the RSA check
+        """
+
+        self.put_verifications(((epoch, digest, signature, result),))
+
+    def put_verifications(
+            self,
+            verifications: Iterable[Tuple[str, bytes, bytes, bool]],
+    ):
+        """
+        Store many signature verification results in a single transaction.
+
+        :param verifications:
+            (epoch, digest, signature, result) tuples, as taken by
+            'put_verification'
+        """
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO verifications '
+                '(epoch, digest, signature, result) VALUES (?, ?, ?, ?)',
+                (
+                    (epoch, digest, signature, int(result))
+                    for epoch, digest, signature, result in verifications
+                ),
+            )
@@ -15,22 +15,53 @@ limitations under the License.
 """
 
 import binascii
-import hashlib
 import json
+import struct
 from random import Random
-from typing import Optional
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
 from xml.etree import ElementTree
 
 from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
 
+if TYPE_CHECKING:  # pragma: no cover
+    from Crypto.Hash.SHA512 import SHA512Hash
+
 
 class NistBeaconValue:
+    # Each field is exposed as a property, hex and raw bytes alike
+    # pylint: disable=too-many-public-methods
     """
     A single NIST Beacon Value object represents one beacon value.
     It has all the normal properties of a NIST beacon API call,
     but stored as a python object
+
+    To keep the per-value footprint small, the object uses `__slots__`
+    and keeps the seed, previous output, signature and output values as
+    raw bytes. Their upper case hex strings are produced on demand.
     """
 
+    __slots__ = (
+        '_frequency',
+        '_json',
+        '_message_digest',
+        '_output_value',
+        '_previous_output_value',
+        '_pseudo_random',
+        '_seed_value',
+        '_signature_value',
+        '_status_code',
+        '_timestamp',
+        '_valid_signature',
+        '_version',
+        '_xml',
+    )
+
     _xml_template = (
         '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
         '<record xmlns="http://beacon.nist.gov/record/0.1/">'
@@ -45,6 +76,16 @@ class NistBeaconValue:
         '</record>'
     )
 
+    # Fixed binary layout, see 'to_bytes': version tag, frequency,
+    # timestamp, seed, previous output, signature (zero padded), output,
+    # status code and the real signature length
+    _BINARY_STRUCT = struct.Struct('>BIQ64s64s256s64sbH')
+    _BINARY_VERSIONS = (
+        'Version 1.0',
+    )
+
+    BINARY_SIZE = _BINARY_STRUCT.size
+
     _KEY_FREQUENCY = 'frequency'
     _KEY_OUTPUT_VALUE = 'outputValue'
     _KEY_PREVIOUS_OUTPUT_VALUE = 'previousOutputValue'
@@ -59,11 +100,12 @@ class NistBeaconValue:
             version: str,
             frequency: int,
             timestamp: int,
-            seed_value: str,
-            previous_output_value: str,
-            signature_value: str,
-            output_value: str,
+            seed_value: Union[str, bytes],
+            previous_output_value: Union[str, bytes],
+            signature_value: Union[str, bytes],
+            output_value: Union[str, bytes],
             status_code: str,
+            eager_verify: bool = False,
     ):
         """
         :param version:
@@ -102,72 +144,38 @@ class NistBeaconValue:
                     will be all zeroes
                 2 - Time between values is greater than the frequency, but
                     the chain is still intact
+
+        The seed, previous output, signature and output values are accepted
+        as hex strings or as the raw bytes they represent.
+
+        :param eager_verify:
+            'True' checks the signature right away. 'False' (the default)
+            defers the check until 'valid_signature' is first read.
         """
 
         self._version = version
         self._frequency = frequency
         self._timestamp = timestamp
-        self._seed_value = seed_value
-        self._previous_output_value = previous_output_value
-        self._signature_value = signature_value
-        self._output_value = output_value
+        self._seed_value = self._to_bytes(seed_value)
+        self._previous_output_value = self._to_bytes(previous_output_value)
+        self._signature_value = self._to_bytes(signature_value)
+        self._output_value = self._to_bytes(output_value)
         self._status_code = status_code
 
-        # Compute JSON, XML strings
-        self._json = json.dumps(
-            {
-                self._KEY_VERSION: self.version,
-                self._KEY_FREQUENCY: self.frequency,
-                self._KEY_TIMESTAMP: self.timestamp,
-                self._KEY_SEED_VALUE: self.seed_value,
-                self._KEY_PREVIOUS_OUTPUT_VALUE: self.previous_output_value,
-                self._KEY_SIGNATURE_VALUE: self.signature_value,
-                self._KEY_OUTPUT_VALUE: self.output_value,
-                self._KEY_STATUS_CODE: self.status_code,
-            },
-            sort_keys=True,
-        )
-
-        self._xml = self._xml_template.format(
-            self.version,
-            self.frequency,
-            self.timestamp,
-            self.seed_value,
-            self.previous_output_value,
-            self.signature_value,
-            self.output_value,
-            self.status_code,
-        )
-
-        # Signature checking
-        sha512_hash = NistBeaconCrypto.get_hash(
-            self.version,
-            self.frequency,
-            self.timestamp,
-            self.seed_value,
-            self.previous_output_value,
-            self.status_code,
-        )
-
-        sig_check_result = NistBeaconCrypto.verify(
-            timestamp=self.timestamp,
-            message_hash=sha512_hash,
-            signature=binascii.a2b_hex(self.signature_value)[::-1],
-        )
+        # JSON and XML strings are built on first use, see 'json' and 'xml'
+        self._json = None
+        self._xml = None
 
-        # The signature sha512'd again should equal the output value
-        expected_signature = hashlib.sha512(
-            binascii.a2b_hex(self.signature_value)
-        ).hexdigest().upper()
+        # Signature checking is deferred, see 'valid_signature'
+        self._message_digest = None
+        self._valid_signature = None
 
-        sig_hash_check = expected_signature == self.output_value
+        if eager_verify:
+            self._valid_signature = self._verify_signature()
 
-        # Store the valid signature state after computation
-        self._valid_signature = sig_check_result and sig_hash_check
-
-        # Using the output value from the beacon, let's seed a personal
-        # python random.Random object
-        self._pseudo_random = Random(self.output_value)
+        # The personal python random.Random object is seeded on first use,
+        # see 'pseudo_random'
+        self._pseudo_random = None
 
     def __eq__(self, other):
         try:
@@ -187,6 +195,51 @@ class NistBeaconValue:
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    @staticmethod
+    def _to_bytes(value: Union[str, bytes]) -> bytes:
+        if isinstance(value, str):
+            return binascii.a2b_hex(value)
+
+        return bytes(value)
+
+    def _message_hash(self) -> 'SHA512Hash':
+        """
+        Hash the signed message, keeping its digest for 'message_digest'.
+
+        :return: The SHA512Hash object the signature was computed over
+        """
+
+        sha512_hash = NistBeaconCrypto.get_hash(
+            self.version,
+            self.frequency,
+            self.timestamp,
+            self._seed_value,
+            self._previous_output_value,
+            self.status_code,
+        )
+        self._message_digest = sha512_hash.digest()
+
+        return sha512_hash
+
+    def _verify_signature(self) -> bool:
+        """
+        Run the RSA signature check and the output value hash check.
+
+        :return: 'True' if both checks pass. 'False' otherwise
+        """
+
+        return NistBeaconCrypto.verify_record(
+            self.version,
+            self.frequency,
+            self.timestamp,
+            self._seed_value,
+            self._previous_output_value,
+            self._signature_value,
+            self._output_value,
+            self.status_code,
+            message_hash=self._message_hash(),
+        )
+
     @property
     def frequency(self) -> int:
         """
@@ -201,16 +254,94 @@ class NistBeaconValue:
         :return: The JSON representation of the beacon, as a string
         """
 
+        if self._json is None:
+            self._json = json.dumps(
+                {
+                    self._KEY_VERSION: self.version,
+                    self._KEY_FREQUENCY: self.frequency,
+                    self._KEY_TIMESTAMP: self.timestamp,
+                    self._KEY_SEED_VALUE: self.seed_value,
+                    self._KEY_PREVIOUS_OUTPUT_VALUE:
+                        self.previous_output_value,
+                    self._KEY_SIGNATURE_VALUE: self.signature_value,
+                    self._KEY_OUTPUT_VALUE: self.output_value,
+                    self._KEY_STATUS_CODE: self.status_code,
+                },
+                sort_keys=True,
+            )
+
         return self._json
 
+    @property
+    def message_digest(self) -> bytes:
+        """
+        :return:
+            The SHA-512 digest of the signed message (version, frequency,
+            timestamp, seed_value, previous_output_value, status_code),
+            as 64 raw bytes. It is kept once computed, and verifying the
+            signature computes it as a side effect.
+        """
+
+        if self._message_digest is None:
+            self._message_hash()
+
+        return self._message_digest
+
+    def new_pseudo_random(self) -> Random:
+        """
+        :return:
+            A fresh python `random.Random` object seeded with the value's
+            `output_value`. Every call returns a new generator, starting
+            from the same state `pseudo_random` started from.
+        """
+
+        return Random(self.output_value)
+
     @property
     def output_value(self) -> str:
         """
         :return: The SHA-512 hash of the signatureValue as a 64 byte hex string
         """
 
+        return self._output_value.hex().upper()
+
+    @property
+    def output_value_bytes(self) -> bytes:
+        """
+        :return: The SHA-512 hash of the signatureValue as 64 raw bytes
+        """
+
         return self._output_value
 
+    def pack_into(self, buffer: bytearray, offset: int):
+        """
+        Pack the value into a writable buffer, in the layout of 'to_bytes'.
+
+        :param buffer: A buffer with 'BINARY_SIZE' bytes free at 'offset'
+        :param offset: Where the value starts in the buffer
+        """
+
+        try:
+            version_tag = self._BINARY_VERSIONS.index(self.version) + 1
+        except ValueError:
+            raise ValueError(
+                f'No binary version tag for {self.version!r}'
+            ) from None
+
+        self._BINARY_STRUCT.pack_into(
+            buffer,
+            offset,
+            version_tag,
+            self.frequency,
+            self.timestamp,
+            self._seed_value,
+            self._previous_output_value,
+            self._signature_value,
+            self._output_value,
+            int(self.status_code),
+            len(self._signature_value),
+        )
+
     @property
     def previous_output_value(self) -> str:
         """
@@ -219,6 +350,15 @@ class NistBeaconValue:
             string
         """
 
+        return self._previous_output_value.hex().upper()
+
+    @property
+    def previous_output_value_bytes(self) -> bytes:
+        """
+        :return:
+            The SHA-512 hash value for the previous record - 64 raw bytes
+        """
+
         return self._previous_output_value
 
     @property
@@ -228,8 +368,16 @@ class NistBeaconValue:
             A python `random.Random` object that has been seeded with
             the value's `output_value`. This is a pseudo-random
             number generator
+
+            It is created on first access, and the same generator is
+            returned on every access after that; its state is shared and
+            is NOT reset. Use `new_pseudo_random` for an independent
+            generator starting from the seed.
         """
 
+        if self._pseudo_random is None:
+            self._pseudo_random = self.new_pseudo_random()
+
         return self._pseudo_random
 
     @property
@@ -240,6 +388,14 @@ class NistBeaconValue:
             value
         """
 
+        return self._seed_value.hex().upper()
+
+    @property
+    def seed_value_bytes(self) -> bytes:
+        """
+        :return: A seed value as 64 raw bytes (512-bit)
+        """
+
         return self._seed_value
 
     @property
@@ -254,6 +410,16 @@ class NistBeaconValue:
             values
         """
 
+        return self._signature_value.hex().upper()
+
+    @property
+    def signature_value_bytes(self) -> bytes:
+        """
+        :return:
+            The digital signature (RSA) of the record as 256 raw bytes,
+            in the byte order NIST reports it
+        """
+
         return self._signature_value
 
     @property
@@ -280,6 +446,19 @@ class NistBeaconValue:
 
         return self._timestamp
 
+    def to_bytes(self) -> bytes:
+        """
+        Pack the value into the fixed binary layout of 'BINARY_SIZE' bytes
+        (464), well under half the size of the JSON form.
+
+        :return: The binary representation of the beacon
+        """
+
+        buffer = bytearray(self.BINARY_SIZE)
+        self.pack_into(buffer, 0)
+
+        return bytes(buffer)
+
     @property
     def valid_signature(self) -> bool:
         """
@@ -297,9 +476,15 @@ class NistBeaconValue:
         As long as the result of the 'First' step and'ed with the 'Second'
         step, the record is considered valid.
 
+        Unless the value was built with 'eager_verify', the checks run on
+        first access and the result is kept for later reads.
+
         :return: 'True' if this record is valid. 'False' otherwise
         """
 
+        if self._valid_signature is None:
+            self._valid_signature = self._verify_signature()
+
         return self._valid_signature
 
     @property
@@ -316,21 +501,109 @@ class NistBeaconValue:
         :return: The XML representation of the beacon, as a string
         """
 
+        if self._xml is None:
+            self._xml = self._xml_template.format(
+                self.version,
+                self.frequency,
+                self.timestamp,
+                self.seed_value,
+                self.previous_output_value,
+                self.signature_value,
+                self.output_value,
+                self.status_code,
+            )
+
         return self._xml
 
     @classmethod
-    def from_json(cls, input_json: str) -> 'NistBeaconValue':
+    def _from_fields(cls, fields: tuple) -> Optional['NistBeaconValue']:
+        (
+            version_tag,
+            frequency,
+            timestamp,
+            seed_value,
+            previous_output_value,
+            signature_value,
+            output_value,
+            status_code,
+            signature_length,
+        ) = fields
+
+        if not 0 < version_tag <= len(cls._BINARY_VERSIONS):
+            return None
+
+        return cls(
+            version=cls._BINARY_VERSIONS[version_tag - 1],
+            frequency=frequency,
+            timestamp=timestamp,
+            seed_value=seed_value,
+            previous_output_value=previous_output_value,
+            signature_value=signature_value[:signature_length],
+            output_value=output_value,
+            status_code=str(status_code),
+        )
+
+    @classmethod
+    def _from_values(
+            cls,
+            values: dict,
+            eager_verify: bool,
+    ) -> Optional['NistBeaconValue']:
+        """
+        :param values: Every required value, keyed as in JSON
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconValue' object, 'None' if a value is malformed
         """
-        Convert a string of JSON which represents a NIST randomness beacon
-        value into a 'NistBeaconValue' object.
 
-        :param input_json: JSON to build a 'Nist RandomnessBeaconValue' from
+        try:
+            return cls(
+                version=values[cls._KEY_VERSION],
+                frequency=int(values[cls._KEY_FREQUENCY]),
+                timestamp=int(values[cls._KEY_TIMESTAMP]),
+                seed_value=values[cls._KEY_SEED_VALUE],
+                previous_output_value=values[cls._KEY_PREVIOUS_OUTPUT_VALUE],
+                signature_value=values[cls._KEY_SIGNATURE_VALUE],
+                output_value=values[cls._KEY_OUTPUT_VALUE],
+                status_code=values[cls._KEY_STATUS_CODE],
+                eager_verify=eager_verify,
+            )
+        except (TypeError, ValueError):
+            # Bad numbers or hex
+            return None
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Optional['NistBeaconValue']:
+        """
+        Convert the binary layout produced by 'to_bytes' into a
+        'NistBeaconValue' object.
+
+        :param data: Exactly 'BINARY_SIZE' bytes, or a memoryview of them
         :return: A 'NistBeaconValue' object, 'None' otherwise
         """
 
         try:
-            data_dict = json.loads(input_json)
-        except ValueError:
+            fields = cls._BINARY_STRUCT.unpack(data)
+        except struct.error:
+            return None
+
+        return cls._from_fields(fields)
+
+    @classmethod
+    def from_dict(
+            cls,
+            data_dict: dict,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconValue']:
+        """
+        Convert decoded JSON which represents a NIST randomness beacon
+        value into a 'NistBeaconValue' object.
+
+        :param data_dict: The decoded JSON
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconValue' object, 'None' otherwise
+        """
+
+        if not isinstance(data_dict, dict):
             return None
 
         # Our required values are "must haves". This makes it simple
@@ -354,35 +627,69 @@ class NistBeaconValue:
         if None in required_values.values():
             return None
 
-        # We have all the required values, return a node object
-        return cls(
-            version=required_values[cls._KEY_VERSION],
-            frequency=int(required_values[cls._KEY_FREQUENCY]),
-            timestamp=int(required_values[cls._KEY_TIMESTAMP]),
-            seed_value=required_values[cls._KEY_SEED_VALUE],
-            previous_output_value=required_values[
-                cls._KEY_PREVIOUS_OUTPUT_VALUE
-            ],
-            signature_value=required_values[cls._KEY_SIGNATURE_VALUE],
-            output_value=required_values[cls._KEY_OUTPUT_VALUE],
-            status_code=required_values[cls._KEY_STATUS_CODE],
-        )
+        return cls._from_values(required_values, eager_verify)
 
     @classmethod
-    def from_xml(cls, input_xml: str) -> Optional['NistBeaconValue']:
+    def from_json(
+            cls,
+            input_json: str,
+            eager_verify: bool = False,
+    ) -> 'NistBeaconValue':
+        """
+        Convert a string of JSON which represents a NIST randomness beacon
+        value into a 'NistBeaconValue' object.
+
+        :param input_json: JSON to build a 'Nist RandomnessBeaconValue' from
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconValue' object, 'None' otherwise
+        """
+
+        try:
+            data_dict = json.loads(input_json)
+        except ValueError:
+            return None
+
+        return cls.from_dict(data_dict, eager_verify=eager_verify)
+
+    @classmethod
+    def from_xml(
+            cls,
+            input_xml: str,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconValue']:
         """
         Convert a string of XML which represents a NIST Randomness Beacon value
         into a 'NistBeaconValue' object.
 
         :param input_xml: XML to build a 'NistBeaconValue' from
+        :param eager_verify: 'True' checks the signature right away
         :return: A 'NistBeaconValue' object, 'None' otherwise
         """
 
-        invalid_result = None
+        # First attempt to load the xml, return 'None' on ParseError
+        try:
+            root = ElementTree.fromstring(input_xml)
+        except ElementTree.ParseError:
+            return None
 
-        understood_namespaces = {
-            'nist-0.1': 'http://beacon.nist.gov/record/0.1/',
-        }
+        return cls.from_xml_element(root, eager_verify=eager_verify)
+
+    @classmethod
+    def from_xml_element(
+            cls,
+            element: ElementTree.Element,
+            eager_verify: bool = False,
+    ) -> Optional['NistBeaconValue']:
+        """
+        Convert an already parsed XML 'record' element into a
+        'NistBeaconValue' object.
+
+        :param element: The 'record' element to build a 'NistBeaconValue' from
+        :param eager_verify: 'True' checks the signature right away
+        :return: A 'NistBeaconValue' object, 'None' otherwise
+        """
+
+        invalid_result = None
 
         # Our required values are "must haves". This makes it simple
         # to verify we loaded everything out of XML correctly.
@@ -397,40 +704,63 @@ class NistBeaconValue:
             cls._KEY_VERSION: None,
         }
 
-        # First attempt to load the xml, return 'None' on ParseError
-        try:
-            tree = ElementTree.ElementTree(ElementTree.fromstring(input_xml))
-        except ElementTree.ParseError:
-            return invalid_result
-
-        # Using the required values, let's load the xml values in
-        for key in required_values:
-            discovered_element = tree.find(
-                f'nist-0.1:{key}',
-                namespaces=understood_namespaces,
-            )
-
-            if not isinstance(discovered_element, ElementTree.Element):
-                continue
+        # A single pass over the record's children, in whatever order they
+        # come. Namespaced tags look like '{namespace}key', so only the
+        # local name after the namespace is matched. Unknown tags are
+        # skipped, and the first of a repeated tag wins.
+        for child in element:
+            tag = child.tag
+            key = tag[tag.rfind('}') + 1:]
 
-            # Bad pylint message - https://github.com/PyCQA/pylint/issues/476
-            # pylint: disable=no-member
-            required_values[key] = discovered_element.text
+            if required_values.get(key, '') is None:
+                required_values[key] = child.text
 
         # Confirm that the required values are set, and not 'None'
         if None in required_values.values():
             return invalid_result
 
-        # We have all the required values, return a node object
-        return cls(
-            version=required_values[cls._KEY_VERSION],
-            frequency=int(required_values[cls._KEY_FREQUENCY]),
-            timestamp=int(required_values[cls._KEY_TIMESTAMP]),
-            seed_value=required_values[cls._KEY_SEED_VALUE],
-            previous_output_value=required_values[
-                cls._KEY_PREVIOUS_OUTPUT_VALUE
-            ],
-            signature_value=required_values[cls._KEY_SIGNATURE_VALUE],
-            output_value=required_values[cls._KEY_OUTPUT_VALUE],
-            status_code=required_values[cls._KEY_STATUS_CODE],
+        return cls._from_values(required_values, eager_verify)
+
+    @classmethod
+    def pack_many(cls, records: Iterable['NistBeaconValue']) -> bytearray:
+        """
+        Pack records back to back in the layout of 'to_bytes'.
+
+        :param records: The records to pack
+        :return: 'BINARY_SIZE' bytes per record, in order
+        """
+
+        records = list(records)
+        buffer = bytearray(cls.BINARY_SIZE * len(records))
+
+        for index, record in enumerate(records):
+            record.pack_into(buffer, index * cls.BINARY_SIZE)
+
+        return buffer
+
+    @classmethod
+    def unpack_many(cls, data: bytes) -> Iterator['NistBeaconValue']:
+        """
+        Read records packed by 'pack_many'. The buffer is read in place,
+        only each record's own fields are copied out of it.
+
+        :param data:
+            A bytes-like object (bytes, bytearray, mmap, memoryview)
+            holding a whole number of records
+        :return: The records, in order. Records with an unknown version
+                 tag are skipped.
+        """
+
+        view = memoryview(data).cast('B')
+
+        if view.nbytes % cls.BINARY_SIZE:
+            raise ValueError(
+                f'Binary records take {cls.BINARY_SIZE} bytes each'
+            )
+
+        records = (
+            cls._from_fields(fields)
+            for fields in cls._BINARY_STRUCT.iter_unpack(view)
         )
+
+        return (record for record in records if record is not None)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import sys
+import timeit
+from argparse import ArgumentParser
+from os.path import (
+    dirname,
+    join,
+)
+from xml.etree import ElementTree
+
+sys.path.insert(0, join(dirname(__file__), '..'))
+
+from nistbeacon import NistBeaconValue  # noqa: E402
+from tests.test_data.nist_records import local_record_xml_db  # noqa: E402
+
+
+def find_based_from_xml(input_xml: str):
+    """
+    The previous 'NistBeaconValue.from_xml': a full ElementTree followed by
+    one namespaced 'find' per required key.
+    """
+
+    understood_namespaces = {
+        'nist-0.1': 'http://beacon.nist.gov/record/0.1/',
+    }
+
+    required_values = {
+        'frequency': None,
+        'outputValue': None,
+        'previousOutputValue': None,
+        'seedValue': None,
+        'signatureValue': None,
+        'statusCode': None,
+        'timeStamp': None,
+        'version': None,
+    }
+
+    try:
+        tree = ElementTree.ElementTree(ElementTree.fromstring(input_xml))
+    except ElementTree.ParseError:
+        return None
+
+    for key in required_values:
+        discovered_element = tree.find(
+            f'nist-0.1:{key}',
+            namespaces=understood_namespaces,
+        )
+
+        if not isinstance(discovered_element, ElementTree.Element):
+            continue
+
+        required_values[key] = discovered_element.text
+
+    if None in required_values.values():
+        return None
+
+    return NistBeaconValue(
+        version=required_values['version'],
+        frequency=int(required_values['frequency']),
+        timestamp=int(required_values['timeStamp']),
+        seed_value=required_values['seedValue'],
+        previous_output_value=required_values['previousOutputValue'],
+        signature_value=required_values['signatureValue'],
+        output_value=required_values['outputValue'],
+        status_code=required_values['statusCode'],
+    )
+
+
+def main():
+    parser = ArgumentParser(
+        description='Compare from_xml against the find based parser',
+    )
+    parser.add_argument(
+        '--number',
+        default=2000,
+        help='Passes over the fixture records per repeat',
+        type=int,
+    )
+    parser.add_argument(
+        '--repeat',
+        default=5,
+        help='Number of repeats, the best one is reported',
+        type=int,
+    )
+    args = parser.parse_args()
+
+    records = [xml for xml in local_record_xml_db.values() if xml]
+
+    for xml in records:
+        if find_based_from_xml(xml) != NistBeaconValue.from_xml(xml):
+            print(f'Parsers disagree on:\n{xml}')
+            return 1
+
+    parsers = (
+        ('find based', find_based_from_xml),
+        ('single pass', NistBeaconValue.from_xml),
+    )
+    results = {}
+
+    for name, parser_function in parsers:
+        best = min(
+            timeit.repeat(
+                lambda func=parser_function: [func(xml) for xml in records],
+                number=args.number,
+                repeat=args.repeat,
+            )
+        )
+        results[name] = best / (args.number * len(records)) * 1e6
+
+        print(f'{name:>12}: {results[name]:8.2f} us per record')
+
+    print(
+        f'{"speedup":>12}: '
+        f'{results["find based"] / results["single pass"]:8.2f}x'
+    )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -19,7 +19,7 @@ from setuptools import setup
 setup(
     name='nistbeacon',
     version='0.9.4',
-    python_requires=">=3.6, <4",
+    python_requires=">=3.7, <4",
     packages=['nistbeacon'],
     include_package_data=True,
     license='Apache License, Version 2.0',
@@ -42,7 +42,6 @@ setup(
         'License :: OSI Approved :: Apache Software License',
         'Operating System :: OS Independent',
         'Programming Language :: Python',
-        'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
         'Programming Language :: Python :: 3.8',
         'Programming Language :: Python :: 3 :: Only',
@@ -28,9 +28,13 @@ from tests.test_data.nist_records import local_record_json_db
 class TestCertBoundaries(TestCase):
     @classmethod
     def setUpClass(cls):
-        # Known verifiers
-        cls.verifier2013 = "_VERIFIER_20130905"
-        cls.verifier2017 = "_VERIFIER_20170808"
+        # Known key epochs
+        cls.epoch2013 = NistBeaconCrypto.get_key_epoch(1378395540)
+        cls.epoch2017 = NistBeaconCrypto.get_key_epoch(1502202360)
+
+    def setUp(self):
+        # A result remembered from an earlier test would skip the verifier
+        NistBeaconCrypto.clear_verify_cache()
 
     def test_cert_20130905_start(self):
         timestamp = 1378395540
@@ -38,11 +42,13 @@ class TestCertBoundaries(TestCase):
             local_record_json_db[timestamp]
         )
 
-        with patch.object(NistBeaconCrypto, self.verifier2013) as mock:
+        with patch.object(self.epoch2013, '_verifier') as mock:
             actual_record = NistBeacon.get_record(timestamp)
-            self.assertEqual(mock.verify.call_count, 1)
 
-        self.assertTrue(actual_record.valid_signature)
+            # Verification is lazy, it runs on first access
+            self.assertTrue(actual_record.valid_signature)
+
+        self.assertEqual(mock.verify.call_count, 1)
         self.assertEqual(expected_record, actual_record)
 
     def test_cert_20130905_end(self):
@@ -51,11 +57,13 @@ class TestCertBoundaries(TestCase):
             local_record_json_db[timestamp]
         )
 
-        with patch.object(NistBeaconCrypto, self.verifier2013) as mock:
+        with patch.object(self.epoch2013, '_verifier') as mock:
             actual_record = NistBeacon.get_record(timestamp)
-            self.assertEqual(mock.verify.call_count, 1)
 
-        self.assertTrue(actual_record.valid_signature)
+            # Verification is lazy, it runs on first access
+            self.assertTrue(actual_record.valid_signature)
+
+        self.assertEqual(mock.verify.call_count, 1)
         self.assertEqual(expected_record, actual_record)
 
     def test_invalid_20170530_start(self):
@@ -71,15 +79,15 @@ class TestCertBoundaries(TestCase):
         # So ugly :(
         #
         with \
-                patch.object(NistBeaconCrypto, self.verifier2013) \
+                patch.object(self.epoch2013, '_verifier') \
                 as verifier2013, \
-                patch.object(NistBeaconCrypto, self.verifier2017) \
+                patch.object(self.epoch2017, '_verifier') \
                 as verifier2017:
             actual_record = NistBeacon.get_record(timestamp)
-            self.assertEqual(verifier2013.verify.call_count, 0)
-            self.assertEqual(verifier2017.verify.call_count, 0)
+            self.assertFalse(actual_record.valid_signature)
 
-        self.assertFalse(actual_record.valid_signature)
+        self.assertEqual(verifier2013.verify.call_count, 0)
+        self.assertEqual(verifier2017.verify.call_count, 0)
         self.assertEqual(expected_record, actual_record)
 
     def test_invalid_20170530_end(self):
@@ -95,15 +103,15 @@ class TestCertBoundaries(TestCase):
         # So ugly :(
         #
         with \
-                patch.object(NistBeaconCrypto, self.verifier2013) \
+                patch.object(self.epoch2013, '_verifier') \
                 as verifier2013, \
-                patch.object(NistBeaconCrypto, self.verifier2017) \
+                patch.object(self.epoch2017, '_verifier') \
                 as verifier2017:
             actual_record = NistBeacon.get_record(timestamp)
-            self.assertEqual(verifier2013.verify.call_count, 0)
-            self.assertEqual(verifier2017.verify.call_count, 0)
+            self.assertFalse(actual_record.valid_signature)
 
-        self.assertFalse(actual_record.valid_signature)
+        self.assertEqual(verifier2013.verify.call_count, 0)
+        self.assertEqual(verifier2017.verify.call_count, 0)
         self.assertEqual(expected_record, actual_record)
 
     def test_cert_20170808_start(self):
@@ -112,18 +120,20 @@ class TestCertBoundaries(TestCase):
             local_record_json_db[timestamp]
         )
 
-        with patch.object(NistBeaconCrypto, self.verifier2017) as mock:
+        with patch.object(self.epoch2017, '_verifier') as mock:
             actual_record = NistBeacon.get_record(timestamp)
-            self.assertEqual(mock.verify.call_count, 1)
 
-        self.assertTrue(actual_record.valid_signature)
+            # Verification is lazy, it runs on first access
+            self.assertTrue(actual_record.valid_signature)
+
+        self.assertEqual(mock.verify.call_count, 1)
         self.assertEqual(expected_record, actual_record)
 
     def test_cert_20170808_end(self):
-        with patch.object(NistBeaconCrypto, self.verifier2017) as mock:
+        with patch.object(self.epoch2017, '_verifier') as mock:
             # Get last record, since this verifier is currently the
             # last known verifier.
             actual_record = NistBeacon.get_last_record()
-            self.assertEqual(mock.verify.call_count, 1)
+            self.assertTrue(actual_record.valid_signature)
 
-        self.assertTrue(actual_record.valid_signature)
+        self.assertEqual(mock.verify.call_count, 1)
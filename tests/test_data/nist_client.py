@@ -0,0 +1,103 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from bisect import (
+    bisect_left,
+    bisect_right,
+)
+from threading import Lock
+from unittest.mock import Mock
+
+from requests import Response
+
+from nistbeacon import (
+    NistBeaconClient,
+    NistBeaconValue,
+)
+from tests.test_data.nist_records import local_record_json_db
+
+
+class LocalNistBeaconClient(NistBeaconClient):
+    """
+    A stand-in for the NIST REST API, answering queries from the local
+    record fixtures instead of the network.
+    """
+
+    def __init__(self, timestamps=None, **kwargs):
+        super().__init__('local://rest/record', **kwargs)
+
+        if timestamps is None:
+            timestamps = [
+                timestamp
+                for timestamp, record_json in local_record_json_db.items()
+                if record_json
+            ]
+
+        self._timestamps = sorted(timestamps)
+        self._xml = {
+            timestamp: NistBeaconValue.from_json(
+                local_record_json_db[timestamp]
+            ).xml
+            for timestamp in self._timestamps
+        }
+
+        self._queries_lock = Lock()
+        self.queries = []
+
+    def query(self, url_data: str):
+        with self._queries_lock:
+            self.queries.append(url_data)
+
+        parts = url_data.split('/')
+        timestamps = self._timestamps
+
+        if parts == ['last']:
+            index = len(timestamps) - 1
+        elif parts[0] == 'next':
+            index = bisect_right(timestamps, int(parts[1]))
+        elif parts[0] == 'previous':
+            index = bisect_left(timestamps, int(parts[1])) - 1
+        else:
+            index = bisect_left(timestamps, int(parts[0]))
+
+        if 0 <= index < len(timestamps):
+            return self._xml[timestamps[index]]
+
+        return None
+
+
+def url_responder(responses: dict):
+    """
+    Build a 'requests.Session.get' side effect which answers by URL,
+    since concurrent lookups are not issued in a fixed order.
+
+    :param responses: The record to answer with, keyed by the part of the
+                      URL after '/rest/record/'. Others get a 404.
+    """
+
+    def respond(url, **_):
+        mock_response = Mock(spec=Response)
+        record = responses.get(url.rsplit('/rest/record/', 1)[1])
+
+        if record is None:
+            mock_response.status_code = 404
+        else:
+            mock_response.status_code = 200
+            mock_response.text = record.xml
+
+        return mock_response
+
+    return respond
@@ -0,0 +1,161 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import struct
+
+from Crypto.Hash import SHA512
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+
+from nistbeacon import NistBeaconPulse
+
+# Version 2.0 pulses are signed with NIST's 4096 bit key, which is not
+# available, so the fixtures are signed with a throwaway key instead
+local_pulse_key = RSA.generate(1024)
+local_certificate_id = hashlib.sha512(
+    local_pulse_key.publickey().export_key(format='DER')
+).hexdigest()
+
+
+def local_pulse(pulse_index: int, **overrides) -> NistBeaconPulse:
+    """
+    Build a version 2.0 pulse signed with 'local_pulse_key', the way NIST
+    signs pulses. 'overrides' replace fields before signing.
+    """
+
+    def value(label: str) -> bytes:
+        return hashlib.sha512(f'{label}/{pulse_index}'.encode()).digest()
+
+    fields = dict(
+        uri=f'https://beacon.nist.gov/beacon/2.0/chain/1/pulse/{pulse_index}',
+        version='Version 2.0',
+        cipher_suite=0,
+        period=60000,
+        certificate_id=local_certificate_id,
+        chain_index=1,
+        pulse_index=pulse_index,
+        time_stamp='2018-08-02T19:06:00.000Z',
+        local_random_value=value('local'),
+        external_source_id=bytes(64),
+        external_status_code=1,
+        external_value=bytes(64),
+        list_values=[
+            (
+                value_type,
+                'https://beacon.nist.gov/beacon/2.0/chain/1/pulse/1',
+                value(value_type),
+            )
+            for value_type in ('previous', 'hour', 'day', 'month', 'year')
+        ],
+        precommitment_value=value('precommitment'),
+        status_code=0,
+    )
+    fields.update(overrides)
+
+    unsigned = NistBeaconPulse(
+        signature_value=b'',
+        output_value=b'',
+        **fields
+    )
+
+    signature = PKCS1_v1_5.new(local_pulse_key).sign(
+        SHA512.new(unsigned.message)
+    )
+    output_value = hashlib.sha512(
+        unsigned.message + struct.pack('>I', len(signature)) + signature
+    ).digest()
+
+    return NistBeaconPulse(
+        signature_value=signature,
+        output_value=output_value,
+        **fields
+    )
+
+
+# A pulse in the published JSON layout, with one repeated byte per hash
+# value. No published pulse is bundled yet, so its signed message below
+# is written out field by field from the version 2.0 reference (NISTIR
+# 8213), rather than produced by 'NistBeaconPulse.message'.
+spec_pulse_json = json.dumps({
+    'pulse': {
+        'uri': 'https://beacon.nist.gov/beacon/2.0/chain/1/pulse/7',
+        'version': 'Version 2.0',
+        'cipherSuite': 0,
+        'period': 60000,
+        'certificateId': '02' * 64,
+        'chainIndex': 1,
+        'pulseIndex': 7,
+        'timeStamp': '2018-08-02T19:06:00.000Z',
+        'localRandomValue': '03' * 64,
+        'external': {
+            'sourceId': '04' * 64,
+            'statusCode': 1,
+            'value': '05' * 64,
+        },
+        'listValues': [
+            {
+                'type': value_type,
+                'uri': 'https://beacon.nist.gov/beacon/2.0/chain/1/pulse/1',
+                'value': value,
+            }
+            for value_type, value in (
+                ('previous', '06' * 64),
+                ('hour', '07' * 64),
+                ('day', '08' * 64),
+                ('month', '09' * 64),
+                ('year', '0A' * 64),
+            )
+        ],
+        'precommitmentValue': '0B' * 64,
+        'statusCode': 0,
+        'signatureValue': '00' * 512,
+        'outputValue': '00' * 64,
+    },
+})
+
+spec_pulse_message = b''.join((
+    # uri and version, length prefixed
+    bytes.fromhex('00000032'),
+    b'https://beacon.nist.gov/beacon/2.0/chain/1/pulse/7',
+    bytes.fromhex('0000000b'),
+    b'Version 2.0',
+    # cipherSuite and period, 4 bytes each
+    bytes.fromhex('00000000' '0000ea60'),
+    # certificateId, length prefixed
+    bytes.fromhex('00000040' + '02' * 64),
+    # chainIndex and pulseIndex, 8 bytes each
+    bytes.fromhex('0000000000000001' '0000000000000007'),
+    # timeStamp, length prefixed
+    bytes.fromhex('00000018'),
+    b'2018-08-02T19:06:00.000Z',
+    # localRandomValue, length prefixed
+    bytes.fromhex('00000040' + '03' * 64),
+    # external sourceId, statusCode (4 bytes) and value
+    bytes.fromhex('00000040' + '04' * 64),
+    bytes.fromhex('00000001'),
+    bytes.fromhex('00000040' + '05' * 64),
+    # previous, hour, day, month and year values, length prefixed
+    bytes.fromhex('00000040' + '06' * 64),
+    bytes.fromhex('00000040' + '07' * 64),
+    bytes.fromhex('00000040' + '08' * 64),
+    bytes.fromhex('00000040' + '09' * 64),
+    bytes.fromhex('00000040' + '0a' * 64),
+    # precommitmentValue, length prefixed, then statusCode (4 bytes)
+    bytes.fromhex('00000040' + '0b' * 64),
+    bytes.fromhex('00000000'),
+))
@@ -0,0 +1,113 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest import TestCase
+
+from nistbeacon import NistBeaconValue
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestBinary(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+        cls.reference_record = NistBeaconValue.from_json(
+            local_record_json_db[1447873020]
+        )
+
+    def test_round_trip(self):
+        for record in self.records:
+            data = record.to_bytes()
+
+            self.assertEqual(NistBeaconValue.BINARY_SIZE, len(data))
+            self.assertLess(len(data), len(record.json))
+            self.assertEqual(record, NistBeaconValue.from_bytes(data))
+
+    def test_short_signatures(self):
+        short = NistBeaconValue.from_json(local_record_json_db[1496176860])
+        self.assertEqual(128, len(short.signature_value_bytes))
+
+        restored = NistBeaconValue.from_bytes(short.to_bytes())
+
+        self.assertEqual(
+            short.signature_value_bytes,
+            restored.signature_value_bytes,
+        )
+
+    def test_from_bytes_errors(self):
+        data = bytearray(self.reference_record.to_bytes())
+
+        self.assertIsNone(NistBeaconValue.from_bytes(bytes(data[:-1])))
+
+        data[0] = 0xFF
+        self.assertIsNone(NistBeaconValue.from_bytes(bytes(data)))
+
+    def test_unknown_version(self):
+        record = self.reference_record
+        unknown = NistBeaconValue(
+            version='Version 9.9',
+            frequency=record.frequency,
+            timestamp=record.timestamp,
+            seed_value=record.seed_value_bytes,
+            previous_output_value=record.previous_output_value_bytes,
+            signature_value=record.signature_value_bytes,
+            output_value=record.output_value_bytes,
+            status_code=record.status_code,
+        )
+
+        with self.assertRaises(ValueError):
+            unknown.to_bytes()
+
+    def test_pack_many(self):
+        data = NistBeaconValue.pack_many(self.records)
+
+        self.assertEqual(NistBeaconValue.BINARY_SIZE * len(self.records),
+                         len(data))
+        self.assertEqual(
+            self.records[3].to_bytes(),
+            bytes(data[3 * NistBeaconValue.BINARY_SIZE:
+                       4 * NistBeaconValue.BINARY_SIZE]),
+        )
+        self.assertEqual(
+            self.records,
+            list(NistBeaconValue.unpack_many(data)),
+        )
+
+    def test_pack_into(self):
+        size = NistBeaconValue.BINARY_SIZE
+        buffer = bytearray(b'\xff' * (size + 3))
+
+        self.records[0].pack_into(buffer, 3)
+
+        self.assertEqual(b'\xff' * 3, bytes(buffer[:3]))
+        self.assertEqual(self.records[0].to_bytes(), bytes(buffer[3:]))
+
+    def test_unpack_many_from_memoryview(self):
+        data = memoryview(NistBeaconValue.pack_many(self.records))
+        size = NistBeaconValue.BINARY_SIZE
+
+        self.assertEqual(
+            self.records[2:5],
+            list(NistBeaconValue.unpack_many(data[2 * size:5 * size])),
+        )
+        self.assertEqual([], list(NistBeaconValue.unpack_many(b'')))
+
+        with self.assertRaises(ValueError):
+            NistBeaconValue.unpack_many(data[1:])
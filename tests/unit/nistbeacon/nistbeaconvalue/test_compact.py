@@ -0,0 +1,83 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import binascii
+from unittest import TestCase
+
+from nistbeacon import NistBeaconValue
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestCompact(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference_record = NistBeaconValue.from_json(
+            local_record_json_db[1447873020]
+        )
+
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(self.reference_record, '__dict__'))
+
+        with self.assertRaises(AttributeError):
+            self.reference_record.extra = True
+
+    def test_bytes_fields(self):
+        record = self.reference_record
+
+        self.assertEqual(64, len(record.seed_value_bytes))
+        self.assertEqual(64, len(record.previous_output_value_bytes))
+        self.assertEqual(256, len(record.signature_value_bytes))
+        self.assertEqual(64, len(record.output_value_bytes))
+
+        self.assertEqual(
+            binascii.a2b_hex(record.output_value),
+            record.output_value_bytes,
+        )
+
+    def test_construct_from_bytes(self):
+        record = self.reference_record
+
+        from_bytes = NistBeaconValue(
+            version=record.version,
+            frequency=record.frequency,
+            timestamp=record.timestamp,
+            seed_value=record.seed_value_bytes,
+            previous_output_value=record.previous_output_value_bytes,
+            signature_value=record.signature_value_bytes,
+            output_value=record.output_value_bytes,
+            status_code=record.status_code,
+        )
+
+        self.assertEqual(record, from_bytes)
+        self.assertEqual(record.json, from_bytes.json)
+        self.assertTrue(from_bytes.valid_signature)
+
+    def test_hex_is_upper_case(self):
+        record = self.reference_record
+
+        lower_case = NistBeaconValue(
+            version=record.version,
+            frequency=record.frequency,
+            timestamp=record.timestamp,
+            seed_value=record.seed_value.lower(),
+            previous_output_value=record.previous_output_value.lower(),
+            signature_value=record.signature_value.lower(),
+            output_value=record.output_value.lower(),
+            status_code=record.status_code,
+        )
+
+        self.assertEqual(record.seed_value, lower_case.seed_value)
+        self.assertEqual(record, lower_case)
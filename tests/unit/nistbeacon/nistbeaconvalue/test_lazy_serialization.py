@@ -0,0 +1,51 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from nistbeacon import NistBeaconValue
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestLazySerialization(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference_json = local_record_json_db[1447873020]
+
+    def test_construction_does_not_serialize(self):
+        with patch.object(json, 'dumps', wraps=json.dumps) as dumps_patched:
+            record = NistBeaconValue.from_json(self.reference_json)
+
+            dumps_patched.assert_not_called()
+
+        # noinspection PyProtectedMember
+        self.assertIsNone(record._json)
+        # noinspection PyProtectedMember
+        self.assertIsNone(record._xml)
+
+    def test_json_is_cached(self):
+        record = NistBeaconValue.from_json(self.reference_json)
+
+        self.assertEqual(self.reference_json, record.json)
+        self.assertIs(record.json, record.json)
+
+    def test_xml_is_cached(self):
+        record = NistBeaconValue.from_json(self.reference_json)
+
+        self.assertEqual(record, NistBeaconValue.from_xml(record.xml))
+        self.assertIs(record.xml, record.xml)
@@ -0,0 +1,78 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from nistbeacon import NistBeaconValue
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestLazyVerification(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.valid_json = local_record_json_db[1447873020]
+        cls.invalid_json = local_record_json_db[1496176860]
+
+    def setUp(self):
+        # Count real RSA checks, not results remembered from other tests
+        NistBeaconCrypto.clear_verify_cache()
+
+    def test_construction_does_not_verify(self):
+        with patch.object(
+                NistBeaconCrypto,
+                '_verify_with',
+                wraps=NistBeaconCrypto._verify_with,
+        ) as verify_patched:
+            record = NistBeaconValue.from_json(self.valid_json)
+            record.output_value
+            record.pseudo_random
+
+            verify_patched.assert_not_called()
+
+    def test_verification_is_cached(self):
+        with patch.object(
+                NistBeaconCrypto,
+                '_verify_with',
+                wraps=NistBeaconCrypto._verify_with,
+        ) as verify_patched:
+            record = NistBeaconValue.from_json(self.valid_json)
+
+            self.assertTrue(record.valid_signature)
+            self.assertTrue(record.valid_signature)
+            self.assertEqual(1, verify_patched.call_count)
+
+    def test_eager_verify(self):
+        with patch.object(
+                NistBeaconCrypto,
+                '_verify_with',
+                wraps=NistBeaconCrypto._verify_with,
+        ) as verify_patched:
+            valid = NistBeaconValue.from_json(
+                self.valid_json,
+                eager_verify=True,
+            )
+            invalid = NistBeaconValue.from_xml(
+                NistBeaconValue.from_json(self.invalid_json).xml,
+                eager_verify=True,
+            )
+
+            self.assertEqual(2, verify_patched.call_count)
+
+            self.assertTrue(valid.valid_signature)
+            self.assertFalse(invalid.valid_signature)
+            self.assertEqual(2, verify_patched.call_count)
@@ -0,0 +1,66 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import struct
+from unittest import TestCase
+from unittest.mock import patch
+
+from nistbeacon import NistBeaconValue
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestMessageDigest(TestCase):
+    def setUp(self):
+        self.record = NistBeaconValue.from_json(
+            local_record_json_db[1447873020]
+        )
+
+    def test_digest_matches_message(self):
+        record = self.record
+        message = record.version.encode() + struct.pack(
+            '>1I1Q64s64s1I',
+            record.frequency,
+            record.timestamp,
+            record.seed_value_bytes,
+            record.previous_output_value_bytes,
+            int(record.status_code),
+        )
+
+        self.assertEqual(
+            hashlib.sha512(message).digest(),
+            record.message_digest,
+        )
+
+    def test_digest_is_kept(self):
+        digest = self.record.message_digest
+
+        with patch.object(NistBeaconCrypto, 'get_hash') as get_hash:
+            self.assertIs(digest, self.record.message_digest)
+
+        get_hash.assert_not_called()
+
+    def test_verification_hashes_once(self):
+        with patch.object(
+                NistBeaconCrypto,
+                'get_hash',
+                wraps=NistBeaconCrypto.get_hash,
+        ) as get_hash:
+            self.assertTrue(self.record.valid_signature)
+            self.assertEqual(64, len(self.record.message_digest))
+
+        get_hash.assert_called_once()
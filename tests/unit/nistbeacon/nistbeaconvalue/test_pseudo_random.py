@@ -96,3 +96,34 @@ class TestPseudoRandom(TestCase):
             record.pseudo_random.randint(1000, 9999),
             7526,
         )
+
+    def test_pseudo_random_is_lazy_and_shared(self):
+        """
+        The generator is only created on first access, and the same
+        generator is returned after that.
+        """
+
+        record = NistBeaconValue.from_json(local_record_json_db[1447873020])
+
+        # noinspection PyProtectedMember
+        self.assertIsNone(record._pseudo_random)
+        self.assertIs(record.pseudo_random, record.pseudo_random)
+
+    def test_new_pseudo_random(self):
+        """
+        Every call gives an independent generator, seeded like
+        `pseudo_random`.
+        """
+
+        record = NistBeaconValue.from_json(local_record_json_db[1447873020])
+
+        first = record.new_pseudo_random()
+        second = record.new_pseudo_random()
+
+        self.assertIsInstance(first, Random)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, record.pseudo_random)
+
+        self.assertEqual(first.random(), 0.9150597089635818)
+        self.assertEqual(second.random(), 0.9150597089635818)
+        self.assertEqual(record.pseudo_random.random(), 0.9150597089635818)
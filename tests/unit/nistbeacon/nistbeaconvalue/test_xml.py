@@ -15,6 +15,7 @@ limitations under the License.
 """
 
 from unittest import TestCase
+from xml.etree import ElementTree
 
 from nistbeacon import NistBeaconValue
 from tests.test_data.nist_records import (
@@ -45,6 +46,38 @@ class TestXml(TestCase):
         self.assertIsNot(expected, actual)
         self.assertEqual(expected, actual)
 
+    def test_from_xml_any_order_or_namespace(self):
+        """
+        Test building a beacon from XML with reordered, unqualified or
+        differently prefixed elements
+        """
+
+        expected = self.target_record
+        root = ElementTree.fromstring(self.target_xml)
+        children = list(root)
+
+        for child in children:
+            root.remove(child)
+
+        for child in reversed(children):
+            root.append(child)
+
+        reordered = ElementTree.tostring(root, encoding='unicode')
+        unqualified = (
+            self.target_xml
+            .replace('xmlns="http://beacon.nist.gov/record/0.1/"', '')
+        )
+        prefixed = (
+            self.target_xml
+            .replace('xmlns=', 'xmlns:nist=')
+            .replace('<', '<nist:')
+            .replace('<nist:/', '</nist:')
+            .replace('<nist:?', '<?')
+        )
+
+        for input_xml in (reordered, unqualified, prefixed):
+            self.assertEqual(expected, NistBeaconValue.from_xml(input_xml))
+
     def test_to_xml(self):
         """
         Test converting a beacon to XML
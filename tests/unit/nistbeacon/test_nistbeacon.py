@@ -27,6 +27,10 @@ from nistbeacon import (
     NistBeacon,
     NistBeaconValue,
 )
+from tests.test_data.nist_client import (
+    LocalNistBeaconClient,
+    url_responder,
+)
 from tests.test_data.nist_records import local_record_json_db
 
 
@@ -57,7 +61,7 @@ class TestNistBeacon(TestCase):
             cls.expected_previous
         )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_first_record(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
@@ -75,7 +79,7 @@ class TestNistBeacon(TestCase):
         self.assertIsNot(expected, actual_download_true)
         self.assertIsNot(actual_download_false, actual_download_true)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_next(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
@@ -85,7 +89,7 @@ class TestNistBeacon(TestCase):
         next_record = NistBeacon.get_next(self.reference_timestamp)
         self.assertEqual(self.expected_next, next_record)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_previous(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
@@ -97,7 +101,7 @@ class TestNistBeacon(TestCase):
         )
         self.assertEqual(self.expected_previous, previous_record)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_record(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
@@ -107,7 +111,7 @@ class TestNistBeacon(TestCase):
         record = NistBeacon.get_record(self.reference_timestamp)
         self.assertEqual(self.expected_current, record)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_last_record(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 200
@@ -117,7 +121,7 @@ class TestNistBeacon(TestCase):
         last_record = NistBeacon.get_last_record()
         self.assertIsInstance(last_record, NistBeaconValue)
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_last_record_404(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 404
@@ -125,7 +129,7 @@ class TestNistBeacon(TestCase):
 
         self.assertIsNone(NistBeacon.get_last_record())
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_get_last_record_exceptions(self, requests_get_patched):
         exceptions_to_test = [
             requests.exceptions.RequestException(),
@@ -140,7 +144,7 @@ class TestNistBeacon(TestCase):
             requests_get_patched.side_effect = exception_to_test
             self.assertIsNone(NistBeacon.get_last_record())
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_chain_check_empty_input(self, requests_get_patched):
         mock_response = Mock(spec=Response)
         mock_response.status_code = 404
@@ -149,7 +153,7 @@ class TestNistBeacon(TestCase):
         # noinspection PyTypeChecker
         self.assertFalse(NistBeacon.chain_check(None))
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_chain_check_majority(self, requests_get_patched):
         first_response = Mock(spec=Response)
         first_response.status_code = 200
@@ -175,7 +179,7 @@ class TestNistBeacon(TestCase):
             )
         )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_chain_check_init(self, requests_get_patched):
         first_response = Mock(spec=Response)
         first_response.status_code = 200
@@ -200,7 +204,7 @@ class TestNistBeacon(TestCase):
             )
         )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_chain_check_last(self, requests_get_patched):
         first_response = Mock(spec=Response)
         first_response.status_code = 200
@@ -225,7 +229,7 @@ class TestNistBeacon(TestCase):
             )
         )
 
-    @patch('requests.get')
+    @patch('requests.Session.get')
     def test_chain_check_no_records_around(self, requests_get_patched):
         first_response = Mock(spec=Response)
         first_response.status_code = 200
@@ -245,3 +249,164 @@ class TestNistBeacon(TestCase):
                 self.expected_current.timestamp
             )
         )
+
+    @patch('requests.Session.get')
+    def test_chain_check_concurrent_majority(self, requests_get_patched):
+        timestamp = self.reference_timestamp
+        requests_get_patched.side_effect = url_responder({
+            str(timestamp): self.expected_current,
+            f'previous/{timestamp}': self.expected_previous,
+            f'next/{timestamp}': self.expected_next,
+        })
+
+        self.assertTrue(NistBeacon.chain_check(timestamp, concurrent=True))
+        self.assertEqual(3, requests_get_patched.call_count)
+
+    @patch('requests.Session.get')
+    def test_chain_check_concurrent_init(self, requests_get_patched):
+        timestamp = self.init_timestamp
+        requests_get_patched.side_effect = url_responder({
+            str(timestamp): self.expected_first,
+            f'next/{timestamp}': self.expected_first_next,
+        })
+
+        self.assertTrue(NistBeacon.chain_check(timestamp, concurrent=True))
+
+    @patch('requests.Session.get')
+    def test_chain_check_concurrent_last(self, requests_get_patched):
+        timestamp = self.reference_timestamp
+        requests_get_patched.side_effect = url_responder({
+            str(timestamp): self.expected_current,
+            f'previous/{timestamp}': self.expected_previous,
+        })
+
+        self.assertTrue(NistBeacon.chain_check(timestamp, concurrent=True))
+
+    @patch('requests.Session.get')
+    def test_chain_check_concurrent_broken(self, requests_get_patched):
+        timestamp = self.reference_timestamp
+        requests_get_patched.side_effect = url_responder({
+            str(timestamp): self.expected_current,
+            f'previous/{timestamp}': self.expected_next,
+            f'next/{timestamp}': self.expected_previous,
+        })
+
+        self.assertFalse(NistBeacon.chain_check(timestamp, concurrent=True))
+
+    @patch('requests.Session.get')
+    def test_chain_check_concurrent_no_records_around(
+            self,
+            requests_get_patched,
+    ):
+        timestamp = self.reference_timestamp
+        requests_get_patched.side_effect = url_responder({
+            str(timestamp): self.expected_current,
+        })
+
+        self.assertFalse(NistBeacon.chain_check(timestamp, concurrent=True))
+
+    def test_get_range(self):
+        client = LocalNistBeaconClient([
+            self.reference_previous,
+            self.reference_timestamp,
+            self.reference_next,
+        ])
+
+        try:
+            NistBeacon.set_client(client)
+            records = list(
+                NistBeacon.get_range(
+                    self.reference_previous,
+                    self.reference_next,
+                )
+            )
+        finally:
+            NistBeacon.set_client()
+
+        self.assertEqual(
+            [
+                self.expected_previous,
+                self.expected_current,
+                self.expected_next,
+            ],
+            records,
+        )
+
+        # Every record came from a predicted lookup, and nothing past the
+        # end of the range was asked for
+        self.assertEqual(
+            [
+                str(self.reference_previous),
+                str(self.reference_timestamp),
+                str(self.reference_next),
+            ],
+            client.queries,
+        )
+
+    def test_get_range_across_gap(self):
+        client = LocalNistBeaconClient()
+
+        try:
+            NistBeacon.set_client(client)
+            records = list(
+                NistBeacon.get_range(self.init_timestamp, self.reference_next)
+            )
+        finally:
+            NistBeacon.set_client()
+
+        self.assertEqual(
+            [
+                self.expected_first,
+                self.expected_first_next,
+                self.expected_previous,
+                self.expected_current,
+                self.expected_next,
+            ],
+            records,
+        )
+
+    def test_get_range_bounded_prefetch(self):
+        client = LocalNistBeaconClient([
+            self.reference_previous,
+            self.reference_timestamp,
+            self.reference_next,
+        ])
+
+        try:
+            NistBeacon.set_client(client)
+            records = NistBeacon.get_range(
+                self.reference_previous,
+                self.reference_previous + 60 * 1440,
+                prefetch=2,
+            )
+            self.assertEqual(self.expected_previous, next(records))
+            self.assertEqual(self.expected_current, next(records))
+            records.close()
+        finally:
+            NistBeacon.set_client()
+
+        # The anchor record plus, at most, two prefetched slots
+        self.assertLessEqual(len(client.queries), 3)
+
+    def test_get_range_empty(self):
+        client = LocalNistBeaconClient([self.reference_timestamp])
+
+        try:
+            NistBeacon.set_client(client)
+
+            self.assertEqual(
+                [],
+                list(NistBeacon.get_range(
+                    self.reference_next,
+                    self.reference_next + 600,
+                )),
+            )
+            self.assertEqual(
+                [],
+                list(NistBeacon.get_range(
+                    self.reference_previous,
+                    self.reference_previous + 30,
+                )),
+            )
+        finally:
+            NistBeacon.set_client()
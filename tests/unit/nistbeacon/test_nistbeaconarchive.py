@@ -0,0 +1,162 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import pickle
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from unittest import TestCase
+
+from nistbeacon import (
+    NistBeaconArchive,
+    NistBeaconValue,
+)
+from tests.test_data.nist_records import local_record_json_db
+
+
+def archived_timestamp(archive: NistBeaconArchive, timestamp: int) -> int:
+    return archive.get_record(timestamp).timestamp
+
+
+class TestNistBeaconArchive(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.nba')
+        os.close(handle)
+
+        self.assertEqual(
+            len(self.records),
+            NistBeaconArchive.write(self.path, iter(self.records)),
+        )
+        self.archive = NistBeaconArchive(self.path)
+
+    def tearDown(self):
+        self.archive.close()
+        os.remove(self.path)
+
+    def test_contents(self):
+        self.assertEqual(len(self.records), len(self.archive))
+        self.assertEqual(self.records, list(self.archive))
+        self.assertEqual(self.records[-1], self.archive[-1])
+
+        with self.assertRaises(IndexError):
+            self.archive[len(self.records)]
+
+    def test_segments(self):
+        # Runs of minute records share a segment
+        self.assertLess(self.archive.segment_count, len(self.records))
+
+    def test_get_record(self):
+        for record in self.records:
+            self.assertEqual(record, self.archive.get_record(record.timestamp))
+
+        # Between records, the next closest one is returned
+        self.assertEqual(
+            self.records[3],
+            self.archive.get_record(self.records[2].timestamp + 1),
+        )
+        self.assertEqual(self.records[0], self.archive.get_record(0))
+        self.assertIsNone(
+            self.archive.get_record(self.records[-1].timestamp + 1)
+        )
+
+    def test_get_next_and_previous(self):
+        for index, record in enumerate(self.records):
+            expected_next = (
+                self.records[index + 1]
+                if index + 1 < len(self.records) else None
+            )
+            expected_previous = self.records[index - 1] if index else None
+
+            self.assertEqual(
+                expected_next,
+                self.archive.get_next(record.timestamp),
+            )
+            self.assertEqual(
+                expected_previous,
+                self.archive.get_previous(record.timestamp),
+            )
+
+        self.assertEqual(
+            self.records[2],
+            self.archive.get_previous(self.records[3].timestamp - 1),
+        )
+
+    def test_late_records_start_a_segment(self):
+        base = self.records[2]
+        late = NistBeaconValue(
+            version=base.version,
+            frequency=base.frequency,
+            timestamp=base.timestamp + 3 * base.frequency + 5,
+            seed_value=base.seed_value_bytes,
+            previous_output_value=base.previous_output_value_bytes,
+            signature_value=base.signature_value_bytes,
+            output_value=base.output_value_bytes,
+            status_code='2',
+        )
+        records = self.records[2:5] + [late]
+
+        NistBeaconArchive.write(self.path, records)
+
+        with NistBeaconArchive(self.path) as archive:
+            self.assertEqual(2, archive.segment_count)
+            self.assertEqual(late, archive.get_record(late.timestamp))
+            self.assertEqual(late, archive.get_next(records[2].timestamp))
+            self.assertEqual(records[2], archive.get_previous(late.timestamp))
+
+    def test_write_requires_ascending_timestamps(self):
+        with self.assertRaises(ValueError):
+            NistBeaconArchive.write(self.path, reversed(self.records))
+
+    def test_empty_archive(self):
+        NistBeaconArchive.write(self.path, [])
+
+        with NistBeaconArchive(self.path) as archive:
+            self.assertEqual(0, len(archive))
+            self.assertIsNone(archive.get_record(0))
+            self.assertIsNone(archive.get_previous(2 ** 40))
+
+    def test_not_an_archive(self):
+        with open(self.path, 'wb') as handle:
+            handle.write(b'not an archive' * 10)
+
+        with self.assertRaises(ValueError):
+            NistBeaconArchive(self.path)
+
+    def test_shared_between_processes(self):
+        timestamp = self.records[4].timestamp
+
+        self.assertEqual(
+            self.records[4],
+            pickle.loads(pickle.dumps(self.archive)).get_record(timestamp),
+        )
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            self.assertEqual(
+                [record.timestamp for record in self.records],
+                list(executor.map(
+                    archived_timestamp,
+                    [self.archive] * len(self.records),
+                    [record.timestamp for record in self.records],
+                )),
+            )
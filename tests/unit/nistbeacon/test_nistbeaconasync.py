@@ -0,0 +1,181 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from unittest import TestCase
+from unittest.mock import patch
+
+from nistbeacon import (
+    AsyncNistBeacon,
+    NistBeacon,
+    NistBeaconValue,
+)
+from tests.test_data.nist_client import url_responder
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestAsyncNistBeacon(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.init_timestamp = 1378395540
+        cls.reference_previous = 1447872960
+        cls.reference_timestamp = 1447873020
+        cls.reference_next = 1447873080
+
+        cls.expected_first = NistBeaconValue.from_json(
+            local_record_json_db[cls.init_timestamp]
+        )
+        cls.expected_current = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_timestamp]
+        )
+        cls.expected_next = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_next]
+        )
+        cls.expected_previous = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_previous]
+        )
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    @patch('requests.Session.get')
+    def test_get_record(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            str(self.reference_timestamp): self.expected_current,
+        })
+
+        record = self.run_async(
+            AsyncNistBeacon.get_record(self.reference_timestamp)
+        )
+
+        self.assertEqual(self.expected_current, record)
+
+    @patch('requests.Session.get')
+    def test_get_next_and_previous(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            f'next/{self.reference_timestamp}': self.expected_next,
+            f'previous/{self.reference_timestamp}': self.expected_previous,
+        })
+
+        next_record = self.run_async(
+            AsyncNistBeacon.get_next(self.reference_timestamp)
+        )
+        previous_record = self.run_async(
+            AsyncNistBeacon.get_previous(self.reference_timestamp)
+        )
+
+        self.assertEqual(self.expected_next, next_record)
+        self.assertEqual(self.expected_previous, previous_record)
+
+    @patch('requests.Session.get')
+    def test_get_first_and_last_record(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            str(self.init_timestamp): self.expected_first,
+            'last': self.expected_current,
+        })
+
+        self.assertEqual(
+            self.expected_first,
+            self.run_async(AsyncNistBeacon.get_first_record(download=True)),
+        )
+        self.assertEqual(
+            self.expected_first,
+            self.run_async(AsyncNistBeacon.get_first_record(download=False)),
+        )
+        self.assertEqual(
+            self.expected_current,
+            self.run_async(AsyncNistBeacon.get_last_record()),
+        )
+
+    @patch('requests.Session.get')
+    def test_get_last_record_404(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({})
+
+        self.assertIsNone(self.run_async(AsyncNistBeacon.get_last_record()))
+
+    @patch('requests.Session.get')
+    def test_chain_check_majority(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            str(self.reference_timestamp): self.expected_current,
+            f'next/{self.reference_timestamp}': self.expected_next,
+            f'previous/{self.reference_timestamp}': self.expected_previous,
+        })
+
+        self.assertTrue(
+            self.run_async(
+                AsyncNistBeacon.chain_check(self.reference_timestamp)
+            )
+        )
+
+    @patch('requests.Session.get')
+    def test_chain_check_broken(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            str(self.reference_timestamp): self.expected_current,
+            f'next/{self.reference_timestamp}': self.expected_previous,
+            f'previous/{self.reference_timestamp}': self.expected_next,
+        })
+
+        self.assertFalse(
+            self.run_async(
+                AsyncNistBeacon.chain_check(self.reference_timestamp)
+            )
+        )
+
+    @patch('requests.Session.get')
+    def test_chain_check_missing_record(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({})
+
+        self.assertFalse(
+            self.run_async(
+                AsyncNistBeacon.chain_check(self.reference_timestamp)
+            )
+        )
+
+    @patch('requests.Session.get')
+    def test_set_executor(self, session_get_patched):
+        session_get_patched.side_effect = url_responder({
+            str(self.reference_timestamp): self.expected_current,
+        })
+        default_executor = AsyncNistBeacon.get_executor()
+        self.assertIs(NistBeacon.get_client().executor, default_executor)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            AsyncNistBeacon.set_executor(executor)
+
+            try:
+                self.assertIs(executor, AsyncNistBeacon.get_executor())
+
+                with patch.object(
+                        executor,
+                        'submit',
+                        wraps=executor.submit,
+                ) as submit_patched:
+                    record = self.run_async(
+                        AsyncNistBeacon.get_record(self.reference_timestamp)
+                    )
+            finally:
+                AsyncNistBeacon.set_executor()
+
+        self.assertEqual(self.expected_current, record)
+        submit_patched.assert_called_once()
+        self.assertIs(default_executor, AsyncNistBeacon.get_executor())
@@ -0,0 +1,228 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from nistbeacon import (
+    BeaconChain,
+    NistBeacon,
+    NistBeaconArchive,
+    NistBeaconBackend,
+    NistBeaconHttpBackend,
+    NistBeaconLayeredBackend,
+    NistBeaconStore,
+    NistBeaconValue,
+)
+from tests.test_data.nist_client import LocalNistBeaconClient
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestNistBeaconBackend(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference_previous = 1447872960
+        cls.reference_timestamp = 1447873020
+        cls.reference_next = 1447873080
+
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+        cls.by_timestamp = {
+            record.timestamp: record
+            for record in cls.records
+        }
+
+    def setUp(self):
+        self.client = LocalNistBeaconClient()
+
+    def tearDown(self):
+        NistBeacon.set_backend()
+        NistBeacon.set_client()
+
+    def test_backend_needs_every_lookup(self):
+        class NoLastRecord(NistBeaconBackend):
+            def get_next(self, timestamp):
+                return None
+
+            def get_previous(self, timestamp):
+                return None
+
+            def get_record(self, timestamp):
+                return None
+
+        # Missing lookups fail on creation, not on first use
+        with self.assertRaises(TypeError):
+            NoLastRecord()
+
+        with self.assertRaises(TypeError):
+            NistBeaconBackend()
+
+    def test_default_backend_uses_client(self):
+        NistBeacon.set_client(self.client)
+
+        backend = NistBeacon.get_backend()
+
+        self.assertIsInstance(backend, NistBeaconHttpBackend)
+        self.assertIs(self.client, backend.client)
+
+    def test_http_backend(self):
+        backend = NistBeaconHttpBackend(self.client)
+
+        self.assertEqual(
+            self.by_timestamp[self.reference_timestamp],
+            backend.get_record(self.reference_timestamp),
+        )
+        self.assertEqual(
+            self.by_timestamp[self.reference_next],
+            backend.get_next(self.reference_timestamp),
+        )
+        self.assertEqual(
+            self.by_timestamp[self.reference_previous],
+            backend.get_previous(self.reference_timestamp),
+        )
+        self.assertEqual(self.records[-1], backend.get_last_record())
+        self.assertEqual(
+            [
+                str(self.reference_timestamp),
+                f'next/{self.reference_timestamp}',
+                f'previous/{self.reference_timestamp}',
+                'last',
+            ],
+            self.client.queries,
+        )
+
+    def test_offline_backends(self):
+        handle, path = tempfile.mkstemp(suffix='.nba')
+        os.close(handle)
+
+        store = NistBeaconStore()
+        store.put_many(self.records)
+        NistBeaconArchive.write(path, self.records)
+
+        NistBeacon.set_client(self.client)
+
+        try:
+            with NistBeaconArchive(path) as archive:
+                for backend in (archive, store, BeaconChain(self.records)):
+                    NistBeacon.set_backend(backend)
+
+                    self.assertTrue(
+                        NistBeacon.chain_check(self.reference_timestamp)
+                    )
+                    self.assertEqual(
+                        self.records[-1],
+                        NistBeacon.get_last_record(),
+                    )
+                    self.assertEqual(
+                        self.by_timestamp[self.reference_next],
+                        NistBeacon.get_next(self.reference_timestamp),
+                    )
+        finally:
+            store.close()
+            os.remove(path)
+
+        self.assertEqual([], self.client.queries)
+
+    def test_layered_read_through(self):
+        store = NistBeaconStore()
+        backend = NistBeaconLayeredBackend(
+            store,
+            NistBeaconHttpBackend(self.client),
+        )
+
+        NistBeacon.set_backend(backend)
+
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(self.client.queries))
+        self.assertEqual(3, len(store))
+
+        # The second check is answered from the store
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(self.client.queries))
+
+        store.close()
+
+    def test_layered_partial_archive(self):
+        handle, path = tempfile.mkstemp(suffix='.nba')
+        os.close(handle)
+
+        # Years of records are missing between the second and last records
+        partial = [self.records[0], self.records[1], self.records[-1]]
+        NistBeaconArchive.write(path, partial)
+
+        try:
+            with NistBeaconArchive(path) as archive:
+                backend = NistBeaconLayeredBackend(
+                    archive,
+                    NistBeaconHttpBackend(self.client),
+                )
+
+                # Answers the archive can prove never reach NIST
+                self.assertEqual(
+                    self.records[1],
+                    backend.get_next(self.records[0].timestamp),
+                )
+                self.assertEqual(
+                    self.records[0],
+                    backend.get_previous(self.records[1].timestamp),
+                )
+                self.assertEqual([], self.client.queries)
+
+                # Across the gap, NIST answers
+                self.assertEqual(
+                    self.records[2],
+                    backend.get_next(self.records[1].timestamp),
+                )
+                self.assertEqual(
+                    self.records[-2],
+                    backend.get_previous(self.records[-1].timestamp),
+                )
+                self.assertEqual(
+                    self.records[2],
+                    backend.get_record(self.records[2].timestamp),
+                )
+                self.assertEqual(3, len(self.client.queries))
+        finally:
+            os.remove(path)
+
+    def test_layered_last_record(self):
+        store = NistBeaconStore()
+        store.put(self.records[0])
+        backend = NistBeaconLayeredBackend(
+            store,
+            NistBeaconHttpBackend(self.client),
+        )
+
+        # The most authoritative layer answers, and the store learns it
+        self.assertEqual(self.records[-1], backend.get_last_record())
+        self.assertEqual(self.records[-1], store.get_last_record())
+
+        # Offline, the store's newest record is the best answer
+        offline = NistBeaconLayeredBackend(
+            store,
+            NistBeaconHttpBackend(LocalNistBeaconClient(timestamps=[])),
+        )
+        self.assertEqual(self.records[-1], offline.get_last_record())
+
+        store.close()
+
+    def test_layered_requires_layers(self):
+        with self.assertRaises(ValueError):
+            NistBeaconLayeredBackend()
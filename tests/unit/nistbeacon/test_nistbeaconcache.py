@@ -0,0 +1,199 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest import TestCase
+
+from nistbeacon import (
+    NistBeacon,
+    NistBeaconCache,
+    NistBeaconValue,
+)
+from tests.test_data.nist_client import LocalNistBeaconClient
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestNistBeaconCache(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.reference_previous = 1447872960
+        cls.reference_timestamp = 1447873020
+        cls.reference_next = 1447873080
+
+        cls.expected_previous = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_previous]
+        )
+        cls.expected_current = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_timestamp]
+        )
+        cls.expected_next = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_next]
+        )
+
+    def tearDown(self):
+        NistBeacon.set_cache()
+        NistBeacon.set_client()
+
+    def test_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            NistBeaconCache(maxsize=0)
+
+    def test_hits_and_misses(self):
+        cache = NistBeaconCache()
+
+        self.assertIsNone(cache.get_record(self.reference_timestamp))
+
+        cache.put(self.expected_current)
+
+        self.assertIs(
+            self.expected_current,
+            cache.get_record(self.reference_timestamp),
+        )
+        self.assertIn(self.reference_timestamp, cache)
+        self.assertEqual(1, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0, cache.evictions)
+
+    def test_lru_eviction(self):
+        cache = NistBeaconCache(maxsize=2)
+
+        cache.put(self.expected_previous)
+        cache.put(self.expected_current)
+
+        # Touch 'previous' so 'current' becomes the least recently used
+        cache.get_record(self.reference_previous)
+        cache.put(self.expected_next)
+
+        self.assertEqual(2, len(cache))
+        self.assertEqual(1, cache.evictions)
+        self.assertIn(self.reference_previous, cache)
+        self.assertNotIn(self.reference_timestamp, cache)
+        self.assertIn(self.reference_next, cache)
+
+    def test_link(self):
+        cache = NistBeaconCache()
+
+        cache.put(self.expected_previous)
+        cache.put(self.expected_current)
+
+        # No adjacency is known yet
+        self.assertIsNone(cache.get_next(self.reference_previous))
+
+        cache.link(self.reference_previous, self.reference_timestamp)
+
+        self.assertIs(
+            self.expected_current,
+            cache.get_next(self.reference_previous),
+        )
+        self.assertIs(
+            self.expected_previous,
+            cache.get_previous(self.reference_timestamp),
+        )
+
+    def test_link_ignores_uncached(self):
+        cache = NistBeaconCache()
+
+        cache.put(self.expected_current)
+        cache.link(self.reference_timestamp, self.reference_next)
+        cache.put(self.expected_next)
+
+        self.assertIsNone(cache.get_next(self.reference_timestamp))
+
+    def test_eviction_drops_links(self):
+        cache = NistBeaconCache(maxsize=2)
+
+        cache.put(self.expected_previous)
+        cache.put(self.expected_current)
+        cache.link(self.reference_previous, self.reference_timestamp)
+
+        cache.put(self.expected_next)
+        cache.put(self.expected_previous)
+
+        self.assertIsNone(cache.get_next(self.reference_previous))
+
+    def test_clear(self):
+        cache = NistBeaconCache()
+
+        cache.put(self.expected_current)
+        cache.get_record(self.reference_timestamp)
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.hits)
+
+    def test_nist_beacon_record_cached(self):
+        client = LocalNistBeaconClient()
+        cache = NistBeaconCache()
+
+        NistBeacon.set_client(client)
+        NistBeacon.set_cache(cache)
+
+        first = NistBeacon.get_record(self.reference_timestamp)
+        second = NistBeacon.get_record(self.reference_timestamp)
+
+        self.assertEqual(self.expected_current, first)
+        self.assertIs(first, second)
+        self.assertEqual([str(self.reference_timestamp)], client.queries)
+        self.assertEqual(1, cache.hits)
+
+    def test_nist_beacon_chain_check_cached(self):
+        client = LocalNistBeaconClient()
+        cache = NistBeaconCache()
+
+        NistBeacon.set_client(client)
+        NistBeacon.set_cache(cache)
+
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(client.queries))
+
+        # Neighbours are now known, no further network access is needed
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(client.queries))
+        self.assertEqual(3, cache.hits)
+
+    def test_nist_beacon_range_links(self):
+        client = LocalNistBeaconClient()
+        cache = NistBeaconCache()
+
+        NistBeacon.set_client(client)
+        NistBeacon.set_cache(cache)
+
+        list(
+            NistBeacon.get_range(self.reference_previous, self.reference_next)
+        )
+        queries = len(client.queries)
+
+        self.assertEqual(
+            self.expected_current,
+            NistBeacon.get_next(self.reference_previous),
+        )
+        self.assertEqual(
+            self.expected_current,
+            NistBeacon.get_previous(self.reference_next),
+        )
+        self.assertEqual(queries, len(client.queries))
+
+    def test_nist_beacon_last_record_bypasses_cache(self):
+        client = LocalNistBeaconClient()
+        cache = NistBeaconCache()
+
+        NistBeacon.set_client(client)
+        NistBeacon.set_cache(cache)
+
+        NistBeacon.get_last_record()
+        last_record = NistBeacon.get_last_record()
+
+        self.assertEqual(['last', 'last'], client.queries)
+        self.assertIn(last_record.timestamp, cache)
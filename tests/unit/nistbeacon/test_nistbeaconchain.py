@@ -0,0 +1,208 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+from unittest import TestCase
+
+from nistbeacon import (
+    BeaconChain,
+    NistBeaconValue,
+)
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestBeaconChain(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+    def setUp(self):
+        self.chain = BeaconChain(self.records)
+
+    def test_len_and_iter(self):
+        self.assertEqual(len(self.records), len(self.chain))
+        self.assertEqual(self.records, list(self.chain))
+
+    def test_getitem(self):
+        self.assertEqual(self.records[0], self.chain[0])
+        self.assertEqual(self.records[-1], self.chain[-1])
+
+        with self.assertRaises(IndexError):
+            self.chain[len(self.records)]
+
+    def test_materialized_values_verify(self):
+        self.assertTrue(self.chain[0].valid_signature)
+        self.assertFalse(self.chain[6].valid_signature)
+
+    def test_append_requires_ascending_timestamps(self):
+        with self.assertRaises(ValueError):
+            self.chain.append(self.records[0])
+
+    def test_columns(self):
+        self.assertEqual(
+            [record.timestamp for record in self.records],
+            self.chain.timestamps.tolist(),
+        )
+        self.assertEqual(
+            [int(record.status_code) for record in self.records],
+            self.chain.status_codes.tolist(),
+        )
+        self.assertEqual(
+            b''.join(record.output_value_bytes for record in self.records),
+            self.chain.output_values.tobytes(),
+        )
+        self.assertEqual(
+            256 * len(self.records),
+            len(self.chain.signature_values),
+        )
+
+        # Mid 2017 records carry short signatures, padded in the column
+        self.assertEqual(
+            [len(record.signature_value_bytes) for record in self.records],
+            self.chain.signature_lengths.tolist(),
+        )
+        self.assertIn(128, self.chain.signature_lengths.tolist())
+
+    def test_slice_is_a_view(self):
+        view = self.chain[2:5]
+
+        self.assertIsInstance(view, BeaconChain)
+        self.assertEqual(self.records[2:5], list(view))
+        self.assertEqual(self.records[3], view[1])
+        self.assertEqual(
+            self.chain.seed_values[2 * 64:5 * 64].tobytes(),
+            view.seed_values.tobytes(),
+        )
+
+        # Views share the parent's columns and are read-only
+        # noinspection PyProtectedMember
+        self.assertIs(self.chain._output_values, view._output_values)
+
+        with self.assertRaises(ValueError):
+            view.append(self.records[-1])
+
+        with self.assertRaises(ValueError):
+            self.chain[::2]
+
+    def test_lookups(self):
+        self.assertEqual(2, self.chain.index(1447872960))
+        self.assertIsNone(self.chain.index(1447872961))
+
+        self.assertEqual(self.records[3], self.chain.get_record(1447873020))
+        self.assertEqual(self.records[3], self.chain.get_record(1447873000))
+        self.assertEqual(self.records[4], self.chain.get_next(1447873020))
+        self.assertEqual(
+            self.records[2],
+            self.chain.get_previous(1447873020),
+        )
+
+        self.assertIsNone(self.chain.get_previous(self.records[0].timestamp))
+        self.assertIsNone(self.chain.get_next(self.records[-1].timestamp))
+
+    def test_lookups_on_view(self):
+        view = self.chain[2:5]
+
+        self.assertEqual(0, view.index(1447872960))
+        self.assertIsNone(view.index(self.records[0].timestamp))
+        self.assertIsNone(view.get_previous(1447872960))
+        self.assertIsNone(view.get_next(1447873080))
+        self.assertEqual(self.records[2], view.get_record(0))
+
+
+class TestBeaconChainLinks(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+    @staticmethod
+    def synthetic_chain(size: int, breaks=(), restarts=()) -> BeaconChain:
+        """
+        Build a long chain of unsigned records, linked except at 'breaks'.
+        """
+
+        chain = BeaconChain()
+        previous_output = bytes(64)
+
+        for index in range(size):
+            output = hashlib.sha512(str(index).encode()).digest()
+
+            chain.append(NistBeaconValue(
+                version='Version 1.0',
+                frequency=60,
+                timestamp=1500000000 + 60 * index,
+                seed_value=bytes(64),
+                previous_output_value=(
+                    bytes(64) if index in breaks else previous_output
+                ),
+                signature_value=bytes(256),
+                output_value=output,
+                status_code='1' if index in restarts else '0',
+            ))
+
+            previous_output = output
+
+        return chain
+
+    def test_fixture_records(self):
+        chain = BeaconChain(self.records)
+
+        # The genesis record and the contiguous runs are fine. Jumps between
+        # fixture runs are broken links, except where the fixtures happen
+        # to hold both sides of a late (status code 2) record.
+        self.assertEqual([2, 5, 7, 9], chain.broken_links())
+        self.assertEqual([], chain[2:5].broken_links())
+        self.assertEqual([], chain[:2].broken_links())
+
+    def test_short_chains(self):
+        self.assertEqual([], BeaconChain().broken_links())
+        self.assertEqual([], BeaconChain(self.records[3:4]).broken_links())
+
+    def test_restarts_are_legitimate(self):
+        chain = self.synthetic_chain(10, breaks={3, 7}, restarts={7})
+
+        self.assertEqual([3], chain.broken_links())
+
+    def test_memoryview_comparison(self):
+        chain = self.synthetic_chain(10000, breaks={1, 4096, 4097, 9999})
+
+        # noinspection PyProtectedMember
+        self.assertEqual([1, 4096, 4097, 9999], chain._mismatched_links())
+        # noinspection PyProtectedMember
+        self.assertEqual([], chain[1:4096]._mismatched_links())
+
+    def test_numpy_comparison(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('NumPy is not installed')
+
+        chain = self.synthetic_chain(10000, breaks={1, 4096, 4097, 9999})
+
+        self.assertEqual(
+            [1, 4096, 4097, 9999],
+            # noinspection PyProtectedMember
+            chain._mismatched_links_numpy(numpy),
+        )
+        self.assertEqual([1, 5903], chain[4096:].broken_links())
+        self.assertEqual([4091, 4092], chain[5:4100].broken_links())
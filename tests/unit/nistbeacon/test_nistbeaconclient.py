@@ -0,0 +1,130 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+from unittest import TestCase
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+import requests.exceptions
+from requests import Response
+
+from nistbeacon import (
+    NistBeacon,
+    NistBeaconClient,
+    NistBeaconValue,
+)
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestNistBeaconClient(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.base_url = 'http://localhost:8080/rest/record'
+        cls.reference_timestamp = 1447873020
+        cls.reference_record = NistBeaconValue.from_json(
+            local_record_json_db[cls.reference_timestamp]
+        )
+
+    def test_session_is_reused(self):
+        client = NistBeaconClient(self.base_url)
+
+        self.assertIs(client.session, client.session)
+
+    def test_session_pool_settings(self):
+        client = NistBeaconClient(
+            self.base_url,
+            pool_connections=2,
+            pool_maxsize=7,
+        )
+
+        adapter = client.session.get_adapter(self.base_url)
+
+        # noinspection PyProtectedMember
+        self.assertEqual(2, adapter._pool_connections)
+        # noinspection PyProtectedMember
+        self.assertEqual(7, adapter._pool_maxsize)
+
+    def test_close_drops_session(self):
+        client = NistBeaconClient(self.base_url)
+        first_session = client.session
+
+        client.close()
+
+        self.assertIsNot(first_session, client.session)
+
+    def test_context_manager_closes(self):
+        with NistBeaconClient(self.base_url) as client:
+            first_session = client.session
+
+        self.assertIsNot(first_session, client.session)
+
+    @patch('requests.Session.get')
+    def test_query(self, session_get_patched):
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 200
+        mock_response.text = 'beacon'
+        session_get_patched.return_value = mock_response
+
+        client = NistBeaconClient(self.base_url, timeout=5)
+
+        self.assertEqual('beacon', client.query('last'))
+        session_get_patched.assert_called_once_with(
+            url=f'{self.base_url}/last',
+            timeout=5,
+        )
+
+    @patch('requests.Session.get')
+    def test_query_404(self, session_get_patched):
+        mock_response = Mock(spec=Response)
+        mock_response.status_code = 404
+        session_get_patched.return_value = mock_response
+
+        client = NistBeaconClient(self.base_url)
+
+        self.assertIsNone(client.query('last'))
+
+    @patch('requests.Session.get')
+    def test_query_exception(self, session_get_patched):
+        session_get_patched.side_effect = requests.exceptions.Timeout()
+
+        client = NistBeaconClient(self.base_url)
+
+        self.assertIsNone(client.query('last'))
+
+    def test_nist_beacon_set_client(self):
+        mock_client = Mock(spec=NistBeaconClient)
+        mock_client.query.return_value = self.reference_record.xml
+
+        try:
+            NistBeacon.set_client(mock_client)
+            self.assertIs(mock_client, NistBeacon.get_client())
+
+            record = NistBeacon.get_record(self.reference_timestamp)
+
+            self.assertEqual(self.reference_record, record)
+            mock_client.query.assert_called_once_with(
+                str(self.reference_timestamp)
+            )
+        finally:
+            NistBeacon.set_client()
+
+        default_client = NistBeacon.get_client()
+
+        self.assertIsInstance(default_client, NistBeaconClient)
+        # noinspection PyProtectedMember
+        self.assertEqual(NistBeacon._NIST_API_URL, default_client.base_url)
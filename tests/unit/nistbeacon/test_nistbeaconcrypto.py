@@ -14,9 +14,23 @@ See the License for the specific language governing permissions and
 limitations under the License.
 """
 
+import hashlib
+import os
+import pickle
+import ssl
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 
+from Crypto.PublicKey import RSA
+from Crypto.Signature import PKCS1_v1_5
+
+from nistbeacon import (
+    NistBeaconStore,
+    NistBeaconValue,
+)
 from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_records import local_record_json_db
 from unittest.mock import (
     Mock,
     patch,
@@ -26,8 +40,10 @@ from unittest.mock import (
 class TestNistBeaconCrypto(TestCase):
     @classmethod
     def setUpClass(cls):
-        cls.verifier2013 = "_VERIFIER_20130905"
         cls.verifier2013_timestamp = 1378395540
+        cls.epoch2013 = NistBeaconCrypto.get_key_epoch(
+            cls.verifier2013_timestamp,
+        )
 
     def test_verify_converts_1_to_bool(self):
         """
@@ -38,7 +54,7 @@ class TestNistBeaconCrypto(TestCase):
         mock_verifier = Mock()
         mock_verifier.verify = Mock(return_value=1)
 
-        with patch.object(NistBeaconCrypto, self.verifier2013, mock_verifier):
+        with patch.object(self.epoch2013, '_verifier', mock_verifier):
             # noinspection PyTypeChecker
             result = NistBeaconCrypto.verify(
                 self.verifier2013_timestamp,
@@ -60,7 +76,7 @@ class TestNistBeaconCrypto(TestCase):
         mock_verifier = Mock()
         mock_verifier.verify = Mock(side_effect=test_data)
 
-        with patch.object(NistBeaconCrypto, self.verifier2013, mock_verifier):
+        with patch.object(self.epoch2013, '_verifier', mock_verifier):
             for _ in test_data:
                 # noinspection PyTypeChecker
                 result = NistBeaconCrypto.verify(
@@ -82,7 +98,7 @@ class TestNistBeaconCrypto(TestCase):
         mock_verifier = Mock()
         mock_verifier.verify = Mock(side_effect=test_data)
 
-        with patch.object(NistBeaconCrypto, self.verifier2013, mock_verifier):
+        with patch.object(self.epoch2013, '_verifier', mock_verifier):
             for test_data_point in test_data:
                 # noinspection PyTypeChecker
                 result = NistBeaconCrypto.verify(
@@ -93,3 +109,352 @@ class TestNistBeaconCrypto(TestCase):
 
                 self.assertIsInstance(result, bool)
                 self.assertEqual(test_data_point, result)
+
+
+class TestNistBeaconCryptoVerifyMany(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+        cls.expected = [record.valid_signature for record in cls.records]
+
+    def test_fixture_expectations(self):
+        # Records from the bugged mid 2017 period never verify
+        self.assertEqual(
+            [1496176860, 1502201640],
+            [
+                record.timestamp
+                for record, valid in zip(self.records, self.expected)
+                if not valid
+            ],
+        )
+
+    def test_single_worker(self):
+        self.assertEqual(
+            self.expected,
+            NistBeaconCrypto.verify_many(self.records, workers=1),
+        )
+
+    def test_process_pool(self):
+        self.assertEqual(
+            self.expected * 3,
+            NistBeaconCrypto.verify_many(
+                iter(self.records * 3),
+                workers=2,
+                chunk_size=2,
+            ),
+        )
+
+    def test_empty(self):
+        self.assertEqual([], NistBeaconCrypto.verify_many([], workers=2))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            NistBeaconCrypto.verify_many(self.records, workers=0)
+
+        with self.assertRaises(ValueError):
+            NistBeaconCrypto.verify_many(self.records, chunk_size=0)
+
+
+class TestNistBeaconCryptoCache(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.valid_json = local_record_json_db[1447873020]
+        cls.other_json = local_record_json_db[1505097420]
+        cls.invalid_json = local_record_json_db[1496176860]
+
+    def setUp(self):
+        NistBeaconCrypto.clear_verify_cache()
+
+    def tearDown(self):
+        NistBeaconCrypto.set_verify_cache_size(4096)
+        NistBeaconCrypto.set_verify_store(None)
+        NistBeaconCrypto.clear_verify_cache()
+
+    def verify_count(self, record_json: str) -> int:
+        """
+        Verify a freshly parsed record, returning the number of RSA checks.
+        """
+
+        with patch.object(
+                NistBeaconCrypto,
+                '_verify_with',
+                wraps=NistBeaconCrypto._verify_with,
+        ) as verify_patched:
+            self.assertTrue(
+                NistBeaconValue.from_json(record_json).valid_signature
+            )
+
+        return verify_patched.call_count
+
+    def test_repeat_verification_hits(self):
+        self.assertEqual(1, self.verify_count(self.valid_json))
+        self.assertEqual(0, self.verify_count(self.valid_json))
+
+        info = NistBeaconCrypto.verify_cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(1, info.misses)
+        self.assertEqual(1, info.currsize)
+
+    def test_tampered_record_misses(self):
+        record = NistBeaconValue.from_json(self.valid_json)
+        self.assertTrue(record.valid_signature)
+
+        tampered = NistBeaconValue(
+            version=record.version,
+            frequency=record.frequency,
+            timestamp=record.timestamp,
+            seed_value=bytes(64),
+            previous_output_value=record.previous_output_value_bytes,
+            signature_value=record.signature_value_bytes,
+            output_value=record.output_value_bytes,
+            status_code=record.status_code,
+        )
+
+        self.assertFalse(tampered.valid_signature)
+        self.assertEqual(2, NistBeaconCrypto.verify_cache_info().misses)
+
+    def test_unsigned_records_are_not_cached(self):
+        self.assertFalse(
+            NistBeaconValue.from_json(self.invalid_json).valid_signature
+        )
+        self.assertEqual(0, NistBeaconCrypto.verify_cache_info().currsize)
+
+    def test_bounded(self):
+        NistBeaconCrypto.set_verify_cache_size(1)
+
+        self.assertEqual(1, self.verify_count(self.valid_json))
+        self.assertEqual(1, self.verify_count(self.other_json))
+        self.assertEqual(1, self.verify_count(self.valid_json))
+        self.assertEqual(1, NistBeaconCrypto.verify_cache_info().currsize)
+
+        with self.assertRaises(ValueError):
+            NistBeaconCrypto.set_verify_cache_size(-1)
+
+    def test_store_survives_restart(self):
+        store = NistBeaconStore()
+        NistBeaconCrypto.set_verify_store(store)
+        self.assertIs(store, NistBeaconCrypto.get_verify_store())
+
+        self.assertEqual(1, self.verify_count(self.valid_json))
+
+        # A new process starts with an empty in-memory cache
+        NistBeaconCrypto.clear_verify_cache()
+
+        self.assertEqual(0, self.verify_count(self.valid_json))
+        self.assertEqual(1, NistBeaconCrypto.verify_cache_info().store_hits)
+
+    def test_pool_results_are_kept(self):
+        store = NistBeaconStore()
+        NistBeaconCrypto.set_verify_store(store)
+
+        # Two records of the first key epoch, then one of the second
+        records = [
+            NistBeaconValue.from_json(record_json)
+            for record_json in (
+                self.valid_json,
+                local_record_json_db[1447872960],
+                self.other_json,
+            )
+        ]
+
+        with patch.object(
+                store,
+                'put_verifications',
+                wraps=store.put_verifications,
+        ) as put_patched:
+            self.assertEqual(
+                [True, True, True],
+                NistBeaconCrypto.verify_many(
+                    records,
+                    workers=2,
+                    chunk_size=2,
+                ),
+            )
+
+        # One store transaction per run, not one per record
+        self.assertEqual(2, put_patched.call_count)
+        self.assertEqual(3, NistBeaconCrypto.verify_cache_info().currsize)
+
+        # Checked by the workers, never again here
+        self.assertEqual(0, self.verify_count(self.valid_json))
+        self.assertEqual(0, self.verify_count(self.other_json))
+
+        # Nor after a restart
+        NistBeaconCrypto.clear_verify_cache()
+
+        self.assertEqual(0, self.verify_count(self.valid_json))
+        self.assertEqual(1, NistBeaconCrypto.verify_cache_info().store_hits)
+
+    def test_store_without_memory_cache(self):
+        NistBeaconCrypto.set_verify_cache_size(0)
+        NistBeaconCrypto.set_verify_store(NistBeaconStore())
+
+        self.assertEqual(1, self.verify_count(self.valid_json))
+        self.assertEqual(0, self.verify_count(self.valid_json))
+        self.assertEqual(0, NistBeaconCrypto.verify_cache_info().currsize)
+
+
+class TestNistBeaconCryptoKeyEpochs(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key = RSA.generate(1024)
+        cls.public_pem = cls.private_key.publickey().export_key()
+        cls.start = 2000000000
+
+    def setUp(self):
+        # noinspection PyProtectedMember
+        self.saved_epochs = NistBeaconCrypto._key_epochs
+        NistBeaconCrypto.clear_verify_cache()
+
+    def tearDown(self):
+        NistBeaconCrypto._key_epochs = self.saved_epochs
+        NistBeaconCrypto.clear_verify_cache()
+
+    def signed_record(self, timestamp: int) -> NistBeaconValue:
+        """
+        Build a record signed with the generated key, the way NIST signs
+        version 1.0 records.
+        """
+
+        fields = dict(
+            version='Version 1.0',
+            frequency=60,
+            timestamp=timestamp,
+            seed_value=os.urandom(64),
+            previous_output_value=os.urandom(64),
+            status_code='0',
+        )
+        message_hash = NistBeaconCrypto.get_hash(
+            fields['version'],
+            fields['frequency'],
+            fields['timestamp'],
+            fields['seed_value'],
+            fields['previous_output_value'],
+            fields['status_code'],
+        )
+
+        # Signatures are published byte reversed
+        signature = PKCS1_v1_5.new(self.private_key).sign(message_hash)[::-1]
+
+        return NistBeaconValue(
+            signature_value=signature,
+            output_value=hashlib.sha512(signature).digest(),
+            **fields
+        )
+
+    def test_known_epochs(self):
+        self.assertIsNone(NistBeaconCrypto.get_key_epoch(-1))
+        self.assertEqual(
+            '20130905',
+            NistBeaconCrypto.get_key_epoch(1496176800).name,
+        )
+        self.assertFalse(NistBeaconCrypto.get_key_epoch(1496176860).has_key)
+        self.assertFalse(NistBeaconCrypto.get_key_epoch(1502202300).has_key)
+        self.assertEqual(
+            '20170808',
+            NistBeaconCrypto.get_key_epoch(1502202360).name,
+        )
+        self.assertEqual(
+            [0, 1496176860, 1502202360],
+            [epoch.start for epoch in NistBeaconCrypto.key_epochs()],
+        )
+
+    def test_register_key(self):
+        record = self.signed_record(self.start + 60)
+        self.assertFalse(record.valid_signature)
+
+        epoch = NistBeaconCrypto.register_key(self.start, self.public_pem)
+
+        self.assertIs(epoch, NistBeaconCrypto.get_key_epoch(record.timestamp))
+        self.assertEqual(16, len(epoch.name))
+        self.assertTrue(self.signed_record(self.start).valid_signature)
+
+        # Records before the new epoch keep their old key
+        self.assertFalse(self.signed_record(self.start - 60).valid_signature)
+
+    def test_register_replaces_and_revokes(self):
+        NistBeaconCrypto.register_key(self.start, self.public_pem)
+        NistBeaconCrypto.register_key(self.start, None)
+
+        self.assertEqual(4, len(NistBeaconCrypto.key_epochs()))
+        self.assertFalse(self.signed_record(self.start).valid_signature)
+
+    def test_register_bad_key(self):
+        with self.assertRaises(ValueError):
+            NistBeaconCrypto.register_key(self.start, 'not a key')
+
+        self.assertEqual(3, len(NistBeaconCrypto.key_epochs()))
+
+    def test_register_certificate_file(self):
+        # NIST publishes 'beacon.cer' DER encoded
+        # noinspection PyProtectedMember
+        certificate = ssl.PEM_cert_to_DER_cert(
+            NistBeaconCrypto._NIST_CER_FILE_20130905
+        )
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, 'beacon.cer')
+            path.write_bytes(certificate)
+
+            epoch = NistBeaconCrypto.register_key(0, path)
+
+        self.assertEqual(
+            self.saved_epochs[1][0].key,
+            epoch.key,
+        )
+        self.assertTrue(
+            NistBeaconValue.from_json(
+                local_record_json_db[1447873020]
+            ).valid_signature
+        )
+
+    def test_register_certificate_str_path(self):
+        # The PEM certificate shipped with the package, named by a string
+        path = os.path.join(
+            os.path.dirname(__file__), '..', '..', '..', 'beacon.cer',
+        )
+
+        epoch = NistBeaconCrypto.register_key(self.start, path)
+
+        self.assertEqual(self.saved_epochs[1][0].key, epoch.key)
+
+    def test_pickle(self):
+        epoch = NistBeaconCrypto.register_key(self.start, self.public_pem)
+        copy = pickle.loads(pickle.dumps(epoch))
+
+        self.assertEqual(epoch.start, copy.start)
+        self.assertEqual(epoch.name, copy.name)
+        self.assertEqual(epoch.key, copy.key)
+
+    def test_verify_many_looks_up_once_per_run(self):
+        records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+        with patch.object(
+                NistBeaconCrypto,
+                'get_key_epoch',
+                wraps=NistBeaconCrypto.get_key_epoch,
+        ) as lookup_patched:
+            NistBeaconCrypto.verify_many(records, workers=1)
+
+        # Fixtures cover the 2013 key, the unsigned gap, and the 2017 key
+        self.assertEqual(3, lookup_patched.call_count)
+
+    def test_verify_many_with_registered_key(self):
+        NistBeaconCrypto.register_key(self.start, self.public_pem)
+        records = [
+            self.signed_record(self.start + 60 * index)
+            for index in range(4)
+        ]
+
+        self.assertEqual(
+            [True] * 4,
+            NistBeaconCrypto.verify_many(records, workers=2, chunk_size=1),
+        )
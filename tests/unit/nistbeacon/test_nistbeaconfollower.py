@@ -0,0 +1,279 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import (
+    Mock,
+    patch,
+)
+
+from nistbeacon import (
+    BeaconChain,
+    ChainFollower,
+    NistBeaconValue,
+)
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_pulses import (
+    local_certificate_id,
+    local_pulse,
+    local_pulse_key,
+)
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestChainFollower(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+    def setUp(self):
+        # Count real RSA checks, not results remembered from other tests
+        NistBeaconCrypto.clear_verify_cache()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, 'head.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def fresh(self, index: int) -> NistBeaconValue:
+        """
+        A copy of a fixture record that has not been verified yet.
+        """
+
+        return NistBeaconValue.from_json(self.records[index].json)
+
+    def poll_counting(self, follower: ChainFollower):
+        """
+        Poll, returning the events and the number of RSA checks made.
+        """
+
+        with patch.object(
+                NistBeaconCrypto,
+                '_verify_with',
+                wraps=NistBeaconCrypto._verify_with,
+        ) as verify_patched:
+            events = follower.poll()
+
+        return events, verify_patched.call_count
+
+    def test_one_check_per_new_record(self):
+        chain = BeaconChain([self.fresh(2)])
+        source = Mock(wraps=chain)
+        follower = ChainFollower(source)
+
+        events, checks = self.poll_counting(follower)
+        self.assertEqual(1, checks)
+        self.assertEqual([True], [event.ok for event in events])
+        self.assertEqual(self.records[2].timestamp, follower.head_timestamp)
+
+        chain.append(self.fresh(3))
+
+        events, checks = self.poll_counting(follower)
+        self.assertEqual(1, checks)
+        self.assertEqual(1, len(events))
+        self.assertTrue(events[0].linked)
+        self.assertTrue(events[0].ok)
+        self.assertEqual(2, source.get_last_record.call_count)
+        source.get_next.assert_not_called()
+
+        # Nothing new, nothing to check
+        events, checks = self.poll_counting(follower)
+        self.assertEqual([], events)
+        self.assertEqual(0, checks)
+
+    def test_catches_up_on_missed_records(self):
+        chain = BeaconChain([self.fresh(2)])
+        follower = ChainFollower(chain)
+        follower.poll()
+
+        chain.extend([self.fresh(3), self.fresh(4)])
+
+        events, checks = self.poll_counting(follower)
+        self.assertEqual(2, checks)
+        self.assertEqual(
+            [self.records[3], self.records[4]],
+            [event.record for event in events],
+        )
+        self.assertTrue(all(event.ok for event in events))
+        self.assertEqual(
+            self.records[4].output_value,
+            follower.head_output_value,
+        )
+
+    def test_broken_link_and_gap(self):
+        chain = BeaconChain([self.fresh(2)])
+        follower = ChainFollower(chain)
+        follower.poll()
+
+        # Months of records are missing before this late record
+        chain.append(self.fresh(5))
+
+        event, = follower.poll()
+        self.assertTrue(event.valid_signature)
+        self.assertTrue(event.gap)
+        self.assertFalse(event.linked)
+        self.assertFalse(event.ok)
+
+    def test_restart(self):
+        follower = ChainFollower(BeaconChain([self.fresh(0), self.fresh(1)]))
+
+        # The newest record links to one never seen, so the follower starts
+        # from it
+        event, = follower.poll()
+        self.assertTrue(event.linked)
+        self.assertFalse(event.restart)
+
+        restart = ChainFollower(BeaconChain([self.fresh(0)])).poll()[0]
+        self.assertTrue(restart.restart)
+        self.assertTrue(restart.ok)
+
+    def test_invalid_record_is_not_the_head(self):
+        chain = BeaconChain([self.fresh(2), self.fresh(3), self.fresh(4)])
+        source = Mock(wraps=chain)
+        source.get_last_record.return_value = self.fresh(2)
+        follower = ChainFollower(source)
+        follower.poll()
+
+        # A forged newest record is reported, but the head stays put
+        forged = json.loads(self.records[3].json)
+        forged['outputValue'] = '00' * 64
+        source.get_last_record.return_value = NistBeaconValue.from_json(
+            json.dumps(forged)
+        )
+
+        event, = follower.poll()
+        self.assertFalse(event.valid_signature)
+        self.assertFalse(event.ok)
+        self.assertEqual(self.records[2].timestamp, follower.head_timestamp)
+        self.assertEqual([], follower.poll())
+
+        # The genuine records link up again
+        source.get_last_record.return_value = self.fresh(4)
+
+        events = follower.poll()
+        self.assertEqual(
+            [self.records[3], self.records[4]],
+            [event.record for event in events],
+        )
+        self.assertTrue(all(event.ok for event in events))
+        self.assertEqual(self.records[4].timestamp, follower.head_timestamp)
+
+    def test_walk_breaks_off(self):
+        chain = BeaconChain([self.fresh(2)])
+        source = Mock(wraps=chain)
+        follower = ChainFollower(source, self.checkpoint_path)
+        follower.poll()
+
+        with open(self.checkpoint_path) as handle:
+            checkpoint = handle.read()
+
+        # The record after the first missed one cannot be fetched
+        chain.extend([self.fresh(3), self.fresh(4)])
+        source.get_next.side_effect = [self.fresh(3), None]
+
+        self.assertEqual([], follower.poll())
+        self.assertEqual(self.records[2].timestamp, follower.head_timestamp)
+
+        with open(self.checkpoint_path) as handle:
+            self.assertEqual(checkpoint, handle.read())
+
+        # The next poll walks the same records again
+        source.get_next.side_effect = None
+        source.get_next.wraps = chain.get_next
+
+        events = follower.poll()
+        self.assertEqual(
+            [self.records[3], self.records[4]],
+            [event.record for event in events],
+        )
+        self.assertTrue(all(event.ok for event in events))
+        self.assertEqual(self.records[4].timestamp, follower.head_timestamp)
+
+    def test_pulse_status_bits(self):
+        # noinspection PyProtectedMember
+        saved_certificates = NistBeaconCrypto._certificates
+        NistBeaconCrypto.register_certificate(
+            local_certificate_id,
+            local_pulse_key.publickey().export_key(),
+        )
+
+        source = Mock()
+
+        try:
+            # Gap, with the precommitment bit also set
+            source.get_last_record.return_value = local_pulse(
+                2,
+                status_code=6,
+            )
+            event, = ChainFollower(source).poll()
+            self.assertTrue(event.gap)
+            self.assertFalse(event.restart)
+
+            # New chain, with the precommitment bit also set
+            source.get_last_record.return_value = local_pulse(
+                2,
+                status_code=5,
+            )
+            event, = ChainFollower(source).poll()
+            self.assertTrue(event.restart)
+            self.assertFalse(event.gap)
+            self.assertTrue(event.ok)
+        finally:
+            NistBeaconCrypto._certificates = saved_certificates
+
+    def test_unreachable_source(self):
+        source = Mock()
+        source.get_last_record.return_value = None
+
+        self.assertEqual([], ChainFollower(source).poll())
+
+    def test_checkpoint(self):
+        chain = BeaconChain([self.fresh(2)])
+        ChainFollower(chain, self.checkpoint_path).poll()
+
+        # A new follower resumes from the checkpoint
+        follower = ChainFollower(chain, self.checkpoint_path)
+        self.assertEqual(self.checkpoint_path, follower.checkpoint_path)
+        self.assertEqual(self.records[2].timestamp, follower.head_timestamp)
+        self.assertEqual(
+            self.records[2].output_value,
+            follower.head_output_value,
+        )
+
+        chain.extend([self.fresh(3), self.fresh(4)])
+
+        events = follower.poll()
+        self.assertEqual(2, len(events))
+        self.assertTrue(all(event.linked for event in events))
+
+        follower = ChainFollower(chain, self.checkpoint_path)
+        self.assertEqual(self.records[4].timestamp, follower.head_timestamp)
+        self.assertFalse(os.path.exists(f'{self.checkpoint_path}.partial'))
+
+    def test_bad_checkpoint(self):
+        with open(self.checkpoint_path, 'w') as handle:
+            handle.write('{"timeStamp": 1}')
+
+        with self.assertRaises(ValueError):
+            ChainFollower(BeaconChain(), self.checkpoint_path)
@@ -0,0 +1,200 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from xml.etree import ElementTree
+
+from nistbeacon import (
+    NistBeaconLoader,
+    NistBeaconStore,
+    NistBeaconValue,
+)
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_records import (
+    local_record_json_db,
+    local_record_xml_db,
+)
+
+
+class TestNistBeaconLoader(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+
+        # One XML document holding every fixture record
+        cls.xml_archive = (
+            '<?xml version="1.0" encoding="UTF-8"?><records>' +
+            ''.join(
+                record.xml.split('?>', 1)[1]
+                for record in cls.records
+            ) +
+            '</records>'
+        ).encode()
+
+        cls.json_archive = '\n'.join(
+            record_json
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ) + '\n\n'
+
+    def test_iter_xml(self):
+        records = NistBeaconLoader.iter_xml(io.BytesIO(self.xml_archive))
+
+        self.assertEqual(self.records, list(records))
+
+    def test_iter_xml_single_record(self):
+        record_xml = local_record_xml_db[1447873020]
+        records = NistBeaconLoader.iter_xml(
+            io.BytesIO(record_xml.encode())
+        )
+
+        self.assertEqual([NistBeaconValue.from_xml(record_xml)], list(records))
+
+    def test_iter_xml_stops_at_errors(self):
+        truncated = self.xml_archive[:len(self.xml_archive) // 2]
+        records = []
+
+        # The records before the damage are still handed out
+        with self.assertRaises(ElementTree.ParseError):
+            for record in NistBeaconLoader.iter_xml(io.BytesIO(truncated)):
+                records.append(record)
+
+        self.assertTrue(records)
+        self.assertEqual(self.records[:len(records)], records)
+
+    def test_iter_xml_skips_bad_records(self):
+        good_xml = self.records[2].xml.split('?>', 1)[1]
+        bad_xml = [
+            good_xml.replace(
+                self.records[2].seed_value,
+                'not hex',
+            ),
+            good_xml.replace(
+                '<frequency>60</frequency>',
+                '<frequency>sixty</frequency>',
+            ),
+            good_xml.replace(
+                f'<timeStamp>{self.records[2].timestamp}</timeStamp>',
+                '<timeStamp>now</timeStamp>',
+            ),
+        ]
+        archive = (
+            f'<records>{bad_xml[0]}{good_xml}{bad_xml[1]}{bad_xml[2]}'
+            f'{good_xml}</records>'
+        ).encode()
+
+        records = NistBeaconLoader.iter_xml(io.BytesIO(archive))
+
+        self.assertEqual([self.records[2]] * 2, list(records))
+
+    def test_iter_json_lines(self):
+        records = NistBeaconLoader.iter_json_lines(
+            io.StringIO(self.json_archive + 'not json\n{}\n')
+        )
+
+        self.assertEqual(self.records, list(records))
+
+    def test_iter_json_lines_skips_bad_records(self):
+        good_json = local_record_json_db[self.records[2].timestamp]
+        data = json.loads(good_json)
+        bad_lines = ['42', '[1, 2]', '"text"']
+
+        for field, value in (
+                ('seedValue', 'not hex'),
+                ('frequency', 'sixty'),
+                ('timeStamp', 'now'),
+        ):
+            bad_lines.append(json.dumps(dict(data, **{field: value})))
+
+        records = NistBeaconLoader.iter_json_lines(
+            io.StringIO('\n'.join(bad_lines + [good_json] + bad_lines))
+        )
+
+        self.assertEqual([self.records[2]], list(records))
+
+    def test_iter_json_lines_path(self):
+        handle, path = tempfile.mkstemp(suffix='.jsonl')
+
+        try:
+            with os.fdopen(handle, 'w') as archive:
+                archive.write(self.json_archive)
+
+            self.assertEqual(
+                self.records,
+                list(NistBeaconLoader.iter_json_lines(path)),
+            )
+        finally:
+            os.remove(path)
+
+    def test_verification(self):
+        expected = [record.valid_signature for record in self.records]
+
+        for workers in (1, 2):
+            records = list(
+                NistBeaconLoader.iter_xml(
+                    io.BytesIO(self.xml_archive),
+                    verify=True,
+                    workers=workers,
+                    batch_size=4,
+                )
+            )
+
+            # Results come from the batch check, not a fresh one per record
+            with patch.object(NistBeaconCrypto, 'verify_record') as verify:
+                self.assertEqual(
+                    expected,
+                    [record.valid_signature for record in records],
+                )
+
+            verify.assert_not_called()
+
+    def test_ingest(self):
+        store = NistBeaconStore()
+
+        count = NistBeaconLoader.ingest(
+            NistBeaconLoader.iter_json_lines(io.StringIO(self.json_archive)),
+            store,
+            batch_size=3,
+        )
+
+        self.assertEqual(len(self.records), count)
+        self.assertEqual(len(self.records), len(store))
+        self.assertEqual(self.records, list(store.get_range(0, 2 ** 40)))
+
+    def test_ingest_valid_only(self):
+        store = NistBeaconStore()
+
+        count = NistBeaconLoader.ingest(
+            NistBeaconLoader.iter_xml(
+                io.BytesIO(self.xml_archive),
+                verify=True,
+                workers=1,
+            ),
+            store,
+            valid_only=True,
+        )
+
+        self.assertEqual(len(self.records) - 2, count)
+        self.assertNotIn(1496176860, store)
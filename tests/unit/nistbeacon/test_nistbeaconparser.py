@@ -0,0 +1,156 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import json
+from unittest import TestCase
+
+from nistbeacon import (
+    NistBeaconParser,
+    NistBeaconPulse,
+    NistBeaconValue,
+)
+from tests.test_data.nist_pulses import local_pulse
+from tests.test_data.nist_records import (
+    local_record_json_db,
+    local_record_xml_db,
+)
+from tests.unit.nistbeacon.test_nistbeaconpulse import pulse_xml
+
+
+class RecordMarker:
+    """
+    A stand-in record class, remembering what it was built from.
+    """
+
+    def __init__(self, source):
+        self.source = source
+
+    @classmethod
+    def from_dict(cls, data, eager_verify=False):
+        return cls(data)
+
+    @classmethod
+    def from_xml_element(cls, element, eager_verify=False):
+        return cls(element)
+
+
+class TestNistBeaconParser(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.record_json = local_record_json_db[1447873020]
+        cls.record_xml = local_record_xml_db[1447873020]
+        cls.pulse = local_pulse(2)
+
+    def setUp(self):
+        # noinspection PyProtectedMember
+        self.saved_registry = (
+            NistBeaconParser._versions,
+            NistBeaconParser._namespaces,
+        )
+
+    def tearDown(self):
+        NistBeaconParser._versions, NistBeaconParser._namespaces = \
+            self.saved_registry
+
+    def test_version_1_0(self):
+        expected = NistBeaconValue.from_json(self.record_json)
+
+        from_json = NistBeaconParser.from_json(self.record_json)
+        from_xml = NistBeaconParser.from_xml(self.record_xml)
+
+        self.assertIsInstance(from_json, NistBeaconValue)
+        self.assertIsInstance(from_xml, NistBeaconValue)
+        self.assertEqual(expected, from_json)
+        self.assertEqual(expected, from_xml)
+
+    def test_version_2_0(self):
+        from_json = NistBeaconParser.from_json(self.pulse.json)
+        from_xml = NistBeaconParser.from_xml(pulse_xml(self.pulse))
+
+        self.assertIsInstance(from_json, NistBeaconPulse)
+        self.assertIsInstance(from_xml, NistBeaconPulse)
+        self.assertEqual(self.pulse, from_json)
+        self.assertEqual(self.pulse, from_xml)
+
+        unwrapped = json.dumps(json.loads(self.pulse.json)['pulse'])
+        self.assertEqual(self.pulse, NistBeaconParser.from_json(unwrapped))
+
+    def test_xml_version_fallback(self):
+        # Without a namespace, the 'version' element decides
+        plain_xml = pulse_xml(self.pulse).replace(
+            ' xmlns="http://beacon.nist.gov/beacon/2.0/"',
+            '',
+        )
+
+        self.assertEqual(self.pulse, NistBeaconParser.from_xml(plain_xml))
+
+    def test_unknown_formats(self):
+        data = json.loads(self.record_json)
+        data['version'] = 'Version 9.0'
+
+        self.assertIsNone(NistBeaconParser.from_json(json.dumps(data)))
+        self.assertIsNone(NistBeaconParser.from_json('[]'))
+        self.assertIsNone(NistBeaconParser.from_json('{"pulse": 1}'))
+        self.assertIsNone(NistBeaconParser.from_json('not json'))
+        self.assertIsNone(NistBeaconParser.from_xml('<record/>'))
+        self.assertIsNone(NistBeaconParser.from_xml('<record>'))
+        self.assertIsNone(
+            NistBeaconParser.from_xml('<record xmlns="urn:unknown"/>')
+        )
+
+    def test_malformed_version_1_0(self):
+        data = json.loads(self.record_json)
+
+        for field, value in (
+                ('seedValue', 'not hex'),
+                ('outputValue', 'ABC'),
+                ('frequency', 'sixty'),
+                ('timeStamp', None),
+                ('timeStamp', [1]),
+        ):
+            malformed = dict(data, **{field: value})
+
+            self.assertIsNone(
+                NistBeaconParser.from_json(json.dumps(malformed))
+            )
+            self.assertIsNone(NistBeaconParser.from_dict(malformed))
+
+        malformed_xml = self.record_xml.replace(
+            '<frequency>60</frequency>',
+            '<frequency>sixty</frequency>',
+        )
+        self.assertNotEqual(self.record_xml, malformed_xml)
+        self.assertIsNone(NistBeaconParser.from_xml(malformed_xml))
+        self.assertIsNone(NistBeaconValue.from_json('42'))
+
+    def test_register(self):
+        NistBeaconParser.register(
+            RecordMarker,
+            versions=['Version 9.0'],
+            namespaces=['urn:example'],
+        )
+
+        record = NistBeaconParser.from_json('{"version": "Version 9.0"}')
+        self.assertIsInstance(record, RecordMarker)
+        self.assertEqual({'version': 'Version 9.0'}, record.source)
+
+        record = NistBeaconParser.from_xml('<record xmlns="urn:example"/>')
+        self.assertIsInstance(record, RecordMarker)
+
+        self.assertIs(
+            NistBeaconValue,
+            NistBeaconParser.get_record_class(version='Version 1.0'),
+        )
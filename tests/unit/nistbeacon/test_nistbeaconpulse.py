@@ -0,0 +1,209 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import hashlib
+import json
+import struct
+from unittest import TestCase
+from unittest.mock import patch
+
+from Crypto.Hash import SHA512
+
+from nistbeacon import NistBeaconPulse
+from nistbeacon.nistbeaconcrypto import NistBeaconCrypto
+from tests.test_data.nist_pulses import (
+    local_certificate_id,
+    local_pulse,
+    local_pulse_key,
+    spec_pulse_json,
+    spec_pulse_message,
+)
+
+
+def pulse_xml(pulse: NistBeaconPulse) -> str:
+    """
+    Write a pulse as XML, list values carrying attributes.
+    """
+
+    list_values = ''.join(
+        f'<listValue type="{value_type}" uri="{value_uri}">'
+        f'{value}</listValue>'
+        for value_type, value_uri, value in pulse.list_values
+    )
+
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<pulse xmlns="http://beacon.nist.gov/beacon/2.0/">'
+        f'<uri>{pulse.uri}</uri>'
+        f'<version>{pulse.version}</version>'
+        f'<cipherSuite>{pulse.cipher_suite}</cipherSuite>'
+        f'<period>{pulse.period}</period>'
+        f'<certificateId>{pulse.certificate_id}</certificateId>'
+        f'<chainIndex>{pulse.chain_index}</chainIndex>'
+        f'<pulseIndex>{pulse.pulse_index}</pulseIndex>'
+        f'<timeStamp>{pulse.time_stamp}</timeStamp>'
+        f'<localRandomValue>{pulse.local_random_value}</localRandomValue>'
+        '<external>'
+        f'<sourceId>{pulse.external_source_id}</sourceId>'
+        f'<statusCode>{pulse.external_status_code}</statusCode>'
+        f'<value>{pulse.external_value}</value>'
+        '</external>'
+        f'<listValues>{list_values}</listValues>'
+        f'<precommitmentValue>{pulse.precommitment_value}'
+        '</precommitmentValue>'
+        f'<statusCode>{pulse.status_code}</statusCode>'
+        f'<signatureValue>{pulse.signature_value}</signatureValue>'
+        f'<outputValue>{pulse.output_value}</outputValue>'
+        '</pulse>'
+    )
+
+
+class TestNistBeaconPulse(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pulse = local_pulse(2)
+
+    def setUp(self):
+        # noinspection PyProtectedMember
+        self.saved_certificates = NistBeaconCrypto._certificates
+        NistBeaconCrypto.register_certificate(
+            local_certificate_id,
+            local_pulse_key.publickey().export_key(),
+        )
+        NistBeaconCrypto.clear_verify_cache()
+
+    def tearDown(self):
+        NistBeaconCrypto._certificates = self.saved_certificates
+        NistBeaconCrypto.clear_verify_cache()
+
+    def test_valid_signature(self):
+        self.assertTrue(local_pulse(2).valid_signature)
+
+    def test_unknown_certificate(self):
+        NistBeaconCrypto._certificates = self.saved_certificates
+
+        self.assertFalse(local_pulse(2).valid_signature)
+
+    def test_tampered_fields(self):
+        data = json.loads(self.pulse.json)
+        data['pulse']['statusCode'] = 1
+
+        self.assertFalse(NistBeaconPulse.from_dict(data).valid_signature)
+
+        data = json.loads(self.pulse.json)
+        data['pulse']['outputValue'] = '00' * 64
+
+        self.assertFalse(NistBeaconPulse.from_dict(data).valid_signature)
+
+        # A consistent output value does not make up for the signature
+        data = json.loads(self.pulse.json)
+        data['pulse']['statusCode'] = 1
+        tampered = NistBeaconPulse.from_dict(data)
+        signature = tampered.signature_value_bytes
+        data['pulse']['outputValue'] = hashlib.sha512(
+            tampered.message + struct.pack('>I', len(signature)) + signature
+        ).hexdigest()
+
+        self.assertFalse(NistBeaconPulse.from_dict(data).valid_signature)
+
+    def test_single_pass(self):
+        pulse = local_pulse(3)
+
+        with patch.object(SHA512, 'new', wraps=SHA512.new) as new_patched:
+            self.assertTrue(pulse.valid_signature)
+
+        # One hash over the message serves both checks
+        new_patched.assert_called_once_with(pulse.message)
+
+    def test_message_layout(self):
+        message = self.pulse.message
+        uri = self.pulse.uri.encode()
+
+        self.assertEqual(
+            struct.pack('>I', len(uri)) + uri,
+            message[:4 + len(uri)],
+        )
+        self.assertEqual(struct.pack('>I', 0), message[-4:])
+
+        # Text, 7 hash values (local, external, previous, hour, day, month,
+        # year, precommitment) and the certificate id, all length prefixed
+        self.assertEqual(
+            (4 + len(uri)) + (4 + len(b'Version 2.0')) + 8 +
+            (4 + 64) + 16 + (4 + len(self.pulse.time_stamp)) +
+            (4 + 64) * 3 + 4 + (4 + 64) * 5 + (4 + 64) + 4,
+            len(message),
+        )
+
+    def test_message_known_answer(self):
+        pulse = NistBeaconPulse.from_json(spec_pulse_json)
+
+        self.assertEqual(spec_pulse_message, pulse.message)
+        self.assertEqual(
+            hashlib.sha512(spec_pulse_message).digest(),
+            pulse.message_digest,
+        )
+
+    def test_message_digest_is_kept(self):
+        digest = self.pulse.message_digest
+
+        with patch.object(hashlib, 'sha512') as sha512_patched:
+            self.assertIs(digest, self.pulse.message_digest)
+
+        sha512_patched.assert_not_called()
+
+    def test_json_round_trip(self):
+        pulse = NistBeaconPulse.from_json(self.pulse.json)
+
+        self.assertEqual(self.pulse, pulse)
+        self.assertTrue(pulse.valid_signature)
+
+        # The unwrapped pulse object is understood too
+        self.assertEqual(
+            self.pulse,
+            NistBeaconPulse.from_dict(json.loads(self.pulse.json)['pulse']),
+        )
+
+    def test_from_xml(self):
+        pulse = NistBeaconPulse.from_xml(pulse_xml(self.pulse))
+
+        self.assertEqual(self.pulse, pulse)
+        self.assertTrue(pulse.valid_signature)
+
+    def test_invalid_input(self):
+        self.assertIsNone(NistBeaconPulse.from_json('not json'))
+        self.assertIsNone(NistBeaconPulse.from_json('{}'))
+        self.assertIsNone(NistBeaconPulse.from_json('[]'))
+        self.assertIsNone(NistBeaconPulse.from_xml('<pulse>'))
+
+        data = json.loads(self.pulse.json)
+        data['pulse']['localRandomValue'] = 'not hex'
+
+        self.assertIsNone(NistBeaconPulse.from_dict(data))
+
+    def test_properties(self):
+        self.assertEqual(1533236760, self.pulse.timestamp)
+        self.assertEqual(2, self.pulse.pulse_index)
+        self.assertEqual(
+            local_certificate_id.upper(),
+            self.pulse.certificate_id,
+        )
+        self.assertEqual(
+            self.pulse.list_values[0][2],
+            self.pulse.previous_output_value,
+        )
+        self.assertEqual(64, len(self.pulse.previous_output_value_bytes))
+        self.assertEqual(64, len(self.pulse.message_digest))
+        self.assertNotEqual(self.pulse, local_pulse(3))
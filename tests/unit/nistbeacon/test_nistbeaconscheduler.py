@@ -0,0 +1,245 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import asyncio
+import time
+from unittest import TestCase
+from unittest.mock import Mock
+
+from nistbeacon import (
+    NistBeaconScheduler,
+    NistBeaconValue,
+)
+from tests.test_data.nist_pulses import local_pulse
+from tests.test_data.nist_records import local_record_json_db
+
+
+class FakeBeacon:
+    """
+    A clock, a sleep and a source publishing records 'lag' seconds after
+    their timestamp, counting every request.
+    """
+
+    def __init__(self, records, now: float, lag: float = 0):
+        self.records = records
+        self.now = now
+        self.lag = lag
+        self.requests = 0
+        self.sleeps = []
+
+    def clock(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def get_last_record(self):
+        self.requests += 1
+
+        published = [
+            record for record in self.records
+            if record.timestamp + self.lag <= self.now
+        ]
+
+        return published[-1] if published else None
+
+
+class TestNistBeaconScheduler(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Three contiguous records, one minute apart
+        cls.records = [
+            NistBeaconValue.from_json(local_record_json_db[timestamp])
+            for timestamp in (1447872960, 1447873020, 1447873080)
+        ]
+
+    def scheduler(self, beacon: FakeBeacon, **kwargs) -> NistBeaconScheduler:
+        return NistBeaconScheduler(
+            beacon,
+            clock=beacon.clock,
+            sleep=beacon.sleep,
+            jitter=0,
+            **kwargs
+        )
+
+    def test_sleeps_until_due(self):
+        beacon = FakeBeacon(self.records, self.records[0].timestamp + 5)
+        scheduler = self.scheduler(beacon)
+
+        # The first call delivers the newest record right away
+        self.assertEqual(self.records[0], scheduler.wait_for_next())
+        self.assertEqual([], beacon.sleeps)
+        self.assertEqual(self.records[1].timestamp, scheduler.next_due())
+
+        # Then one request per record, made when it is due
+        self.assertEqual(self.records[1], scheduler.wait_for_next())
+        self.assertEqual([55], beacon.sleeps)
+        self.assertEqual(2, beacon.requests)
+        self.assertEqual(self.records[1], scheduler.last_record)
+
+    def test_backoff_until_published(self):
+        # Records show up three seconds after their timestamp
+        beacon = FakeBeacon(self.records, self.records[0].timestamp + 3, 3)
+        scheduler = self.scheduler(beacon, initial_backoff=0.5, max_backoff=1)
+        scheduler.wait_for_next()
+
+        self.assertEqual(self.records[1], scheduler.wait_for_next())
+        self.assertEqual([57, 0.5, 1, 1, 1], beacon.sleeps)
+        self.assertEqual(6, beacon.requests)
+
+    def test_source_errors(self):
+        beacon = FakeBeacon(self.records, self.records[0].timestamp)
+        error = ConnectionError('unreachable')
+        source = Mock()
+        source.get_last_record.side_effect = [
+            self.records[0],
+            error,
+            self.records[1],
+        ]
+        on_error = Mock()
+        scheduler = NistBeaconScheduler(
+            source,
+            clock=beacon.clock,
+            sleep=beacon.sleep,
+            initial_backoff=0.5,
+            jitter=0,
+            on_error=on_error,
+        )
+        scheduler.wait_for_next()
+
+        # The failed request is reported, backed off from, and retried
+        self.assertEqual(self.records[1], scheduler.wait_for_next())
+        on_error.assert_called_once_with(error)
+        self.assertEqual([60, 0.5], beacon.sleeps)
+
+    def test_jitter_is_bounded(self):
+        scheduler = NistBeaconScheduler(initial_backoff=2, jitter=0.25)
+
+        for attempt in range(10):
+            # noinspection PyProtectedMember
+            delay = scheduler._backoff(attempt)
+            self.assertGreaterEqual(delay, min(10, 2 * 2 ** attempt))
+            self.assertLessEqual(delay, min(10, 2 * 2 ** attempt) * 1.25)
+
+    def test_pulse_period(self):
+        pulse = local_pulse(2)
+        beacon = FakeBeacon([pulse], pulse.timestamp)
+        scheduler = self.scheduler(beacon)
+        scheduler.wait_for_next()
+
+        self.assertEqual(pulse.timestamp + 60, scheduler.next_due())
+
+    def test_fan_out(self):
+        beacon = FakeBeacon(self.records, self.records[2].timestamp)
+        on_error = Mock()
+        scheduler = self.scheduler(beacon, on_error=on_error)
+
+        callback = Mock()
+        failing = Mock(side_effect=RuntimeError)
+        scheduler.subscribe(failing)
+        scheduler.subscribe(callback)
+        unbounded = scheduler.subscribe_queue()
+        newest_only = scheduler.subscribe_queue(maxsize=1)
+
+        scheduler.wait_for_next()
+        beacon.records = beacon.records + [self.fresh_after(1)]
+        scheduler.wait_for_next()
+
+        # One request per record, however many subscribers
+        self.assertEqual(2, beacon.requests)
+        self.assertEqual(2, callback.call_count)
+        self.assertEqual(2, on_error.call_count)
+        self.assertEqual(2, unbounded.qsize())
+        self.assertEqual(1, newest_only.qsize())
+        self.assertEqual(beacon.records[-1], newest_only.get_nowait())
+
+        scheduler.unsubscribe(callback)
+        scheduler.unsubscribe(unbounded)
+        beacon.records = beacon.records + [self.fresh_after(2)]
+        scheduler.wait_for_next()
+
+        self.assertEqual(2, callback.call_count)
+        self.assertEqual(2, unbounded.qsize())
+
+    def fresh_after(self, offset: int) -> Mock:
+        """
+        A stand-in record 'offset' minutes after the newest fixture.
+        """
+
+        return Mock(
+            timestamp=self.records[-1].timestamp + offset * 60,
+            frequency=60,
+        )
+
+    def test_async_iterator(self):
+        beacon = FakeBeacon(self.records, self.records[2].timestamp)
+        scheduler = self.scheduler(beacon)
+        loop = asyncio.new_event_loop()
+
+        async def consume():
+            received = []
+
+            async for record in scheduler.records():
+                received.append(record)
+
+                if len(received) == 2:
+                    break
+
+            return received
+
+        async def produce():
+            # Let the consumer subscribe, then publish from another thread
+            await asyncio.sleep(0)
+            await loop.run_in_executor(None, scheduler.wait_for_next)
+            beacon.records = beacon.records + [self.fresh_after(1)]
+            await loop.run_in_executor(None, scheduler.wait_for_next)
+
+        async def main():
+            return await asyncio.gather(consume(), produce())
+
+        try:
+            received, _ = loop.run_until_complete(main())
+        finally:
+            loop.close()
+
+        self.assertEqual(
+            [self.records[2], beacon.records[-1]],
+            received,
+        )
+        # noinspection PyProtectedMember
+        self.assertEqual((), scheduler._async_queues)
+
+    def test_start_and_stop(self):
+        source = Mock()
+        source.get_last_record.side_effect = RuntimeError
+        scheduler = NistBeaconScheduler(source, initial_backoff=0.01)
+
+        scheduler.start()
+
+        # Failing requests do not end the polling thread
+        for _ in range(100):
+            if source.get_last_record.call_count > 1:
+                break
+
+            time.sleep(0.01)
+
+        self.assertGreater(source.get_last_record.call_count, 1)
+        self.assertTrue(scheduler.running)
+
+        scheduler.stop(timeout=5)
+        self.assertFalse(scheduler.running)
+        self.assertIsNone(scheduler.wait_for_next())
@@ -0,0 +1,180 @@
+"""
+Copyright 2015-2020 Peter Urda
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+"""
+
+import os
+import tempfile
+from unittest import TestCase
+
+from nistbeacon import (
+    NistBeacon,
+    NistBeaconStore,
+    NistBeaconValue,
+)
+from tests.test_data.nist_client import LocalNistBeaconClient
+from tests.test_data.nist_records import local_record_json_db
+
+
+class TestNistBeaconStore(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.init_timestamp = 1378395540
+        cls.reference_previous = 1447872960
+        cls.reference_timestamp = 1447873020
+        cls.reference_next = 1447873080
+
+        cls.records = [
+            NistBeaconValue.from_json(record_json)
+            for _, record_json in sorted(local_record_json_db.items())
+            if record_json
+        ]
+        cls.by_timestamp = {
+            record.timestamp: record
+            for record in cls.records
+        }
+
+    def setUp(self):
+        self.store = NistBeaconStore()
+
+    def tearDown(self):
+        self.store.close()
+        NistBeacon.set_store()
+        NistBeacon.set_client()
+
+    def test_put_and_get_record(self):
+        expected = self.by_timestamp[self.reference_timestamp]
+
+        self.assertIsNone(self.store.get_record(self.reference_timestamp))
+
+        self.store.put(expected)
+        actual = self.store.get_record(self.reference_timestamp)
+
+        self.assertIn(self.reference_timestamp, self.store)
+        self.assertEqual(expected, actual)
+        self.assertIsNot(expected, actual)
+
+    def test_put_many(self):
+        self.store.put_many(self.records)
+
+        # Records are immutable, storing them again changes nothing
+        self.store.put_many(self.records)
+
+        self.assertEqual(len(self.records), len(self.store))
+
+    def test_get_next_and_previous_follow_the_chain(self):
+        self.store.put_many(self.records)
+
+        self.assertEqual(
+            self.by_timestamp[self.reference_next],
+            self.store.get_next(self.reference_timestamp),
+        )
+        self.assertEqual(
+            self.by_timestamp[self.reference_previous],
+            self.store.get_previous(self.reference_timestamp),
+        )
+
+        # The records on either side of a gap in the store do not chain
+        self.assertIsNone(self.store.get_next(self.init_timestamp + 60))
+        self.assertIsNone(self.store.get_previous(self.reference_previous))
+
+    def test_get_next_unknown_timestamp(self):
+        self.store.put_many(self.records)
+
+        self.assertIsNone(self.store.get_next(self.reference_timestamp + 1))
+        self.assertIsNone(self.store.get_previous(self.reference_next + 1))
+
+    def test_get_range(self):
+        self.store.put_many(self.records)
+
+        actual = list(
+            self.store.get_range(
+                self.init_timestamp,
+                self.reference_next,
+                batch_size=2,
+            )
+        )
+
+        self.assertEqual(self.records[:5], actual)
+
+    def test_verifications(self):
+        key = ('20130905', b'\x01' * 64, b'\x02' * 256)
+
+        self.assertIsNone(self.store.get_verification(*key))
+
+        self.store.put_verification(*key, True)
+        self.assertIs(True, self.store.get_verification(*key))
+
+        self.store.put_verification(*key, False)
+        self.assertIs(False, self.store.get_verification(*key))
+
+        self.assertIsNone(
+            self.store.get_verification('20170808', *key[1:])
+        )
+
+    def test_put_verifications(self):
+        keys = [
+            ('20130905', bytes([index]) * 64, b'\x02' * 256)
+            for index in range(3)
+        ]
+
+        self.store.put_verifications(
+            (*key, index % 2 == 0) for index, key in enumerate(keys)
+        )
+
+        self.assertEqual(
+            [True, False, True],
+            [self.store.get_verification(*key) for key in keys],
+        )
+
+    def test_persistence(self):
+        handle, path = tempfile.mkstemp(suffix='.sqlite')
+        os.close(handle)
+
+        try:
+            with NistBeaconStore(path) as store:
+                store.put_many(self.records)
+
+            with NistBeaconStore(path) as store:
+                self.assertEqual(len(self.records), len(store))
+                self.assertEqual(
+                    self.by_timestamp[self.reference_timestamp],
+                    store.get_record(self.reference_timestamp),
+                )
+        finally:
+            os.remove(path)
+
+    def test_nist_beacon_reads_through_store(self):
+        client = LocalNistBeaconClient()
+
+        self.store.put_many(self.records)
+        NistBeacon.set_client(client)
+        NistBeacon.set_store(self.store)
+
+        self.assertIs(self.store, NistBeacon.get_store())
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual([], client.queries)
+
+    def test_nist_beacon_writes_back_to_store(self):
+        client = LocalNistBeaconClient()
+
+        NistBeacon.set_client(client)
+        NistBeacon.set_store(self.store)
+
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(client.queries))
+        self.assertEqual(3, len(self.store))
+
+        self.assertTrue(NistBeacon.chain_check(self.reference_timestamp))
+        self.assertEqual(3, len(client.queries))